@@ -0,0 +1,78 @@
+import json
+from typing import Any, AsyncIterator, ClassVar, Iterator, Mapping, Optional
+
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpRequest, StreamingHttpResponse
+from django.http.response import HttpResponseBase
+from rest_framework.pagination import CursorPagination
+from rest_framework.renderers import BaseRenderer
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+
+def is_asgi_request(request: HttpRequest) -> bool:
+    """
+    Whether the request is served by an ASGI server. Streamed responses use async iterators there,
+    a WSGI server would have to buffer them whole.
+    """
+    return isinstance(getattr(request, '_request', request), ASGIRequest)
+
+
+class IdCursorPagination(CursorPagination):
+    """
+    Cursor pagination over the primary key, stable while rows are added and cheap for deep pages.
+    """
+    ordering = 'id'
+    page_size = 100
+    page_size_query_param = 'page_size'
+    max_page_size = 1000
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Newline delimited JSON, one object per line.
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(
+        self,
+        data: Any,
+        accepted_media_type: Optional[str] = None,
+        renderer_context: Optional[Mapping] = None,
+    ) -> bytes:
+        if data is None:
+            return b''
+        items = data if isinstance(data, list) else [data]
+        return ''.join(self.render_line(item) for item in items).encode(self.charset)
+
+    def render_line(self, item: Any) -> str:
+        return json.dumps(item, cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+
+
+class NDJSONStreamMixin:
+    """
+    Mixin for list views. Requested as NDJSON (`?format=ndjson` or `Accept: application/x-ndjson`),
+    the whole queryset is streamed without pagination in chunks, so memory use doesn't grow with the table.
+    Under ASGI the rows are streamed with the async ORM.
+    """
+    renderer_classes: ClassVar = [*api_settings.DEFAULT_RENDERER_CLASSES, NDJSONRenderer]
+    stream_chunk_size = 500
+
+    def list(self, request: Request, *args, **kwargs) -> HttpResponseBase:
+        renderer = request.accepted_renderer
+        if not isinstance(renderer, NDJSONRenderer):
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset()).order_by('pk')
+        stream = self.astream if is_asgi_request(request) else self.stream
+        return StreamingHttpResponse(stream(queryset, renderer), content_type=renderer.media_type)
+
+    def stream(self, queryset: Any, renderer: NDJSONRenderer) -> Iterator[str]:
+        for instance in queryset.iterator(chunk_size=self.stream_chunk_size):
+            yield renderer.render_line(self.get_serializer(instance).data)
+
+    async def astream(self, queryset: Any, renderer: NDJSONRenderer) -> AsyncIterator[str]:
+        async for instance in queryset.aiterator(chunk_size=self.stream_chunk_size):
+            yield renderer.render_line(self.get_serializer(instance).data)
@@ -3,6 +3,13 @@ ASGI config for cantica project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Run it with uvicorn, e.g. ``uvicorn cantica.asgi:application``, or in production with gunicorn
+and uvicorn workers, ``gunicorn --worker-class uvicorn_worker.UvicornWorker cantica.asgi:application``
+(``SERVER_MODE=asgi`` in the Docker image).
+
+The homepage, the recommendation range API and the NDJSON streams of the song and celebration lists
+are async. The other views, including the paginated DRF lists, are sync and run in a thread.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.1/howto/deployment/asgi/
 """
@@ -0,0 +1,331 @@
+import random
+import statistics
+import time
+import tracemalloc
+from calendar import monthrange
+from datetime import date, timedelta
+from itertools import chain
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.db import connection, reset_queries
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from cantica.date_classification import classify_dates
+from celebrations.models import Celebration, CelebrationType, LiturgicalCalendarEvent
+from celebrations.utils.calendar_generator import LiturgicalCalendarGenerator
+from celebrations.utils.liturgy_api_client import LiturgyAPIClient
+from songs.models import ConditionType, Keyword, LiturgicalSeason, LiturgicalSubSeason, MassPart, Song, SongRule
+from songs.utils.daily_recommendations import get_subseasons
+from songs.utils.helpers import SUBSEASON_FLAGS, get_date_flags
+from songs.utils.liturgical_season import LiturgicalSeasonEnum
+from songs.utils.rule_index import get_rule_index
+from songs.utils.song_recommender import SongRecommender
+
+START_DATE = date(2025, 1, 1)
+# Number of calendar days whose recommendations and pages are benchmarked
+SAMPLE_DAYS = 7
+# Number of calendar months saved by the update_database benchmarks, one month per API response
+SAMPLE_MONTHS = 2
+BATCH_SIZE = 1000
+
+MASS_PARTS = (
+    'main', 'entrance', 'psalm', 'aleluia', 'gospel', 'offertory', 'communion', 'recessional',
+)
+WORDS = (
+    'pán', 'panna', 'marie', 'apoštol', 'mučedník', 'biskup', 'kněz', 'učitel', 'církev', 'kříž',
+    'srdce', 'duch', 'anděl', 'král', 'rodina', 'matka', 'jan', 'petr', 'pavel', 'josef',
+    'václav', 'ludmila', 'cyril', 'metoděj', 'vojtěch', 'anežka', 'prokop', 'jakub', 'tomáš', 'ondřej',
+)
+# Relative number of rules per model of the condition value
+RULE_WEIGHTS = {
+    Celebration: 4,
+    CelebrationType: 2,
+    LiturgicalSeason: 3,
+    LiturgicalSubSeason: 1,
+}
+
+
+class Scale(NamedTuple):
+    songs: int
+    rules: int
+    celebrations: int
+    days: int
+
+
+SCALES = {
+    'small': Scale(songs=200, rules=2000, celebrations=100, days=31),
+    'medium': Scale(songs=1000, rules=10000, celebrations=400, days=120),
+    'large': Scale(songs=3000, rules=50000, celebrations=1500, days=366),
+}
+
+
+def generate_data(scale: Scale, seed: int = 0) -> None:
+    """
+    Fill an empty database with synthetic songs, keywords, rules, celebrations and calendar events.
+    The data is the same for the same scale and seed. Rows are bulk created, so no signals are sent.
+    """
+    rng = random.Random(seed)  # noqa: S311
+    seasons = LiturgicalSeason.objects.bulk_create(
+        LiturgicalSeason(name=season.value, description=f'{season.value} description')
+        for season in LiturgicalSeasonEnum
+    )
+    subseasons = LiturgicalSubSeason.objects.bulk_create(
+        LiturgicalSubSeason(name=flag.name.lower(), description=f'{flag.name.lower()} description')
+        for flag in SUBSEASON_FLAGS
+    )
+    mass_parts = MassPart.objects.bulk_create(MassPart(name=name) for name in MASS_PARTS)
+    keywords = Keyword.objects.bulk_create(Keyword(word=word) for word in WORDS)
+    celebration_types = CelebrationType.objects.bulk_create(
+        CelebrationType(name=f'{word} {i}') for i, word in enumerate(WORDS)
+    )
+
+    celebrations = Celebration.objects.bulk_create(
+        (
+            Celebration(name=name, slug=f'celebration-{i}')
+            for i, name in enumerate(f'Sv. {" a ".join(rng.sample(WORDS, 2))} {i}' for i in range(scale.celebrations))
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    Celebration.types.through.objects.bulk_create(
+        (
+            Celebration.types.through(celebration_id=celebration.pk, celebrationtype_id=celebration_type.pk)
+            for celebration in celebrations
+            for celebration_type in rng.sample(celebration_types, rng.randint(1, 2))
+        ),
+        batch_size=BATCH_SIZE,
+    )
+
+    songs = Song.objects.bulk_create(
+        (
+            Song(
+                title=f'{" ".join(rng.sample(WORDS, 3)).capitalize()} {i}',
+                number=i + 1,
+                has_communion_verse=rng.random() < 0.5,
+                has_recessional_verse=rng.random() < 0.5,
+            )
+            for i in range(scale.songs)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    Song.keywords.through.objects.bulk_create(
+        (
+            Song.keywords.through(song_id=song.pk, keyword_id=keyword.pk)
+            for song in songs
+            for keyword in rng.sample(keywords, rng.randint(0, 3))
+        ),
+        batch_size=BATCH_SIZE,
+    )
+
+    condition_values = {
+        Celebration: celebrations,
+        CelebrationType: celebration_types,
+        LiturgicalSeason: seasons,
+        LiturgicalSubSeason: subseasons,
+    }
+    content_types = ContentType.objects.get_for_models(*condition_values)
+    condition_types = {
+        model: ConditionType.objects.create(name=model.__name__, content_type=content_types[model])
+        for model in condition_values
+    }
+    models = list(RULE_WEIGHTS)
+    weights = list(RULE_WEIGHTS.values())
+    rules = []
+    for model in rng.choices(models, weights=weights, k=scale.rules):
+        rules.append(SongRule(
+            song=rng.choice(songs),
+            condition_type=condition_types[model],
+            content_type=content_types[model],
+            object_id=rng.choice(condition_values[model]).pk,
+            mass_part=rng.choice(mass_parts),
+            priority=rng.randrange(4),
+            exclusive=rng.random() < 0.05,
+            can_be_main=rng.random() < 0.2,
+        ))
+    SongRule.objects.bulk_create(rules, batch_size=BATCH_SIZE)
+
+    columns = classify_dates(START_DATE, START_DATE + timedelta(days=scale.days - 1))
+    events = LiturgicalCalendarEvent.objects.bulk_create(
+        (
+            LiturgicalCalendarEvent(date=day.item(), season=str(season))
+            for day, season in zip(columns['date'], columns['season'], strict=True)
+        ),
+        batch_size=BATCH_SIZE,
+    )
+    LiturgicalCalendarEvent.celebrations.through.objects.bulk_create(
+        (
+            LiturgicalCalendarEvent.celebrations.through(
+                liturgicalcalendarevent_id=event.pk,
+                celebration_id=celebration.pk,
+            )
+            for event in events
+            for celebration in rng.sample(celebrations, rng.randint(1, 3))
+        ),
+        batch_size=BATCH_SIZE,
+    )
+
+
+def measure(
+    function: Callable[[], Any],
+    repeat: int,
+    setup: Optional[Callable[[], Any]] = None,
+) -> Dict[str, Any]:
+    """
+    Run the function once to warm up (e.g. compile templates), once to count its queries and trace its peak memory
+    and then `repeat` more times to time it. `setup` runs before every run and is not measured.
+    """
+    if setup:
+        setup()
+    function()
+    if setup:
+        setup()
+    # Requests clear the query log and it is capped, so count the queries right away in a fresh log
+    reset_queries()
+    tracemalloc.start()
+    try:
+        with CaptureQueriesContext(connection) as queries:
+            function()
+        _, peak_memory = tracemalloc.get_traced_memory()
+        query_count = len(queries)
+    finally:
+        tracemalloc.stop()
+
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - started) * 1000)
+    return {
+        'queries': query_count,
+        'peak_memory_kib': round(peak_memory / 1024, 1),
+        'wall_ms': {
+            'min': round(min(timings), 3),
+            'median': round(statistics.median(timings), 3),
+            'max': round(max(timings), 3),
+        },
+    }
+
+
+SampleDay = Tuple[date, List[Celebration], Optional[LiturgicalSeasonEnum], List[LiturgicalSubSeason]]
+
+
+def get_sample_days() -> List[SampleDay]:
+    """
+    Get the first SAMPLE_DAYS calendar days with their celebrations, season and subseasons.
+    """
+    subseasons_by_name = {subseason.name: subseason for subseason in LiturgicalSubSeason.objects.all()}
+    events = LiturgicalCalendarEvent.objects.order_by('date').prefetch_related('celebrations__types')[:SAMPLE_DAYS]
+    return [
+        (
+            event.date,
+            list(event.celebrations.all()),
+            LiturgicalSeasonEnum.from_string(event.season),
+            get_subseasons(get_date_flags(event.date), subseasons_by_name),
+        )
+        for event in events
+    ]
+
+
+def get_month_payloads() -> List[List[Dict]]:
+    """
+    Generate the API responses of SAMPLE_MONTHS months starting with the month of START_DATE.
+    """
+    generator = LiturgicalCalendarGenerator()
+    month_payloads = []
+    for offset in range(SAMPLE_MONTHS):
+        year, month = divmod(START_DATE.year * 12 + START_DATE.month - 1 + offset, 12)
+        month += 1
+        first_day, last_day = date(year, month, 1), date(year, month, monthrange(year, month)[1])
+        month_payloads.append(generator.generate_range(first_day, last_day))
+    return month_payloads
+
+
+def get_update_database_cases() -> Dict[str, Tuple[Callable[[], None], int]]:
+    """
+    Save the generated months day by day with the legacy `update_database` and a month at a time with
+    `update_database_bulk`, which the calendar commands use.
+    """
+    api_client = LiturgyAPIClient()
+    month_payloads = get_month_payloads()
+    day_count = sum(map(len, month_payloads))
+
+    def update_database() -> None:
+        for payload in chain.from_iterable(month_payloads):
+            api_client.update_database(payload)
+
+    def update_database_bulk() -> None:
+        for payloads in month_payloads:
+            api_client.update_database_bulk(payloads)
+
+    return {
+        'update_database': (update_database, day_count),
+        'update_database_bulk': (update_database_bulk, day_count),
+    }
+
+
+def reset_cache() -> None:
+    """
+    Clear cached pages and rebuild the rule index outside of the measured run.
+    """
+    cache.clear()
+    get_rule_index()
+
+
+def run_benchmarks(repeat: int) -> Dict[str, Dict[str, Any]]:
+    """
+    Benchmark the recommendation hot path on the data in the database.
+    Expects a throwaway database and cache, the `update_database` cases run last as they change the calendar.
+    """
+    recommender = SongRecommender()
+    sample_days = get_sample_days()
+    calls = [
+        (day, celebration, season, subseasons)
+        for day, celebrations, season, subseasons in sample_days
+        for celebration in celebrations
+    ]
+    reset_cache()
+    rules = [
+        recommender.get_song_rules(day=day, celebration=celebration, season=season, subseasons=subseasons)
+        for day, celebration, season, subseasons in calls
+    ]
+    client = Client()
+
+    def recommend_songs() -> None:
+        for day, celebration, season, subseasons in calls:
+            recommender.recommend_songs(
+                day=day,
+                celebration=celebration,
+                liturgical_season=season,
+                liturgical_subseasons=subseasons,
+            )
+
+    def get_detailed_recommendation() -> None:
+        for (day, celebration, season, _), celebration_rules in zip(calls, rules, strict=True):
+            recommender.get_detailed_recommendation(
+                rules=celebration_rules,
+                day=day,
+                liturgical_season=season,
+                celebration=celebration,
+            )
+
+    def render_homepage() -> None:
+        for day, *_ in sample_days:
+            response = client.get(reverse('home'), {'date': day.isoformat()})
+            if response.status_code != 200:
+                raise RuntimeError(f'Homepage for {day} returned {response.status_code}.')
+
+    cases = {
+        'recommend_songs': (recommend_songs, len(calls)),
+        'get_detailed_recommendation': (get_detailed_recommendation, len(calls)),
+        'homepage': (render_homepage, len(sample_days)),
+        **get_update_database_cases(),
+    }
+    return {
+        name: {'calls': count, **measure(function, repeat=repeat, setup=reset_cache)}
+        for name, (function, count) in cases.items()
+    }
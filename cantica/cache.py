@@ -0,0 +1,159 @@
+import asyncio
+import time
+from contextvars import ContextVar, Token
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from django.core.cache import cache
+
+CONTENT_VERSION_KEY = 'cantica:content-version'
+
+T = TypeVar('T')
+
+
+class ContentVersionScope:
+    """
+    Content version read at most once within a scope, e.g. a request, see ContentVersionMiddleware.
+    The scope is mutable, so threads running sync code of an async request share it.
+    """
+
+    def __init__(self) -> None:
+        self.version: Optional[float] = None
+
+
+_scope: ContextVar[Optional[ContentVersionScope]] = ContextVar('content_version_scope', default=None)
+
+
+def start_content_version_scope() -> Token:
+    """Read the content version at most once until `stop_content_version_scope` is called with the token."""
+    return _scope.set(ContentVersionScope())
+
+
+def stop_content_version_scope(token: Token) -> None:
+    _scope.reset(token)
+
+
+def get_content_version() -> float:
+    """
+    Get the version stamp of rules and calendar data.
+    The version is the timestamp of the last change and is shared through the cache.
+    Within a content version scope the cache is read once.
+    """
+    scope = _scope.get()
+    if scope is not None and scope.version is not None:
+        return scope.version
+    version = cache.get(CONTENT_VERSION_KEY)
+    if version is None:
+        version = time.time()
+        if not cache.add(CONTENT_VERSION_KEY, version, timeout=None):
+            version = cache.get(CONTENT_VERSION_KEY, version)
+    if scope is not None:
+        scope.version = version
+    return version
+
+
+async def aget_content_version() -> float:
+    """
+    Async variant of get_content_version.
+    """
+    scope = _scope.get()
+    if scope is not None and scope.version is not None:
+        return scope.version
+    version = await cache.aget(CONTENT_VERSION_KEY)
+    if version is None:
+        version = time.time()
+        if not await cache.aadd(CONTENT_VERSION_KEY, version, timeout=None):
+            version = await cache.aget(CONTENT_VERSION_KEY, version)
+    if scope is not None:
+        scope.version = version
+    return version
+
+
+def get_content_last_modified(version: float) -> datetime:
+    return datetime.fromtimestamp(version, tz=timezone.utc)
+
+
+def bump_content_version(*args, **kwargs) -> float:
+    """
+    Mark rules and calendar data as changed, so everything cached under the previous version is ignored.
+    Accepts any arguments so it can be used directly as a signal receiver.
+    """
+    version = time.time()
+    cache.set(CONTENT_VERSION_KEY, version, timeout=None)
+    scope = _scope.get()
+    if scope is not None:
+        scope.version = version
+    return version
+
+
+def compute_once(
+    key: str,
+    compute: Callable[[], T],
+    timeout: int,
+    lock_timeout: int = 30,
+    poll_interval: float = 0.05,
+) -> T:
+    """
+    Get a value from the cache or compute and store it, computing it in a single worker only.
+
+    On a miss, the worker that acquires the lock computes the value while others wait for it to appear.
+    If it doesn't appear within `lock_timeout` seconds, the waiting worker computes the value itself.
+    `compute` must not return None, as None marks a cache miss.
+    """
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    lock_key = f'{key}:lock'
+    deadline = time.monotonic() + lock_timeout
+    while not cache.add(lock_key, True, timeout=lock_timeout):
+        time.sleep(poll_interval)
+        value = cache.get(key)
+        if value is not None:
+            return value
+        if time.monotonic() >= deadline:
+            return compute()
+
+    try:
+        value = cache.get(key)
+        if value is None:
+            value = compute()
+            cache.set(key, value, timeout)
+    finally:
+        cache.delete(lock_key)
+    return value
+
+
+async def acompute_once(
+    key: str,
+    compute: Callable[[], Awaitable[T]],
+    timeout: int,
+    lock_timeout: int = 30,
+    poll_interval: float = 0.05,
+) -> T:
+    """
+    Async variant of compute_once, `compute` is a coroutine function.
+    Waiting for another worker to compute the value doesn't block the event loop.
+    """
+    value = await cache.aget(key)
+    if value is not None:
+        return value
+
+    lock_key = f'{key}:lock'
+    deadline = time.monotonic() + lock_timeout
+    while not await cache.aadd(lock_key, True, timeout=lock_timeout):
+        await asyncio.sleep(poll_interval)
+        value = await cache.aget(key)
+        if value is not None:
+            return value
+        if time.monotonic() >= deadline:
+            return await compute()
+
+    try:
+        value = await cache.aget(key)
+        if value is None:
+            value = await compute()
+            await cache.aset(key, value, timeout)
+    finally:
+        await cache.adelete(lock_key)
+    return value
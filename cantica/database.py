@@ -0,0 +1,42 @@
+import os
+from typing import Any, Dict, List
+
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+
+def get_pooled_connections() -> List[BaseDatabaseWrapper]:
+    """Connections of the databases configured with a psycopg connection pool."""
+    return [connection for connection in connections.all() if connection.settings_dict['OPTIONS'].get('pool')]
+
+
+def open_connection_pools() -> None:
+    """Open the pools of this process, the first connections are made in the background."""
+    for connection in get_pooled_connections():
+        connection.pool.open(wait=False)
+
+
+def close_connection_pools() -> None:
+    """Close the pools of this process, forked processes must not use the pools and connections of their parent."""
+    for connection in get_pooled_connections():
+        connection.close_pool()
+
+
+def get_database_stats() -> Dict[str, Any]:
+    """
+    Connection reuse of this process by database alias, pools are reported with their psycopg statistics.
+    Requests waiting for a connection (`requests_waiting`, `requests_queued`, `requests_wait_ms`) mean the pool
+    is saturated.
+    """
+    databases = {}
+    for connection in connections.all():
+        stats: Dict[str, Any] = {
+            'vendor': connection.vendor,
+            'health_checks': connection.settings_dict['CONN_HEALTH_CHECKS'],
+        }
+        if connection.settings_dict['OPTIONS'].get('pool'):
+            stats['pool'] = connection.pool.get_stats()
+        else:
+            stats['conn_max_age'] = connection.settings_dict['CONN_MAX_AGE']
+        databases[connection.alias] = stats
+    return {'pid': os.getpid(), 'databases': databases}
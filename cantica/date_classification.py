@@ -0,0 +1,104 @@
+"""
+Vectorized classification of date ranges for the benchmark tooling, e.g. generating a decade of calendar.
+Needs numpy, which is installed from requirements-dev.txt only.
+"""
+from datetime import date, timedelta
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from songs.utils.helpers import (
+    SUBSEASON_FLAGS,
+    DateFlags,
+    get_liturgical_year,
+    get_song_section_for_liturgical_season,
+    get_year_anchors,
+)
+from songs.utils.liturgical_season import LiturgicalSeasonEnum
+
+SEASONS = (
+    LiturgicalSeasonEnum.ADVENT,
+    LiturgicalSeasonEnum.CHRISTMAS,
+    LiturgicalSeasonEnum.LENT,
+    LiturgicalSeasonEnum.EASTER,
+    LiturgicalSeasonEnum.ORDINARY,
+)
+SEASON_NAMES = np.array([season.value for season in SEASONS])
+SONG_SECTIONS = np.array([get_song_section_for_liturgical_season(season) for season in SEASONS])
+
+
+def to_datetime64(day: date) -> np.datetime64:
+    return np.datetime64(day, 'D')
+
+
+def classify_dates(start: Union[date, np.ndarray], end: Optional[date] = None) -> Dict[str, np.ndarray]:
+    """
+    Classify many dates at once. Takes either a start and an end date (inclusive) or an array of dates.
+
+    Returns columns of equal length:
+        date: datetime64[D]
+        season: liturgical season name
+        song_section: song section of the season
+        flags: DateFlags bitmask
+        good_friday, easter_triduum and one column per subseason name: bool
+
+    Movable feasts are computed once per year, everything else is done with array operations.
+    """
+    if end is not None:
+        dates = np.arange(to_datetime64(start), to_datetime64(end + timedelta(days=1)), dtype='datetime64[D]')
+    else:
+        dates = np.asarray(start, dtype='datetime64[D]')
+    season_codes, flags = get_season_codes_and_flags(dates)
+
+    columns = {
+        'date': dates,
+        'season': SEASON_NAMES[season_codes],
+        'song_section': SONG_SECTIONS[season_codes],
+        'flags': flags,
+        'good_friday': (flags & DateFlags.GOOD_FRIDAY.value) != 0,
+        'easter_triduum': (flags & DateFlags.EASTER_TRIDUUM.value) != 0,
+    }
+    for flag in SUBSEASON_FLAGS:
+        columns[flag.name.lower()] = (flags & flag.value) != 0
+    return columns
+
+
+def get_season_codes_and_flags(dates: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Get indexes into SEASONS and DateFlags bitmasks of the given dates.
+    """
+    if not dates.size:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.uint16)
+
+    years = dates.astype('datetime64[Y]').astype(np.int64) + 1970
+    first_year = int(years.min())
+    year_range = range(first_year, int(years.max()) + 1)
+    year_index = years - first_year
+
+    anchors = [get_year_anchors(year) for year in year_range]
+    baptism, ash_wednesday, easter, pentecost, first_advent_sunday = (
+        np.array([to_datetime64(getattr(anchor, name)) for anchor in anchors])[year_index]
+        for name in ('baptism', 'ash_wednesday', 'easter', 'pentecost', 'first_advent_sunday')
+    )
+    christmas = np.array([np.datetime64(f'{year:04d}-12-25', 'D') for year in year_range])[year_index]
+
+    advent, christmas_time, lent, easter_time, ordinary = range(len(SEASONS))
+    season_codes = np.select(
+        [
+            (dates >= first_advent_sunday) & (dates < christmas),
+            dates >= christmas,
+            dates <= baptism,
+            dates < ash_wednesday,
+            dates < easter,
+            dates <= pentecost,
+        ],
+        [advent, christmas_time, christmas_time, ordinary, lent, easter_time],
+        default=ordinary,
+    )
+
+    # Per-year flag tables are consecutive, so the days since 1 January of the first year index them directly
+    flag_table = np.concatenate([
+        np.frombuffer(get_liturgical_year(year).flags, dtype=np.uint16) for year in year_range
+    ])
+    flags = flag_table[(dates - np.datetime64(f'{first_year:04d}-01-01', 'D')).astype(np.int64)]
+    return season_codes, flags
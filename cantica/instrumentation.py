@@ -0,0 +1,103 @@
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar, Token
+from typing import Any, Callable, ContextManager, Dict, Optional, Tuple
+
+_timings: ContextVar[Optional['RequestTimings']] = ContextVar('request_timings', default=None)
+_NO_SPAN = nullcontext()
+
+
+class RequestTimings:
+    """
+    Query count, database time and durations of named stages of one request.
+    Stages entered repeatedly (e.g. once per celebration) are summed up.
+    """
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.db_time = 0.0
+        self.stages: Dict[str, float] = {}
+        self.stage_counts: Dict[str, int] = {}
+
+    def execute_wrapper(self, execute: Callable, sql: str, params: Any, many: bool, context: Dict) -> Any:
+        """Database execute wrapper counting queries and their time."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.db_time += time.perf_counter() - started
+
+    def add_stage(self, name: str, duration: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + duration
+        self.stage_counts[name] = self.stage_counts.get(name, 0) + 1
+
+    @property
+    def total(self) -> float:
+        return time.perf_counter() - self.started
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Timings in milliseconds."""
+        return {
+            'total_ms': round(self.total * 1000, 2),
+            'queries': self.queries,
+            'db_ms': round(self.db_time * 1000, 2),
+            'stages': {
+                name: {'ms': round(duration * 1000, 2), 'count': self.stage_counts[name]}
+                for name, duration in self.stages.items()
+            },
+        }
+
+    def get_server_timing(self) -> str:
+        """Value of the Server-Timing header, durations are in milliseconds."""
+        metrics = [f'db;dur={self.db_time * 1000:.2f};desc="{self.queries} queries"']
+        for name, duration in self.stages.items():
+            count = self.stage_counts[name]
+            metric = f'{name};dur={duration * 1000:.2f}'
+            metrics.append(f'{metric};desc="{count}x"' if count > 1 else metric)
+        metrics.append(f'total;dur={self.total * 1000:.2f}')
+        return ', '.join(metrics)
+
+
+def start_request_timings() -> Tuple[RequestTimings, Token]:
+    """Start collecting timings of the current request, the token is passed to `stop_request_timings`."""
+    timings = RequestTimings()
+    return timings, _timings.set(timings)
+
+
+def stop_request_timings(token: Token) -> None:
+    _timings.reset(token)
+
+
+def get_request_timings() -> Optional[RequestTimings]:
+    """Timings of the current request, None if the request is not instrumented."""
+    return _timings.get()
+
+
+class Span:
+    """
+    Context manager timing a block as a stage of the request.
+    """
+
+    def __init__(self, timings: RequestTimings, name: str) -> None:
+        self.timings = timings
+        self.name = name
+        self.started = 0.0
+
+    def __enter__(self) -> None:
+        self.started = time.perf_counter()
+
+    def __exit__(self, *exc_info) -> None:
+        self.timings.add_stage(self.name, time.perf_counter() - self.started)
+
+
+def span(name: str) -> ContextManager[None]:
+    """
+    Time the block as a stage of the current request.
+    Outside of an instrumented request a shared no-op context manager is returned.
+    """
+    timings = _timings.get()
+    if timings is None:
+        return _NO_SPAN
+    return Span(timings, name)
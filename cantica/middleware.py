@@ -0,0 +1,109 @@
+import logging
+from contextlib import ExitStack
+from typing import Awaitable, Callable, Union
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+
+from cantica.cache import start_content_version_scope, stop_content_version_scope
+from cantica.instrumentation import RequestTimings, start_request_timings, stop_request_timings
+
+logger = logging.getLogger(__name__)
+
+
+class ServerTimingMiddleware:
+    """
+    Measure query count, database time and stages marked with `cantica.instrumentation.span` of each request.
+    The timings are sent in the Server-Timing header and logged with the timings as the `timings` record attribute.
+    Supports both sync and async requests.
+
+    Opt-in, it's added to MIDDLEWARE with SERVER_TIMING=True. Streamed response bodies are not included.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Union[HttpResponse, Awaitable[HttpResponse]]]) -> None:
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Union[HttpResponse, Awaitable[HttpResponse]]:
+        if self.is_async:
+            return self.__acall__(request)
+        timings, token = start_request_timings()
+        try:
+            with self.wrap_connections(timings):
+                response = self.get_response(request)
+        finally:
+            stop_request_timings(token)
+        return self.add_timings(request, response, timings)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        timings, token = start_request_timings()
+        try:
+            # The ORM queries of a request run in its thread-sensitive sync_to_async thread,
+            # connections are per thread, so they are wrapped in that thread
+            stack = await sync_to_async(self.wrap_connections)(timings)
+            try:
+                response = await self.get_response(request)
+            finally:
+                await sync_to_async(stack.close)()
+        finally:
+            stop_request_timings(token)
+        return self.add_timings(request, response, timings)
+
+    def wrap_connections(self, timings: RequestTimings) -> ExitStack:
+        """Count queries of all connections of the current thread until the returned stack is closed."""
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(timings.execute_wrapper))
+            return stack.pop_all()
+
+    def add_timings(self, request: HttpRequest, response: HttpResponse, timings: RequestTimings) -> HttpResponse:
+        response['Server-Timing'] = timings.get_server_timing()
+        logger.info(
+            '{method} {path} {status}: {total:.1f} ms, {queries} queries in {db:.1f} ms'.format(
+                method=request.method,
+                path=request.path,
+                status=response.status_code,
+                total=timings.total * 1000,
+                queries=timings.queries,
+                db=timings.db_time * 1000,
+            ),
+            extra={'timings': timings.as_dict()},
+        )
+        return response
+
+
+class ContentVersionMiddleware:
+    """
+    Read the shared content version at most once per request, instead of on every access of the rule index,
+    the search index or the page caches. Supports both sync and async requests.
+    Streamed response bodies are produced after the scope ends, they should keep what they read.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Union[HttpResponse, Awaitable[HttpResponse]]]) -> None:
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Union[HttpResponse, Awaitable[HttpResponse]]:
+        if self.is_async:
+            return self.__acall__(request)
+        token = start_content_version_scope()
+        try:
+            return self.get_response(request)
+        finally:
+            stop_content_version_scope(token)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        token = start_content_version_scope()
+        try:
+            return await self.get_response(request)
+        finally:
+            stop_content_version_scope(token)
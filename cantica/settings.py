@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
 import os
+import tempfile
 from pathlib import Path
 
 import sentry_sdk
@@ -78,12 +79,18 @@ MIDDLEWARE = [
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'cantica.middleware.ContentVersionMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# Opt-in per-request query and stage timings, sent in the Server-Timing header and logged
+SERVER_TIMING = os.getenv('SERVER_TIMING', 'False') == 'True'
+if SERVER_TIMING:
+    MIDDLEWARE.insert(0, 'cantica.middleware.ServerTimingMiddleware')
+
 ROOT_URLCONF = 'cantica.urls'
 
 TEMPLATES = [
@@ -119,8 +126,27 @@ if ENVIRONMENT == 'production':
             'PASSWORD': os.getenv('DB_PASSWORD', ''),
             'HOST': os.getenv('DB_HOST', 'cantica-db.flycast'),
             'PORT': os.getenv('DB_PORT', '5432'),
+            'CONN_HEALTH_CHECKS': True,
         },
     }
+    # Every worker process keeps a psycopg connection pool, connections are checked before reuse.
+    # A gthread worker uses at most one connection per thread, so the pool is as large as GUNICORN_THREADS.
+    # Under ASGI the pool bounds the concurrent queries of a worker, further requests wait for a free connection.
+    # The database has to allow workers x DB_POOL_MAX_SIZE connections, see /api/database-stats/ for saturation.
+    if os.getenv('DB_POOL', 'True') == 'True':
+        DATABASES['default']['OPTIONS'] = {
+            'pool': {
+                'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '1')),
+                'max_size': int(os.getenv('DB_POOL_MAX_SIZE', os.getenv('GUNICORN_THREADS', '4'))),
+                'timeout': int(os.getenv('DB_POOL_TIMEOUT', '10')),
+            },
+        }
+    else:
+        # Persistent connections instead, one per thread. Under ASGI every request runs in its own thread,
+        # so connections are not persisted there.
+        DATABASES['default']['CONN_MAX_AGE'] = int(
+            os.getenv('DB_CONN_MAX_AGE', '0' if os.getenv('SERVER_MODE') == 'asgi' else '600'),
+        )
 else:
     DATABASES = {
         'default': {
@@ -130,6 +156,31 @@ else:
     }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# The cache has to be shared by all workers, otherwise invalidation only reaches the worker serving the request.
+
+REDIS_URL = os.getenv('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        },
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.getenv('CACHE_DIR', os.path.join(tempfile.gettempdir(), 'cantica-cache')),
+            'OPTIONS': {
+                'MAX_ENTRIES': 10000,
+            },
+        },
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -167,10 +218,25 @@ USE_TZ = True
 STATIC_URL = '/static/'
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 # STATICFILES_DIRS = [BASE_DIR / 'static']
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# In production the files are collected, hashed and compressed (gzip and brotli) when the image is built,
+# WhiteNoise serves the hashed files with a far-future immutable max-age.
+# Elsewhere there is no collected manifest, so the files are served under their original names.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': (
+            'whitenoise.storage.CompressedManifestStaticFilesStorage'
+            if ENVIRONMENT == 'production'
+            else 'django.contrib.staticfiles.storage.StaticFilesStorage'
+        ),
+    },
+}
 
 WHITENOISE_KEEP_ONLY_HASHED_FILES = False
-WHITENOISE_AUTOREFRESH = True
+# Rescanning the files on every request is only needed while developing
+WHITENOISE_AUTOREFRESH = DEBUG
 
 
 # Default primary key field type
@@ -19,6 +19,8 @@ from urllib.request import Request
 from django.contrib import admin
 from django.urls import include, path
 
+from cantica.views import DatabaseStatsView
+
 
 def trigger_error(request: Request) -> None:
     division_by_zero = 1 / 0  # noqa F841
@@ -28,6 +30,7 @@ urlpatterns = [
     path('db/', admin.site.urls),
     path('api/songs/', include('songs.urls')),
     path('api/celebrations/', include('celebrations.urls')),
+    path('api/database-stats/', DatabaseStatsView.as_view(), name='database_stats'),
     path('', include('home.urls')),
     path('sentry-debug/', trigger_error),
 ]
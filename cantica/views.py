@@ -0,0 +1,15 @@
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.http import JsonResponse
+from django.views import View
+
+from cantica.database import get_database_stats
+
+
+class DatabaseStatsView(LoginRequiredMixin, View):
+    """
+    Database connection statistics of the worker process serving the request,
+    repeated requests are served by the other workers too.
+    """
+
+    def get(self, *args, **kwargs) -> JsonResponse:
+        return JsonResponse(get_database_stats())
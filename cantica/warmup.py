@@ -0,0 +1,55 @@
+import logging
+import os
+import time
+from typing import Optional
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.core.signals import request_finished
+from django.urls import resolve
+
+from songs.utils.rule_index import get_rule_index
+
+logger = logging.getLogger(__name__)
+
+FIRST_REQUEST_UID = 'cantica.warmup.first_request'
+
+
+def warm_up() -> Optional[float]:
+    """
+    Prime what the first requests would otherwise pay for: the URLconf and the views it imports,
+    the ContentType cache and the rule index. Read-only, recommendations are materialized by the preload worker.
+    Returns the duration in seconds, or None if the warm-up failed, failures are logged and the server starts cold then.
+    """
+    started = time.perf_counter()
+    try:
+        resolve('/')
+        ContentType.objects.get_for_models(*apps.get_models())
+        get_rule_index()
+    except Exception:
+        logger.exception('Warm-up failed.')
+        return None
+    return time.perf_counter() - started
+
+
+def time_first_request() -> None:
+    """
+    Log how long after this call the process finishes its first request, called when a worker starts.
+    Stopped machines are started by a request, so this is what a cold start costs the first visitor.
+    """
+    started = time.perf_counter()
+
+    def log_first_request(sender: type, **kwargs) -> None:
+        # Only one of concurrent first requests disconnects the receiver and logs
+        if not request_finished.disconnect(dispatch_uid=FIRST_REQUEST_UID):
+            return
+        duration = time.perf_counter() - started
+        logger.info(
+            'Worker {pid} finished its first request {duration:.0f} ms after it started'.format(
+                pid=os.getpid(),
+                duration=duration * 1000,
+            ),
+            extra={'time_to_first_request_ms': round(duration * 1000, 2)},
+        )
+
+    request_finished.connect(log_first_request, weak=False, dispatch_uid=FIRST_REQUEST_UID)
@@ -1,6 +1,6 @@
 from django.contrib import admin
 
-from .models import Celebration, CelebrationType, LiturgicalCalendarEvent
+from .models import Celebration, CelebrationType, LiturgicalCalendarEvent, PreloadJob
 
 
 @admin.register(LiturgicalCalendarEvent)
@@ -18,3 +18,10 @@ class CelebrationAdmin(admin.ModelAdmin):
     list_display = ('name',)
     list_filter = ('types',)
     search_fields = ('name',)
+
+
+@admin.register(PreloadJob)
+class PreloadJobAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'status', 'created_at', 'started_at', 'finished_at')
+    list_filter = ('status',)
+    readonly_fields = ('progress', 'error', 'created_at', 'started_at', 'finished_at')
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class CelebrationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'celebrations'
+
+    def ready(self) -> None:
+        from celebrations import checks  # noqa: F401
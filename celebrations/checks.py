@@ -0,0 +1,28 @@
+from typing import Any, List
+
+from django.conf import settings
+from django.core.checks import CheckMessage, Error, Tags, register
+
+# Cache backends whose data is not shared between machines
+LOCAL_CACHE_BACKENDS = (
+    'django.core.cache.backends.filebased.FileBasedCache',
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+@register(Tags.caches)
+def check_shared_cache(*args, **kwargs: Any) -> List[CheckMessage]:
+    """
+    In production the preload worker runs on its own machine. The content version it bumps after a preload
+    reaches the web machines only through a shared cache, otherwise they keep serving the previous pages.
+    """
+    if settings.ENVIRONMENT != 'production':
+        return []
+    if settings.CACHES['default']['BACKEND'] not in LOCAL_CACHE_BACKENDS:
+        return []
+    return [Error(
+        'The default cache is not shared between machines.',
+        hint='Set REDIS_URL, so the preload worker and the web machines share the content version.',
+        id='celebrations.E001',
+    )]
@@ -0,0 +1,79 @@
+import json
+from datetime import date
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from celebrations.utils.calendar_generator import LiturgicalCalendarGenerator
+from celebrations.utils.liturgy_api_client import LiturgyAPIClient
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate the liturgical calendar locally for the given years and store it. '
+        'With --check, compare the generated calendar with cached calendar API payloads instead.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument('start_year', type=int)
+        parser.add_argument('end_year', type=int, nargs='?', help='Last year to generate, defaults to start_year.')
+        parser.add_argument(
+            '--check',
+            metavar='DIR',
+            help='Directory with JSON files of cached API payloads (a day or a list of days per file).',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Generate the calendar without saving it.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        start_year = options['start_year']
+        end_year = options['end_year'] or start_year
+        if end_year < start_year:
+            raise CommandError('end_year must not be before start_year.')
+
+        days = LiturgicalCalendarGenerator().generate_range(date(start_year, 1, 1), date(end_year, 12, 31))
+        if options['check']:
+            self.compare(days, cached=self.load_payloads(Path(options['check'])))
+            return
+        if not options['dry_run']:
+            LiturgyAPIClient().update_database_bulk(days)
+        self.stdout.write(f'Generated {len(days)} days for {start_year}-{end_year}.')
+
+    def load_payloads(self, directory: Path) -> Dict[str, Dict]:
+        if not directory.is_dir():
+            raise CommandError(f'{directory} is not a directory.')
+        payloads = {}
+        for path in sorted(directory.glob('*.json')):
+            data = json.loads(path.read_text(encoding='utf-8'))
+            for day in data if isinstance(data, list) else [data]:
+                payloads[day['date']] = day
+        return payloads
+
+    def compare(self, days: List[Dict], cached: Dict[str, Dict]) -> None:
+        """Print days whose season, season week or celebration titles differ from the cached payloads."""
+        compared = differences = 0
+        for day in days:
+            expected = cached.get(day['date'])
+            if expected is None:
+                continue
+            compared += 1
+            diff = self.diff_day(generated=day, expected=expected)
+            if diff:
+                differences += 1
+                self.stdout.write(f'{day["date"]}: {diff}')
+        self.stdout.write(f'Compared {compared} days, {differences} differ.')
+
+    def diff_day(self, generated: Dict, expected: Dict) -> Optional[str]:
+        diffs = []
+        for field in ('season', 'season_week'):
+            if generated.get(field) != expected.get(field):
+                diffs.append(f'{field} {generated.get(field)!r} != {expected.get(field)!r}')
+        generated_titles = [celebration['title'] for celebration in generated['celebrations']]
+        expected_titles = [celebration['title'] for celebration in expected.get('celebrations', [])]
+        if generated_titles != expected_titles:
+            diffs.append(f'celebrations {generated_titles} != {expected_titles}')
+        return '; '.join(diffs) or None
@@ -0,0 +1,42 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from celebrations.utils.preload_jobs import claim_next_job, run_job
+from songs.utils.daily_recommendations import materialize_missing_day
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued calendar preload jobs and keep today's recommendations materialized. "
+        'Runs until interrupted unless --once is given.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once there are no pending jobs.',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=5.0,
+            help='Seconds to wait before checking for new jobs.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        while True:
+            job = claim_next_job()
+            if job is None:
+                # The web processes only read materialized recommendations, they are stored here when idle
+                if materialize_missing_day(date.today()):
+                    self.stdout.write("Materialized today's recommendations.")
+                if options['once']:
+                    return
+                time.sleep(options['poll_interval'])
+                continue
+            self.stdout.write(f'Running preload job {job.pk}: {job}')
+            run_job(job)
+            self.stdout.write(f'Preload job {job.pk} finished with status {job.status}.')
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-18 13:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('celebrations', '0005_preloadjob'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='liturgicalcalendarevent',
+            name='season',
+            field=models.CharField(db_index=True, max_length=50),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-18 13:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('celebrations', '0006_alter_liturgicalcalendarevent_season'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='preloadjob',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, help_text='Last sign of life of the worker running the job, a running job without one for long is reclaimed.', null=True),
+        ),
+    ]
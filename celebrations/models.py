@@ -1,4 +1,4 @@
-from typing import ClassVar
+from typing import ClassVar, List, Tuple
 
 from django.db import models
 from django.utils.text import slugify
@@ -36,7 +36,7 @@ class Celebration(models.Model):
 
 class LiturgicalCalendarEvent(models.Model):
     date = models.DateField(unique=True)
-    season = models.CharField(max_length=50)
+    season = models.CharField(db_index=True, max_length=50)
     celebrations = models.ManyToManyField(
         Celebration,
         related_name='liturgical_calendar_events',
@@ -44,3 +44,44 @@ class LiturgicalCalendarEvent(models.Model):
 
     def __str__(self) -> str:
         return f"{self.date}, {self.season}, ({', '.join(c.slug for c in self.celebrations.all())})"
+
+
+class PreloadJob(models.Model):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES: ClassVar = [
+        (PENDING, 'pending'),
+        (RUNNING, 'running'),
+        (DONE, 'done'),
+        (FAILED, 'failed'),
+    ]
+
+    year = models.PositiveIntegerField()
+    month = models.PositiveIntegerField(null=True, blank=True)
+    day = models.PositiveIntegerField(null=True, blank=True)
+    status = models.CharField(db_index=True, max_length=20, choices=STATUS_CHOICES, default=PENDING)
+    progress = models.JSONField(default=dict, help_text='Status of each month, e.g. {"2025-01": "done"}.')
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    heartbeat_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text='Last sign of life of the worker running the job, a running job without one for long is reclaimed.',
+    )
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering: ClassVar = ['created_at']
+
+    @property
+    def months(self) -> List[Tuple[int, int]]:
+        if self.month is not None:
+            return [(self.year, self.month)]
+        return [(self.year, month) for month in range(1, 13)]
+
+    def __str__(self) -> str:
+        target = '-'.join(str(part) for part in (self.year, self.month, self.day) if part is not None)
+        return f'{target} ({self.status})'
@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+# Sent after calendar data were written in bulk, bypassing model signals.
+# Arguments: dates (list of updated dates), celebrations (list of ids of updated celebrations).
+calendar_updated = Signal()
@@ -0,0 +1,394 @@
+import json
+import tempfile
+import threading
+from collections import Counter
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from pathlib import Path
+from typing import Callable, ClassVar, Dict, Iterable, List, Optional, Tuple
+
+import requests
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from celebrations.checks import check_shared_cache
+from celebrations.models import LiturgicalCalendarEvent, PreloadJob
+from celebrations.utils.calendar_generator import LiturgicalCalendarGenerator
+from celebrations.utils.liturgy_api_client import LiturgyAPIClient
+from celebrations.utils.preload_jobs import JOB_LEASE, claim_next_job, enqueue_preload_job, run_job
+from songs.models import DailyRecommendation
+from songs.utils.helpers import get_year_anchors
+
+
+class StubCalendarClient:
+    """
+    Records the requested months instead of downloading them, fails on the given month.
+    """
+
+    def __init__(self, failing_month: Optional[Tuple[int, int]] = None) -> None:
+        self.failing_month = failing_month
+        self.months: List[Tuple[int, int]] = []
+        self.days: List[date] = []
+
+    def fetch_day(self, day: date) -> None:
+        self.days.append(day)
+
+    def fetch_months(
+        self,
+        months: Iterable[Tuple[int, int]],
+        on_month_done: Optional[Callable[[int, int], None]] = None,
+    ) -> None:
+        for year, month in months:
+            if (year, month) == self.failing_month:
+                raise ConnectionError(f'{year}-{month} unavailable')
+            self.months.append((year, month))
+            on_month_done(year, month)
+
+
+class PreloadJobTests(TestCase):
+    def test_enqueue_year(self) -> None:
+        job = enqueue_preload_job(year=2025)
+
+        self.assertEqual(job.status, PreloadJob.PENDING)
+        self.assertEqual(len(job.progress), 12)
+        self.assertEqual(set(job.progress.values()), {PreloadJob.PENDING})
+
+    def test_job_is_claimed_once(self) -> None:
+        job = enqueue_preload_job(year=2025, month=3)
+
+        claimed = claim_next_job()
+
+        self.assertEqual(claimed.pk, job.pk)
+        self.assertEqual(claimed.status, PreloadJob.RUNNING)
+        self.assertIsNotNone(claimed.heartbeat_at)
+        self.assertIsNone(claim_next_job())
+
+    def test_job_of_stopped_worker_is_reclaimed(self) -> None:
+        job = enqueue_preload_job(year=2025, month=3)
+        claim_next_job()
+        PreloadJob.objects.filter(pk=job.pk).update(heartbeat_at=timezone.now() - JOB_LEASE * 2)
+
+        reclaimed = claim_next_job()
+
+        self.assertEqual(reclaimed.pk, job.pk)
+        self.assertIsNone(claim_next_job())
+
+    def test_run_year(self) -> None:
+        enqueue_preload_job(year=2025)
+        job = claim_next_job()
+        client = StubCalendarClient()
+
+        run_job(job, client=client)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, PreloadJob.DONE)
+        self.assertEqual(client.months, [(2025, month) for month in range(1, 13)])
+        self.assertEqual(set(job.progress.values()), {PreloadJob.DONE})
+        self.assertIsNotNone(job.finished_at)
+
+    def test_idle_worker_materializes_today(self) -> None:
+        today = date.today()
+        LiturgicalCalendarEvent.objects.create(date=today, season='ordinary')
+
+        call_command('run_preload_worker', once=True, stdout=StringIO())
+
+        self.assertTrue(DailyRecommendation.objects.filter(date=today).exists())
+
+    def test_run_day(self) -> None:
+        enqueue_preload_job(year=2025, month=3, day=19)
+        job = claim_next_job()
+        client = StubCalendarClient()
+
+        run_job(job, client=client)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, PreloadJob.DONE)
+        self.assertEqual(client.days, [date(2025, 3, 19)])
+        self.assertEqual(job.progress, {'2025-03': PreloadJob.DONE})
+
+    def test_failed_months_are_marked_failed(self) -> None:
+        enqueue_preload_job(year=2025)
+        job = claim_next_job()
+
+        run_job(job, client=StubCalendarClient(failing_month=(2025, 4)))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, PreloadJob.FAILED)
+        self.assertIn('2025-4 unavailable', job.error)
+        self.assertEqual(job.progress['2025-03'], PreloadJob.DONE)
+        self.assertEqual(job.progress['2025-04'], PreloadJob.FAILED)
+        self.assertEqual(job.progress['2025-12'], PreloadJob.FAILED)
+
+    def test_reclaimed_job_skips_done_months(self) -> None:
+        job = enqueue_preload_job(year=2025)
+        job.progress['2025-01'] = PreloadJob.DONE
+        job.save()
+        job = claim_next_job()
+        client = StubCalendarClient()
+
+        run_job(job, client=client)
+
+        self.assertEqual(client.months, [(2025, month) for month in range(2, 13)])
+
+
+class PreloadViewTests(TestCase):
+    def setUp(self) -> None:
+        self.client.force_login(User.objects.create_user(username='editor'))
+
+    def test_month_is_scheduled(self) -> None:
+        response = self.client.get(reverse('preload_calendar', args=[2025, 3]))
+
+        self.assertEqual(response.status_code, 202)
+        job = PreloadJob.objects.get(pk=response.json()['job_id'])
+        self.assertEqual((job.year, job.month, job.status), (2025, 3, PreloadJob.PENDING))
+
+    def test_invalid_month_is_rejected(self) -> None:
+        response = self.client.get(reverse('preload_calendar', args=[2025, 13]))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('date', response.json())
+        self.assertFalse(PreloadJob.objects.exists())
+
+    def test_invalid_day_is_rejected(self) -> None:
+        response = self.client.get(reverse('preload_calendar', args=[2025, 2, 30]))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(PreloadJob.objects.exists())
+
+
+class CalendarGeneratorTests(SimpleTestCase):
+    def setUp(self) -> None:
+        self.generator = LiturgicalCalendarGenerator()
+
+    def get_titles(self, day: date) -> List[str]:
+        return [celebration['title'] for celebration in self.generator.generate_day(day)['celebrations']]
+
+    def test_easter(self) -> None:
+        for easter in [date(2024, 3, 31), date(2025, 4, 20), date(2026, 4, 5), date(2027, 3, 28), date(2038, 4, 25)]:
+            with self.subTest(year=easter.year):
+                self.assertEqual(get_year_anchors(easter.year).easter, easter)
+                self.assertEqual(self.get_titles(easter), ['Zmrtvýchvstání Páně'])
+
+    def test_advent_start(self) -> None:
+        for first_sunday in [date(2023, 12, 3), date(2024, 12, 1), date(2025, 11, 30), date(2026, 11, 29)]:
+            with self.subTest(year=first_sunday.year):
+                day = self.generator.generate_day(first_sunday)
+                self.assertEqual((day['season'], day['season_week']), ('advent', 1))
+                self.assertEqual(self.get_titles(first_sunday), ['1. neděle adventní'])
+                saturday = self.generator.generate_day(date.fromordinal(first_sunday.toordinal() - 1))
+                self.assertEqual((saturday['season'], saturday['season_week']), ('ordinary', 34))
+
+    def test_solemnity_on_sunday_of_lent_is_moved_to_monday(self) -> None:
+        self.assertEqual(self.get_titles(date(2023, 3, 19)), ['4. neděle postní'])
+        self.assertEqual(self.get_titles(date(2023, 3, 20)), ['Sv. Josefa, snoubence Panny Marie'])
+
+    def test_solemnity_on_sunday_of_advent_is_moved_to_monday(self) -> None:
+        self.assertEqual(self.get_titles(date(2024, 12, 8)), ['2. neděle adventní'])
+        self.assertEqual(self.get_titles(date(2024, 12, 9)), ['Panny Marie, počaté bez poskvrny prvotního hříchu'])
+
+    def test_annunciation_in_holy_week_is_moved_after_easter_octave(self) -> None:
+        self.assertEqual(self.get_titles(date(2024, 3, 25)), ['Pondělí Svatého týdne'])
+        self.assertEqual(self.get_titles(date(2024, 4, 8)), ['Zvěstování Páně'])
+        self.assertEqual(self.get_titles(date(2027, 3, 25)), ['Zelený čtvrtek'])
+        self.assertEqual(self.get_titles(date(2027, 4, 5)), ['Zvěstování Páně'])
+
+    def test_saint_joseph_in_holy_week_is_anticipated(self) -> None:
+        self.assertEqual(self.get_titles(date(2008, 3, 19)), ['Středa Svatého týdne'])
+        self.assertEqual(self.get_titles(date(2008, 3, 15)), ['Sv. Josefa, snoubence Panny Marie'])
+
+    def test_solemnity_replaces_sunday_in_ordinary_time(self) -> None:
+        self.assertEqual(self.get_titles(date(2025, 6, 29)), ['Sv. Petra a Pavla, apoštolů'])
+
+    def test_czech_proper_celebrations(self) -> None:
+        self.assertEqual(
+            self.get_titles(date(2025, 9, 28)),
+            ['Sv. Václava, mučedníka, hlavního patrona českého národa'],
+        )
+        self.assertEqual(
+            self.get_titles(date(2025, 5, 16)),
+            ['Sv. Jana Nepomuckého, kněze a mučedníka, hlavního patrona Čech'],
+        )
+        # A feast in the Easter octave is not celebrated
+        self.assertEqual(self.get_titles(date(2025, 4, 23)), ['Středa v oktávu velikonočním'])
+
+
+# Days of 2025 as published in the Czech calendar: date, season, season week and celebration titles
+CALENDAR_2025 = [
+    ('2025-03-05', 'lent', 0, ['Popeleční středa']),
+    ('2025-04-20', 'easter', 1, ['Zmrtvýchvstání Páně']),
+    ('2025-04-23', 'easter', 1, ['Středa v oktávu velikonočním']),
+    ('2025-05-16', 'easter', 4, ['Sv. Jana Nepomuckého, kněze a mučedníka, hlavního patrona Čech']),
+    ('2025-06-09', 'ordinary', 10, ['Panny Marie, Matky církve']),
+    ('2025-06-19', 'ordinary', 11, ['Těla a krve Páně']),
+    ('2025-06-23', 'ordinary', 12, ['Pondělí 12. týdne v mezidobí']),
+    ('2025-06-29', 'ordinary', 13, ['Sv. Petra a Pavla, apoštolů']),
+    ('2025-09-28', 'ordinary', 26, ['Sv. Václava, mučedníka, hlavního patrona českého národa']),
+    ('2025-11-30', 'advent', 1, ['1. neděle adventní']),
+    ('2025-12-17', 'advent', 3, ['17. prosince']),
+]
+
+
+class GenerateCalendarCheckTests(SimpleTestCase):
+    """
+    `generate_calendar --check` compares the generated calendar with payloads in the calendar API format.
+    """
+
+    def check(self, payloads: List[Dict]) -> str:
+        with tempfile.TemporaryDirectory() as directory:
+            for payload in payloads:
+                path = Path(directory) / f'{payload["date"]}.json'
+                path.write_text(json.dumps(payload, ensure_ascii=False), encoding='utf-8')
+            stdout = StringIO()
+            call_command('generate_calendar', '2025', check=directory, stdout=stdout)
+        return stdout.getvalue()
+
+    def get_payloads(self) -> List[Dict]:
+        return [
+            {
+                'date': day,
+                'season': season,
+                'season_week': season_week,
+                'celebrations': [{'title': title} for title in titles],
+            }
+            for day, season, season_week, titles in CALENDAR_2025
+        ]
+
+    def test_generated_calendar_matches(self) -> None:
+        output = self.check(self.get_payloads())
+
+        self.assertIn(f'Compared {len(CALENDAR_2025)} days, 0 differ.', output)
+
+    def test_differences_are_reported(self) -> None:
+        payloads = self.get_payloads()
+        payloads[0]['celebrations'] = [{'title': 'Středa 8. týdne v mezidobí'}]
+
+        output = self.check(payloads)
+
+        self.assertIn('2025-03-05: celebrations', output)
+        self.assertIn(f'Compared {len(CALENDAR_2025)} days, 1 differ.', output)
+
+
+def get_month_payload(path: str) -> Optional[List[Dict]]:
+    """
+    Days of the month requested by a calendar API path ending with /<year>/<month>, generated locally.
+    """
+    try:
+        year, month = (int(part) for part in path.rstrip('/').split('/')[-2:])
+        start = date(year, month, 1)
+    except ValueError:
+        return None
+    end = date(year + month // 12, month % 12 + 1, 1)
+    return LiturgicalCalendarGenerator().generate_range(start, date.fromordinal(end.toordinal() - 1))
+
+
+class ConcurrentStubTransport(requests.adapters.BaseAdapter):
+    """
+    Answers calendar API requests with generated months. Requests wait for each other at a barrier,
+    so the months are answered only if the given number of them is requested at once.
+    """
+
+    def __init__(self, concurrency: int) -> None:
+        super().__init__()
+        self.barrier = threading.Barrier(concurrency, timeout=5)
+        self.paths: List[str] = []
+
+    def send(self, request: requests.PreparedRequest, *args, **kwargs) -> requests.Response:
+        self.paths.append(request.path_url)
+        self.barrier.wait()
+        payload = get_month_payload(request.path_url)
+        response = requests.Response()
+        response.status_code = 200 if payload is not None else 404
+        response._content = json.dumps(payload).encode()
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self) -> None:
+        pass
+
+
+class FlakyCalendarHandler(BaseHTTPRequestHandler):
+    """
+    Calendar API stub server, the first request for every month fails with 503.
+    """
+    counts: Counter
+
+    def do_GET(self) -> None:
+        self.counts[self.path] += 1
+        payload = get_month_payload(self.path)
+        if payload is None:
+            self.send_error(404)
+            return
+        if self.counts[self.path] == 1:
+            self.send_error(503)
+            return
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class LiturgyAPIClientTests(TestCase):
+    months: ClassVar = [(2025, month) for month in range(1, 5)]
+
+    def assert_months_saved(self) -> None:
+        self.assertEqual(LiturgicalCalendarEvent.objects.count(), 120)
+        self.assertEqual(LiturgicalCalendarEvent.objects.get(date=date(2025, 3, 5)).season, 'lent')
+
+    def test_months_are_fetched_concurrently(self) -> None:
+        transport = ConcurrentStubTransport(concurrency=len(self.months))
+        client = LiturgyAPIClient(base_url='http://calendar.test/czech/', transport=transport, max_workers=4)
+        done = []
+
+        client.fetch_months(self.months, on_month_done=lambda year, month: done.append((year, month)))
+
+        self.assertEqual(done, self.months)
+        self.assertCountEqual(transport.paths, [f'/czech/{year}/{month}' for year, month in self.months])
+        self.assert_months_saved()
+
+    def test_failed_requests_are_retried(self) -> None:
+        handler = type('Handler', (FlakyCalendarHandler,), {'counts': Counter()})
+        server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        client = LiturgyAPIClient(base_url=f'http://127.0.0.1:{server.server_port}/czech')
+
+        client.fetch_months(self.months)
+
+        self.assertEqual(set(handler.counts.values()), {2})
+        self.assert_months_saved()
+
+    def test_error_is_raised(self) -> None:
+        transport = ConcurrentStubTransport(concurrency=1)
+        client = LiturgyAPIClient(base_url='http://calendar.test/czech', transport=transport)
+
+        with self.assertRaises(requests.HTTPError):
+            client.fetch_months([(2025, 13)])
+
+
+class SharedCacheCheckTests(SimpleTestCase):
+    @override_settings(ENVIRONMENT='production')
+    def test_local_cache_is_rejected_in_production(self) -> None:
+        errors = check_shared_cache()
+
+        self.assertEqual([error.id for error in errors], ['celebrations.E001'])
+
+    @override_settings(
+        ENVIRONMENT='production',
+        CACHES={'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://cache'}},
+    )
+    def test_shared_cache_is_accepted(self) -> None:
+        self.assertEqual(check_shared_cache(), [])
+
+    def test_local_cache_is_accepted_in_development(self) -> None:
+        self.assertEqual(check_shared_cache(), [])
@@ -1,6 +1,13 @@
 from django.urls import path
 
-from .views import CelebrationListView, ClearCacheView, PreloadDataView, PreloadDayDataView, PreloadMonthDataView
+from .views import (
+    CelebrationListView,
+    ClearCacheView,
+    PreloadDataView,
+    PreloadDayDataView,
+    PreloadJobStatusView,
+    PreloadMonthDataView,
+)
 
 urlpatterns = [
     path('', CelebrationListView.as_view(), name='celebration_list'),
@@ -8,4 +15,5 @@ urlpatterns = [
     path('preload-calendar/<int:year>/', PreloadDataView.as_view(), name='preload_calendar'),
     path('preload-calendar/<int:year>/<int:month>/', PreloadMonthDataView.as_view(), name='preload_calendar'),
     path('preload-calendar/<int:year>/<int:month>/<int:day>/', PreloadDayDataView.as_view(), name='preload_calendar'),
+    path('preload-jobs/<int:job_id>/', PreloadJobStatusView.as_view(), name='preload_job_status'),
 ]
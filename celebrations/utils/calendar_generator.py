@@ -0,0 +1,251 @@
+from datetime import date, timedelta
+from typing import Dict, List, Tuple
+
+from celebrations.utils.czech_calendar import (
+    FEAST_LORD,
+    FIXED_CELEBRATIONS,
+    GREEN,
+    MEMORIAL,
+    RED,
+    SOLEMNITY,
+    VIOLET,
+    WHITE,
+    CalendarCelebration,
+)
+from songs.utils.helpers import YearAnchors, get_year_anchors, sunday_on_or_before
+
+WEEKDAYS = ('monday', 'tuesday', 'wednesday', 'thursday', 'friday', 'saturday', 'sunday')
+WEEKDAYS_CS = ('pondělí', 'úterý', 'středa', 'čtvrtek', 'pátek', 'sobota', 'neděle')
+SUNDAY = 6
+ST_JOSEPH = (3, 19)
+
+TRIDUUM = 1.1
+PRIMARY = 1.2
+SUNDAY_UNPRIVILEGED = 2.6
+FERIAL_PRIVILEGED = 2.9
+MEMORIAL_OPTIONAL = 3.12
+FERIAL = 3.13
+COMMEMORATION = 4.0
+
+
+class LiturgicalCalendarGenerator:
+    """
+    Compute the Czech liturgical calendar locally, in the same format as the calendar API.
+
+    The temporale (seasons, season weeks, Sundays and movable feasts) is computed from the date of Easter
+    and merged with the fixed celebrations of the Czech calendar by their precedence. Impeded solemnities
+    are transferred to the next free day, Saint Joseph in Holy Week to the Saturday before Palm Sunday.
+    The days of the Easter Triduum belong to Lent, as the app has no separate season for them.
+    """
+
+    def __init__(self) -> None:
+        self._transfers: Dict[int, Dict[date, List[CalendarCelebration]]] = {}
+
+    def generate_day(self, day: date) -> Dict:
+        season, season_week, temporale = self.get_temporale(day)
+        celebrations = self.merge(temporale, self.get_sanctorale(day, temporale))
+        return {
+            'date': day.isoformat(),
+            'season': season,
+            'season_week': season_week,
+            'celebrations': [celebration.to_dict() for celebration in celebrations],
+            'weekday': WEEKDAYS[day.weekday()],
+        }
+
+    def generate_range(self, start: date, end: date) -> List[Dict]:
+        """Generate days between start and end (inclusive)."""
+        return [self.generate_day(start + timedelta(days=offset)) for offset in range((end - start).days + 1)]
+
+    def generate_year(self, year: int) -> List[Dict]:
+        return self.generate_range(date(year, 1, 1), date(year, 12, 31))
+
+    def get_season(self, day: date) -> Tuple[str, int]:
+        """Get the season and the season week of the day."""
+        anchors = get_year_anchors(day.year)
+        if day >= anchors.first_advent_sunday:
+            if day < date(day.year, 12, 25):
+                return 'advent', (day - anchors.first_advent_sunday).days // 7 + 1
+            return 'christmas', (day - sunday_on_or_before(date(day.year, 12, 25))).days // 7 + 1
+        if day <= anchors.baptism:
+            christmas_week = sunday_on_or_before(date(day.year - 1, 12, 25))
+            return 'christmas', (day - christmas_week).days // 7 + 1
+        if day < anchors.ash_wednesday:
+            return 'ordinary', (day - anchors.baptism).days // 7 + 1
+        if day < anchors.easter:
+            first_lent_sunday = anchors.ash_wednesday + timedelta(days=4)
+            return 'lent', max((day - first_lent_sunday).days // 7 + 1, 0)
+        if day <= anchors.pentecost:
+            return 'easter', (day - anchors.easter).days // 7 + 1
+        weeks_before_advent = (anchors.first_advent_sunday - sunday_on_or_before(day)).days // 7
+        return 'ordinary', 35 - weeks_before_advent
+
+    def get_temporale(self, day: date) -> Tuple[str, int, CalendarCelebration]:
+        """Get the season, the season week and the temporale celebration of the day."""
+        season, week = self.get_season(day)
+        anchors = get_year_anchors(day.year)
+        weekday = WEEKDAYS_CS[day.weekday()].capitalize()
+        is_sunday = day.weekday() == SUNDAY
+
+        if season == 'advent':
+            if is_sunday:
+                return season, week, CalendarCelebration(f'{week}. neděle adventní', PRIMARY, VIOLET)
+            if day.day >= 17:
+                return season, week, CalendarCelebration(f'{day.day}. prosince', FERIAL_PRIVILEGED, VIOLET)
+            return season, week, CalendarCelebration(f'{weekday} po {week}. neděli adventní', FERIAL, VIOLET)
+
+        if season == 'christmas':
+            return season, week, self.get_christmas_temporale(day, anchors)
+
+        if season == 'lent':
+            return season, week, self.get_lent_temporale(day, week, anchors)
+
+        if season == 'easter':
+            return season, week, self.get_easter_temporale(day, week, anchors)
+
+        movable = {
+            anchors.pentecost + timedelta(days=7): CalendarCelebration('Nejsvětější Trojice', SOLEMNITY, WHITE),
+            anchors.pentecost + timedelta(days=11): CalendarCelebration('Těla a krve Páně', SOLEMNITY, WHITE),
+            anchors.pentecost + timedelta(days=19): CalendarCelebration(
+                'Nejsvětějšího Srdce Ježíšova', SOLEMNITY, WHITE,
+            ),
+            anchors.first_advent_sunday - timedelta(days=7): CalendarCelebration(
+                'Ježíše Krista Krále', SOLEMNITY, WHITE,
+            ),
+        }
+        if day in movable:
+            return season, week, movable[day]
+        if is_sunday:
+            return season, week, CalendarCelebration(f'{week}. neděle v mezidobí', SUNDAY_UNPRIVILEGED, GREEN)
+        return season, week, CalendarCelebration(f'{weekday} {week}. týdne v mezidobí', FERIAL, GREEN)
+
+    def get_christmas_temporale(self, day: date, anchors: YearAnchors) -> CalendarCelebration:
+        weekday = WEEKDAYS_CS[day.weekday()].capitalize()
+        if day.month == 12:
+            if day.day == 25:
+                return CalendarCelebration('Narození Páně', PRIMARY, WHITE)
+            if day == anchors.holy_family:
+                return CalendarCelebration('Svaté rodiny Ježíše, Marie a Josefa', FEAST_LORD, WHITE)
+            return CalendarCelebration(f'{day.day - 24}. den v oktávu Narození Páně', FERIAL_PRIVILEGED, WHITE)
+        if day.day == 1:
+            return CalendarCelebration('Oktáv Narození Páně', FERIAL_PRIVILEGED, WHITE)
+        if day.day == 6:
+            return CalendarCelebration('Zjevení Páně', PRIMARY, WHITE)
+        if day == anchors.baptism:
+            return CalendarCelebration('Křtu Páně', FEAST_LORD, WHITE)
+        if day.weekday() == SUNDAY:
+            return CalendarCelebration('2. neděle po Narození Páně', SUNDAY_UNPRIVILEGED, WHITE)
+        if day.day < 6:
+            return CalendarCelebration(f'{weekday} doby vánoční', FERIAL, WHITE)
+        return CalendarCelebration(f'{weekday} po Zjevení Páně', FERIAL, WHITE)
+
+    def get_lent_temporale(self, day: date, week: int, anchors: YearAnchors) -> CalendarCelebration:
+        weekday = WEEKDAYS_CS[day.weekday()].capitalize()
+        days_before_easter = (anchors.easter - day).days
+        triduum = {
+            3: CalendarCelebration('Zelený čtvrtek', TRIDUUM, WHITE),
+            2: CalendarCelebration('Velký pátek', TRIDUUM, RED),
+            1: CalendarCelebration('Bílá sobota', TRIDUUM, VIOLET),
+        }
+        if days_before_easter in triduum:
+            return triduum[days_before_easter]
+        if day == anchors.ash_wednesday:
+            return CalendarCelebration('Popeleční středa', PRIMARY, VIOLET)
+        if days_before_easter == 7:
+            return CalendarCelebration('Květná neděle', PRIMARY, RED)
+        if days_before_easter < 7:
+            return CalendarCelebration(f'{weekday} Svatého týdne', PRIMARY, VIOLET)
+        if day.weekday() == SUNDAY:
+            return CalendarCelebration(f'{week}. neděle postní', PRIMARY, VIOLET)
+        if week == 0:
+            return CalendarCelebration(f'{weekday} po Popeleční středě', FERIAL_PRIVILEGED, VIOLET)
+        return CalendarCelebration(f'{weekday} po {week}. neděli postní', FERIAL_PRIVILEGED, VIOLET)
+
+    def get_easter_temporale(self, day: date, week: int, anchors: YearAnchors) -> CalendarCelebration:
+        weekday = WEEKDAYS_CS[day.weekday()].capitalize()
+        days_after_easter = (day - anchors.easter).days
+        if days_after_easter == 0:
+            return CalendarCelebration('Zmrtvýchvstání Páně', TRIDUUM, WHITE)
+        if days_after_easter < 7:
+            return CalendarCelebration(f'{weekday} v oktávu velikonočním', PRIMARY, WHITE)
+        if days_after_easter == 39:
+            return CalendarCelebration('Nanebevstoupení Páně', PRIMARY, WHITE)
+        if day == anchors.pentecost:
+            return CalendarCelebration('Seslání Ducha svatého', PRIMARY, RED)
+        if day.weekday() == SUNDAY:
+            return CalendarCelebration(f'{week}. neděle velikonoční', PRIMARY, WHITE)
+        return CalendarCelebration(f'{weekday} po {week}. neděli velikonoční', FERIAL, WHITE)
+
+    def get_sanctorale(self, day: date, temporale: CalendarCelebration) -> List[CalendarCelebration]:
+        """
+        Get celebrations of the day that are not part of the temporale: fixed celebrations that are not impeded,
+        solemnities transferred to this day and movable memorials.
+        """
+        celebrations = [
+            celebration for celebration in FIXED_CELEBRATIONS.get((day.month, day.day), [])
+            if not self.is_impeded(celebration, temporale)
+        ]
+        celebrations.extend(self.get_transfers(day.year).get(day, []))
+
+        anchors = get_year_anchors(day.year)
+        if day == anchors.pentecost + timedelta(days=1):
+            celebrations.append(CalendarCelebration('Panny Marie, Matky církve', MEMORIAL, WHITE))
+        if day == anchors.pentecost + timedelta(days=20):
+            celebrations.append(CalendarCelebration('Neposkvrněného Srdce Panny Marie', MEMORIAL, WHITE))
+        return celebrations
+
+    def is_impeded(self, celebration: CalendarCelebration, temporale: CalendarCelebration) -> bool:
+        """A solemnity is impeded by the Triduum and by the primary liturgical days."""
+        return celebration.rank_num < FEAST_LORD and temporale.rank_num < celebration.rank_num
+
+    def is_free(self, day: date) -> bool:
+        """A day is free for a transferred solemnity if it has no solemnity or primary liturgical day."""
+        if self.get_temporale(day)[2].rank_num < FEAST_LORD:
+            return False
+        return all(
+            celebration.rank_num >= FEAST_LORD for celebration in FIXED_CELEBRATIONS.get((day.month, day.day), [])
+        )
+
+    def is_in_holy_week(self, day: date) -> bool:
+        """Palm Sunday to Holy Saturday."""
+        return 0 < (get_year_anchors(day.year).easter - day).days <= 7
+
+    def get_transfers(self, year: int) -> Dict[date, List[CalendarCelebration]]:
+        """Get the days impeded solemnities of the year are transferred to."""
+        if year not in self._transfers:
+            transfers: Dict[date, List[CalendarCelebration]] = {}
+            for (month, day_of_month), celebrations in FIXED_CELEBRATIONS.items():
+                day = date(year, month, day_of_month)
+                temporale = self.get_temporale(day)[2]
+                for celebration in celebrations:
+                    if not self.is_impeded(celebration, temporale):
+                        continue
+                    if (month, day_of_month) == ST_JOSEPH and self.is_in_holy_week(day):
+                        # Saint Joseph is anticipated to the Saturday before Palm Sunday
+                        transfers[get_year_anchors(year).easter - timedelta(days=8)] = [celebration]
+                        continue
+                    target = day + timedelta(days=1)
+                    while not self.is_free(target) or target in transfers:
+                        target += timedelta(days=1)
+                    transfers[target] = [celebration]
+            self._transfers[year] = transfers
+        return self._transfers[year]
+
+    def merge(self, temporale: CalendarCelebration, sanctorale: List[CalendarCelebration]) -> List[CalendarCelebration]:
+        """
+        Merge celebrations of the day by their precedence.
+        Optional memorials are added after an ordinary weekday, memorials falling on a privileged weekday
+        are only commemorated.
+        """
+        higher = [
+            celebration for celebration in sanctorale
+            if celebration.rank_num < temporale.rank_num and celebration.rank_num < MEMORIAL_OPTIONAL
+        ]
+        if higher:
+            rank_num = min(celebration.rank_num for celebration in higher)
+            return [celebration for celebration in higher if celebration.rank_num == rank_num]
+        if temporale.rank_num == FERIAL:
+            return [temporale, *(c for c in sanctorale if c.rank_num == MEMORIAL_OPTIONAL)]
+        if temporale.rank_num == FERIAL_PRIVILEGED:
+            return [temporale, *(c._replace(rank_num=COMMEMORATION) for c in sanctorale if c.rank_num >= MEMORIAL)]
+        return [temporale]
+
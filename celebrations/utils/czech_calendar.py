@@ -0,0 +1,312 @@
+from typing import Dict, List, NamedTuple, Tuple
+
+# Precedence of liturgical days, lower number means higher precedence.
+RANKS = {
+    1.1: 'Easter triduum',
+    1.2: 'Primary liturgical days',
+    1.3: 'Solemnities in the General Calendar',
+    1.4: 'Proper solemnities',
+    2.5: 'Feasts of the Lord in the General Calendar',
+    2.6: 'Sundays of Christmas Time and Sundays in Ordinary Time',
+    2.7: 'Feasts of the Blessed Virgin Mary and of the Saints in the General Calendar',
+    2.8: 'Proper feasts',
+    2.9: 'Privileged weekdays',
+    3.10: 'Obligatory memorials in the General Calendar',
+    3.11: 'Proper obligatory memorials',
+    3.12: 'Optional memorials',
+    3.13: 'Unprivileged weekdays',
+    4.0: 'Commemorations',
+}
+
+SOLEMNITY = 1.3
+SOLEMNITY_PROPER = 1.4
+FEAST_LORD = 2.5
+FEAST = 2.7
+FEAST_PROPER = 2.8
+MEMORIAL = 3.10
+MEMORIAL_PROPER = 3.11
+MEMORIAL_OPTIONAL = 3.12
+
+WHITE = 'white'
+RED = 'red'
+VIOLET = 'violet'
+GREEN = 'green'
+
+
+class CalendarCelebration(NamedTuple):
+    title: str
+    rank_num: float
+    colour: str
+
+    def to_dict(self) -> Dict:
+        """Serialize the celebration the same way the calendar API does."""
+        return {
+            'title': self.title,
+            'colour': self.colour,
+            'rank': RANKS[self.rank_num],
+            'rank_num': self.rank_num,
+        }
+
+
+def _(title: str, rank_num: float, colour: str = WHITE) -> CalendarCelebration:
+    return CalendarCelebration(title=title, rank_num=rank_num, colour=colour)
+
+
+# Celebrations with a fixed date in the Czech calendar, keyed by (month, day).
+# Christmas and Epiphany are part of the temporale.
+FIXED_CELEBRATIONS: Dict[Tuple[int, int], List[CalendarCelebration]] = {
+    (1, 1): [_('Matky Boží, Panny Marie', SOLEMNITY)],
+    (1, 2): [_('Sv. Basila Velikého a Řehoře Naziánského, biskupů a učitelů církve', MEMORIAL)],
+    (1, 3): [_('Nejsvětějšího jména Ježíš', MEMORIAL_OPTIONAL)],
+    (1, 13): [_('Sv. Hilaria, biskupa a učitele církve', MEMORIAL_OPTIONAL)],
+    (1, 17): [_('Sv. Antonína, opata', MEMORIAL)],
+    (1, 20): [
+        _('Sv. Fabiána, papeže a mučedníka', MEMORIAL_OPTIONAL, RED),
+        _('Sv. Šebestiána, mučedníka', MEMORIAL_OPTIONAL, RED),
+    ],
+    (1, 21): [_('Sv. Anežky Římské, panny a mučednice', MEMORIAL, RED)],
+    (1, 22): [_('Sv. Vincence, jáhna a mučedníka', MEMORIAL_OPTIONAL, RED)],
+    (1, 24): [_('Sv. Františka Saleského, biskupa a učitele církve', MEMORIAL)],
+    (1, 25): [_('Obrácení svatého Pavla, apoštola', FEAST)],
+    (1, 26): [_('Sv. Timoteje a Tita, biskupů', MEMORIAL)],
+    (1, 27): [_('Sv. Anděly Mericiové, panny', MEMORIAL_OPTIONAL)],
+    (1, 28): [_('Sv. Tomáše Akvinského, kněze a učitele církve', MEMORIAL)],
+    (1, 31): [_('Sv. Jana Boska, kněze', MEMORIAL)],
+    (2, 2): [_('Uvedení Páně do chrámu', FEAST_LORD)],
+    (2, 3): [
+        _('Sv. Blažeje, biskupa a mučedníka', MEMORIAL_OPTIONAL, RED),
+        _('Sv. Ansgara, biskupa', MEMORIAL_OPTIONAL),
+    ],
+    (2, 5): [_('Sv. Agáty, panny a mučednice', MEMORIAL, RED)],
+    (2, 6): [_('Sv. Pavla Mikiho a druhů, mučedníků', MEMORIAL, RED)],
+    (2, 8): [
+        _('Sv. Jeronýma Emilianiho', MEMORIAL_OPTIONAL),
+        _('Sv. Josefiny Bakhity, panny', MEMORIAL_OPTIONAL),
+    ],
+    (2, 10): [_('Sv. Scholastiky, panny', MEMORIAL)],
+    (2, 11): [_('Panny Marie Lurdské', MEMORIAL_OPTIONAL)],
+    (2, 14): [_('Sv. Cyrila, mnicha, a Metoděje, biskupa, patronů Evropy', MEMORIAL_PROPER)],
+    (2, 17): [_('Sedmi svatých zakladatelů řádu Služebníků Panny Marie', MEMORIAL_OPTIONAL)],
+    (2, 21): [_('Sv. Petra Damiániho, biskupa a učitele církve', MEMORIAL_OPTIONAL)],
+    (2, 22): [_('Stolce svatého Petra, apoštola', FEAST)],
+    (2, 23): [_('Sv. Polykarpa, biskupa a mučedníka', MEMORIAL, RED)],
+    (3, 4): [_('Sv. Kazimíra', MEMORIAL_OPTIONAL)],
+    (3, 7): [_('Sv. Perpetuy a Felicity, mučednic', MEMORIAL, RED)],
+    (3, 8): [_('Sv. Jana z Boha, řeholníka', MEMORIAL_OPTIONAL)],
+    (3, 9): [_('Sv. Františky Římské, řeholnice', MEMORIAL_OPTIONAL)],
+    (3, 17): [_('Sv. Patrika, biskupa', MEMORIAL_OPTIONAL)],
+    (3, 18): [_('Sv. Cyrila Jeruzalémského, biskupa a učitele církve', MEMORIAL_OPTIONAL)],
+    (3, 19): [_('Sv. Josefa, snoubence Panny Marie', SOLEMNITY)],
+    (3, 23): [_('Sv. Turibia z Mongroveja, biskupa', MEMORIAL_OPTIONAL)],
+    (3, 25): [_('Zvěstování Páně', SOLEMNITY)],
+    (4, 2): [_('Sv. Františka z Pauly, poustevníka', MEMORIAL_OPTIONAL)],
+    (4, 4): [_('Sv. Izidora, biskupa a učitele církve', MEMORIAL_OPTIONAL)],
+    (4, 5): [_('Sv. Vincence Ferrerského, kněze', MEMORIAL_OPTIONAL)],
+    (4, 7): [_('Sv. Jana Křtitele de la Salle, kněze', MEMORIAL)],
+    (4, 11): [_('Sv. Stanislava, biskupa a mučedníka', MEMORIAL, RED)],
+    (4, 13): [_('Sv. Martina I., papeže a mučedníka', MEMORIAL_OPTIONAL, RED)],
+    (4, 21): [_('Sv. Anselma, biskupa a učitele církve', MEMORIAL_OPTIONAL)],
+    (4, 23): [_('Sv. Vojtěcha, biskupa a mučedníka, hlavního patrona pražské arcidiecéze', FEAST_PROPER, RED)],
+    (4, 24): [
+        _('Sv. Jiří, mučedníka', MEMORIAL_OPTIONAL, RED),
+        _('Sv. Fidela ze Sigmaringy, kněze a mučedníka', MEMORIAL_OPTIONAL, RED),
+    ],
+    (4, 25): [_('Sv. Marka, evangelisty', FEAST, RED)],
+    (4, 28): [
+        _('Sv. Petra Chanela, kněze a mučedníka', MEMORIAL_OPTIONAL, RED),
+        _('Sv. Ludvíka Marie Grignona z Montfortu, kněze', MEMORIAL_OPTIONAL),
+    ],
+    (4, 29): [_('Sv. Kateřiny Sienské, panny a učitelky církve, patronky Evropy', FEAST_PROPER)],
+    (4, 30): [
+        _('Sv. Zikmunda, mučedníka', MEMORIAL_OPTIONAL, RED),
+        _('Sv. Pia V., papeže', MEMORIAL_OPTIONAL),
+    ],
+    (5, 1): [_('Sv. Josefa, dělníka', MEMORIAL_OPTIONAL)],
+    (5, 2): [_('Sv. Atanáše, biskupa a učitele církve', MEMORIAL)],
+    (5, 3): [_('Sv. Filipa a Jakuba, apoštolů', FEAST, RED)],
+    (5, 6): [_('Sv. Jana Sarkandra, kněze a mučedníka', MEMORIAL_PROPER, RED)],
+    (5, 12): [
+        _('Sv. Nerea a Achillea, mučedníků', MEMORIAL_OPTIONAL, RED),
+        _('Sv. Pankráce, mučedníka', MEMORIAL_OPTIONAL, RED),
+    ],
+    (5, 13): [_('Panny Marie Fatimské', MEMORIAL_OPTIONAL)],
+    (5, 14): [_('Sv. Matěje, apoštola', FEAST, RED)],
+    (5, 16): [_('Sv. Jana Nepomuckého, kněze a mučedníka, hlavního patrona Čech', FEAST_PROPER, RED)],
+    (5, 18): [_('Sv. Jana I., papeže a mučedníka', MEMORIAL_OPTIONAL, RED)],
+    (5, 20): [_('Sv. Bernardina Sienského, kněze', MEMORIAL_OPTIONAL)],
+    (5, 21): [_('Sv. Kryštofa Magallana, kněze, a druhů, mučedníků', MEMORIAL_OPTIONAL, RED)],
+    (5, 22): [_('Sv. Rity z Cascie, řeholnice', MEMORIAL_OPTIONAL)],
+    (5, 25): [
+        _('Sv. Bedy Ctihodného, kněze a učitele církve', MEMORIAL_OPTIONAL),
+        _('Sv. Řehoře VII., papeže', MEMORIAL_OPTIONAL),
+        _('Sv. Marie Magdalény de Pazzi, panny', MEMORIAL_OPTIONAL),
+    ],
+    (5, 26): [_('Sv. Filipa Neriho, kněze', MEMORIAL)],
+    (5, 27): [_('Sv. Augustina z Canterbury, biskupa', MEMORIAL_OPTIONAL)],
+    (5, 30): [_('Sv. Zdislavy', MEMORIAL_PROPER)],
+    (5, 31): [_('Navštívení Panny Marie', FEAST)],
+    (6, 1): [_('Sv. Justina, mučedníka', MEMORIAL, RED)],
+    (6, 2): [_('Sv. Marcelina a Petra, mučedníků', MEMORIAL_OPTIONAL, RED)],
+    (6, 3): [_('Sv. Karla Lwangy a druhů, mučedníků', MEMORIAL, RED)],
+    (6, 5): [_('Sv. Bonifáce, biskupa a mučedníka', MEMORIAL, RED)],
+    (6, 6): [_('Sv. Norberta, biskupa', MEMORIAL_OPTIONAL)],
+    (6, 9): [_('Sv. Efréma Syrského, jáhna a učitele církve', MEMORIAL_OPTIONAL)],
+    (6, 11): [_('Sv. Barnabáše, apoštola', MEMORIAL, RED)],
+    (6, 13): [_('Sv. Antonína z Padovy, kněze a učitele církve', MEMORIAL)],
+    (6, 15): [_('Sv. Víta, mučedníka', MEMORIAL_PROPER, RED)],
+    (6, 19): [_('Sv. Romualda, opata', MEMORIAL_OPTIONAL)],
+    (6, 21): [_('Sv. Aloise Gonzagy, řeholníka', MEMORIAL)],
+    (6, 22): [
+        _('Sv. Paulína Nolánského, biskupa', MEMORIAL_OPTIONAL),
+        _('Sv. Jana Fishera, biskupa, a Tomáše Mora, mučedníků', MEMORIAL_OPTIONAL, RED),
+    ],
+    (6, 24): [_('Narození svatého Jana Křtitele', SOLEMNITY)],
+    (6, 27): [_('Sv. Cyrila Alexandrijského, biskupa a učitele církve', MEMORIAL_OPTIONAL)],
+    (6, 28): [_('Sv. Ireneje, biskupa a mučedníka', MEMORIAL, RED)],
+    (6, 29): [_('Sv. Petra a Pavla, apoštolů', SOLEMNITY, RED)],
+    (6, 30): [_('Svatých prvomučedníků římských', MEMORIAL_OPTIONAL, RED)],
+    (7, 3): [_('Sv. Tomáše, apoštola', FEAST, RED)],
+    (7, 4): [
+        _('Sv. Prokopa, opata', MEMORIAL_PROPER),
+        _('Sv. Alžběty Portugalské', MEMORIAL_OPTIONAL),
+    ],
+    (7, 5): [_('Sv. Cyrila, mnicha, a Metoděje, biskupa, patronů Evropy, hlavních patronů Moravy', SOLEMNITY_PROPER)],
+    (7, 6): [_('Sv. Marie Gorettiové, panny a mučednice', MEMORIAL_OPTIONAL, RED)],
+    (7, 11): [_('Sv. Benedikta, opata, patrona Evropy', FEAST_PROPER)],
+    (7, 13): [_('Sv. Jindřicha', MEMORIAL_OPTIONAL)],
+    (7, 14): [_('Sv. Kamila de Lellis, kněze', MEMORIAL_OPTIONAL)],
+    (7, 15): [_('Sv. Bonaventury, biskupa a učitele církve', MEMORIAL)],
+    (7, 16): [_('Panny Marie Karmelské', MEMORIAL_OPTIONAL)],
+    (7, 17): [_('Bl. Česlava a sv. Hyacinta, kněží', MEMORIAL_OPTIONAL)],
+    (7, 20): [_('Sv. Apolináře, biskupa a mučedníka', MEMORIAL_OPTIONAL, RED)],
+    (7, 21): [_('Sv. Vavřince z Brindisi, kněze a učitele církve', MEMORIAL_OPTIONAL)],
+    (7, 22): [_('Sv. Marie Magdalény', FEAST)],
+    (7, 23): [_('Sv. Brigity, řeholnice, patronky Evropy', FEAST_PROPER)],
+    (7, 24): [_('Sv. Šarbela Machlufa, kněze', MEMORIAL_OPTIONAL)],
+    (7, 25): [_('Sv. Jakuba, apoštola', FEAST, RED)],
+    (7, 26): [_('Sv. Jáchyma a Anny, rodičů Panny Marie', MEMORIAL)],
+    (7, 29): [_('Sv. Marty, Marie a Lazara', MEMORIAL)],
+    (7, 30): [_('Sv. Petra Chryzologa, biskupa a učitele církve', MEMORIAL_OPTIONAL)],
+    (7, 31): [_('Sv. Ignáce z Loyoly, kněze', MEMORIAL)],
+    (8, 1): [_('Sv. Alfonsa Marie z Liguori, biskupa a učitele církve', MEMORIAL)],
+    (8, 2): [
+        _('Sv. Eusebia z Vercelli, biskupa', MEMORIAL_OPTIONAL),
+        _('Sv. Petra Juliána Eymarda, kněze', MEMORIAL_OPTIONAL),
+    ],
+    (8, 4): [_('Sv. Jana Marie Vianneye, kněze', MEMORIAL)],
+    (8, 5): [_('Posvěcení římské baziliky Panny Marie', MEMORIAL_OPTIONAL)],
+    (8, 6): [_('Proměnění Páně', FEAST_LORD)],
+    (8, 7): [
+        _('Sv. Sixta II., papeže, a druhů, mučedníků', MEMORIAL_OPTIONAL, RED),
+        _('Sv. Kajetána, kněze', MEMORIAL_OPTIONAL),
+    ],
+    (8, 8): [_('Sv. Dominika, kněze', MEMORIAL)],
+    (8, 9): [_('Sv. Terezie Benedikty od Kříže, panny a mučednice, patronky Evropy', FEAST_PROPER, RED)],
+    (8, 10): [_('Sv. Vavřince, jáhna a mučedníka', FEAST, RED)],
+    (8, 11): [_('Sv. Kláry, panny', MEMORIAL)],
+    (8, 12): [_('Sv. Jany Františky de Chantal, řeholnice', MEMORIAL_OPTIONAL)],
+    (8, 13): [_('Sv. Ponciána, papeže, a Hippolyta, kněze, mučedníků', MEMORIAL_OPTIONAL, RED)],
+    (8, 14): [_('Sv. Maxmiliána Marie Kolbeho, kněze a mučedníka', MEMORIAL, RED)],
+    (8, 15): [_('Nanebevzetí Panny Marie', SOLEMNITY)],
+    (8, 16): [_('Sv. Štěpána Uherského', MEMORIAL_OPTIONAL)],
+    (8, 18): [_('Sv. Heleny', MEMORIAL_OPTIONAL)],
+    (8, 19): [_('Sv. Jana Eudese, kněze', MEMORIAL_OPTIONAL)],
+    (8, 20): [_('Sv. Bernarda, opata a učitele církve', MEMORIAL)],
+    (8, 21): [_('Sv. Pia X., papeže', MEMORIAL)],
+    (8, 22): [_('Panny Marie Královny', MEMORIAL)],
+    (8, 23): [_('Sv. Růženy z Limy, panny', MEMORIAL_OPTIONAL)],
+    (8, 24): [_('Sv. Bartoloměje, apoštola', FEAST, RED)],
+    (8, 25): [
+        _('Sv. Ludvíka', MEMORIAL_OPTIONAL),
+        _('Sv. Josefa Kalasanského, kněze', MEMORIAL_OPTIONAL),
+    ],
+    (8, 27): [_('Sv. Moniky', MEMORIAL)],
+    (8, 28): [_('Sv. Augustina, biskupa a učitele církve', MEMORIAL)],
+    (8, 29): [_('Umučení svatého Jana Křtitele', MEMORIAL, RED)],
+    (9, 3): [_('Sv. Řehoře Velikého, papeže a učitele církve', MEMORIAL)],
+    (9, 8): [_('Narození Panny Marie', FEAST)],
+    (9, 9): [_('Sv. Petra Klavera, kněze', MEMORIAL_OPTIONAL)],
+    (9, 12): [_('Jména Panny Marie', MEMORIAL_OPTIONAL)],
+    (9, 13): [_('Sv. Jana Zlatoústého, biskupa a učitele církve', MEMORIAL)],
+    (9, 14): [_('Povýšení svatého kříže', FEAST_LORD, RED)],
+    (9, 15): [_('Panny Marie Bolestné', MEMORIAL)],
+    (9, 16): [_('Sv. Ludmily, mučednice', MEMORIAL_PROPER, RED)],
+    (9, 17): [_('Sv. Roberta Bellarmina, biskupa a učitele církve', MEMORIAL_OPTIONAL)],
+    (9, 19): [_('Sv. Januária, biskupa a mučedníka', MEMORIAL_OPTIONAL, RED)],
+    (9, 20): [_('Sv. Ondřeje Kim Tae-gona, kněze, Pavla Chong Ha-sanga a druhů, mučedníků', MEMORIAL, RED)],
+    (9, 21): [_('Sv. Matouše, apoštola a evangelisty', FEAST, RED)],
+    (9, 23): [_('Sv. Pia z Pietrelciny, kněze', MEMORIAL)],
+    (9, 26): [_('Sv. Kosmy a Damiána, mučedníků', MEMORIAL_OPTIONAL, RED)],
+    (9, 27): [_('Sv. Vincence z Pauly, kněze', MEMORIAL)],
+    (9, 28): [_('Sv. Václava, mučedníka, hlavního patrona českého národa', SOLEMNITY_PROPER, RED)],
+    (9, 29): [_('Sv. Michaela, Gabriela a Rafaela, archandělů', FEAST)],
+    (9, 30): [_('Sv. Jeronýma, kněze a učitele církve', MEMORIAL)],
+    (10, 1): [_('Sv. Terezie od Dítěte Ježíše, panny a učitelky církve', MEMORIAL)],
+    (10, 2): [_('Svatých andělů strážných', MEMORIAL)],
+    (10, 4): [_('Sv. Františka z Assisi', MEMORIAL)],
+    (10, 6): [_('Sv. Bruna, kněze', MEMORIAL_OPTIONAL)],
+    (10, 7): [_('Panny Marie Růžencové', MEMORIAL)],
+    (10, 9): [
+        _('Sv. Dionýsia, biskupa, a druhů, mučedníků', MEMORIAL_OPTIONAL, RED),
+        _('Sv. Jana Leonardiho, kněze', MEMORIAL_OPTIONAL),
+    ],
+    (10, 12): [_('Sv. Radima, biskupa', MEMORIAL_OPTIONAL)],
+    (10, 14): [_('Sv. Kalista I., papeže a mučedníka', MEMORIAL_OPTIONAL, RED)],
+    (10, 15): [_('Sv. Terezie od Ježíše, panny a učitelky církve', MEMORIAL)],
+    (10, 16): [
+        _('Sv. Hedviky, řeholnice', MEMORIAL_PROPER),
+        _('Sv. Markéty Marie Alacoque, panny', MEMORIAL_OPTIONAL),
+    ],
+    (10, 17): [_('Sv. Ignáce Antiochijského, biskupa a mučedníka', MEMORIAL, RED)],
+    (10, 18): [_('Sv. Lukáše, evangelisty', FEAST, RED)],
+    (10, 19): [
+        _('Sv. Jana de Brébeuf a Izáka Joguese, kněží, a druhů, mučedníků', MEMORIAL_OPTIONAL, RED),
+        _('Sv. Pavla od Kříže, kněze', MEMORIAL_OPTIONAL),
+    ],
+    (10, 22): [_('Sv. Jana Pavla II., papeže', MEMORIAL_OPTIONAL)],
+    (10, 23): [_('Sv. Jana Kapistránského, kněze', MEMORIAL_OPTIONAL)],
+    (10, 24): [_('Sv. Antonína Marie Clareta, biskupa', MEMORIAL_OPTIONAL)],
+    (10, 28): [_('Sv. Šimona a Judy, apoštolů', FEAST, RED)],
+    (11, 1): [_('Všech svatých', SOLEMNITY)],
+    (11, 2): [_('Vzpomínka na všechny věrné zemřelé', SOLEMNITY, VIOLET)],
+    (11, 3): [_('Sv. Martina de Porres, řeholníka', MEMORIAL_OPTIONAL)],
+    (11, 4): [_('Sv. Karla Boromejského, biskupa', MEMORIAL)],
+    (11, 9): [_('Posvěcení lateránské baziliky', FEAST_LORD)],
+    (11, 10): [_('Sv. Lva Velikého, papeže a učitele církve', MEMORIAL)],
+    (11, 11): [_('Sv. Martina, biskupa', MEMORIAL)],
+    (11, 12): [_('Sv. Josafata, biskupa a mučedníka', MEMORIAL, RED)],
+    (11, 13): [_('Sv. Anežky České, panny', MEMORIAL_PROPER)],
+    (11, 15): [_('Sv. Alberta Velikého, biskupa a učitele církve', MEMORIAL_OPTIONAL)],
+    (11, 16): [
+        _('Sv. Markéty Skotské', MEMORIAL_OPTIONAL),
+        _('Sv. Gertrudy, panny', MEMORIAL_OPTIONAL),
+    ],
+    (11, 17): [_('Sv. Alžběty Uherské, řeholnice', MEMORIAL)],
+    (11, 18): [_('Posvěcení římských bazilik svatých apoštolů Petra a Pavla', MEMORIAL_OPTIONAL)],
+    (11, 21): [_('Zasvěcení Panny Marie v Jeruzalémě', MEMORIAL)],
+    (11, 22): [_('Sv. Cecílie, panny a mučednice', MEMORIAL, RED)],
+    (11, 23): [
+        _('Sv. Klementa I., papeže a mučedníka', MEMORIAL_OPTIONAL, RED),
+        _('Sv. Kolumbána, opata', MEMORIAL_OPTIONAL),
+    ],
+    (11, 24): [_('Sv. Ondřeje Dung-Laca, kněze, a druhů, mučedníků', MEMORIAL, RED)],
+    (11, 25): [_('Sv. Kateřiny Alexandrijské, panny a mučednice', MEMORIAL_OPTIONAL, RED)],
+    (11, 30): [_('Sv. Ondřeje, apoštola', FEAST, RED)],
+    (12, 3): [_('Sv. Františka Xaverského, kněze', MEMORIAL)],
+    (12, 4): [_('Sv. Jana Damašského, kněze a učitele církve', MEMORIAL_OPTIONAL)],
+    (12, 6): [_('Sv. Mikuláše, biskupa', MEMORIAL_OPTIONAL)],
+    (12, 7): [_('Sv. Ambrože, biskupa a učitele církve', MEMORIAL)],
+    (12, 8): [_('Panny Marie, počaté bez poskvrny prvotního hříchu', SOLEMNITY)],
+    (12, 9): [_('Sv. Juana Diega Cuauhtlatoatzina', MEMORIAL_OPTIONAL)],
+    (12, 11): [_('Sv. Damasa I., papeže', MEMORIAL_OPTIONAL)],
+    (12, 12): [_('Panny Marie Guadalupské', MEMORIAL_OPTIONAL)],
+    (12, 13): [_('Sv. Lucie, panny a mučednice', MEMORIAL, RED)],
+    (12, 14): [_('Sv. Jana od Kříže, kněze a učitele církve', MEMORIAL)],
+    (12, 21): [_('Sv. Petra Kanisia, kněze a učitele církve', MEMORIAL_OPTIONAL)],
+    (12, 23): [_('Sv. Jana Kentského, kněze', MEMORIAL_OPTIONAL)],
+    (12, 26): [_('Sv. Štěpána, prvomučedníka', FEAST, RED)],
+    (12, 27): [_('Sv. Jana, apoštola a evangelisty', FEAST)],
+    (12, 28): [_('Svatých Betlémských dětí, mučedníků', FEAST, RED)],
+    (12, 29): [_('Sv. Tomáše Becketa, biskupa a mučedníka', MEMORIAL_OPTIONAL, RED)],
+    (12, 31): [_('Sv. Silvestra I., papeže', MEMORIAL_OPTIONAL)],
+}
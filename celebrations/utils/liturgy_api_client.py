@@ -1,11 +1,16 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from datetime import date, datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 import requests
+from django.db import transaction
 from django.utils.text import slugify
+from requests.adapters import BaseAdapter, HTTPAdapter
+from urllib3.util.retry import Retry
 
 from celebrations.models import Celebration, CelebrationType, LiturgicalCalendarEvent
+from celebrations.signals import calendar_updated
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -14,8 +19,51 @@ logger = logging.getLogger(__name__)
 class LiturgyAPIClient:
     """Fetch today's liturgical calendar data and update database."""
 
-    API_URL_DAY = 'http://calapi.inadiutorium.cz/api/v0/cs/calendars/czech/{year}/{month}/{day}'
-    API_URL_MONTH = 'http://calapi.inadiutorium.cz/api/v0/cs/calendars/czech/{year}/{month}'
+    API_BASE_URL = 'http://calapi.inadiutorium.cz/api/v0/cs/calendars/czech'
+    API_URL_DAY = '{base_url}/{year}/{month}/{day}'
+    API_URL_MONTH = '{base_url}/{year}/{month}'
+    TIMEOUT = (5, 60)  # (connect, read) in seconds
+    MAX_WORKERS = 4
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        transport: Optional[BaseAdapter] = None,
+        max_workers: int = MAX_WORKERS,
+    ) -> None:
+        """
+        Args:
+            base_url: calendar API root, e.g. a local stub server in tests
+            transport: requests adapter used for all requests, defaults to a pooled adapter with retries
+            max_workers: maximum number of months fetched concurrently
+        """
+        self.base_url = (base_url or self.API_BASE_URL).rstrip('/')
+        self.max_workers = max_workers
+        self.session = requests.Session()
+        transport = transport or HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=max_workers,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=('GET',),
+            ),
+        )
+        self.session.mount('http://', transport)
+        self.session.mount('https://', transport)
+
+    def get_json(self, url: str) -> Any:
+        response = self.session.get(url, timeout=self.TIMEOUT)
+        response.raise_for_status()
+        return response.json()
+
+    def get_month_data(self, year: int, month: int) -> List[Dict]:
+        """
+        Download data for provided month and year without touching the database.
+        """
+        logger.info('Fetching data for month {year}-{month}'.format(year=year, month=month))
+        return self.get_json(self.API_URL_MONTH.format(base_url=self.base_url, year=year, month=month))
 
     def fetch_day(self, day: Optional[date], *args, **kwargs) -> None:
         """
@@ -25,11 +73,10 @@ class LiturgyAPIClient:
             day: default value: today's date
         """
         day = day or datetime.now().date()
-        logger.info('Fetching data for day {day}'.format(day=date))
-        response = requests.get(self.API_URL_DAY.format(year=day.year, month=day.month, day=day.day), timeout=300)
-        response.raise_for_status()
-        data = response.json()
-        self.update_database(data)
+        logger.info('Fetching data for day {day}'.format(day=day))
+        url = self.API_URL_DAY.format(base_url=self.base_url, year=day.year, month=day.month, day=day.day)
+        data = self.get_json(url)
+        self.update_database_bulk([data])
 
     def fetch_month(self, year: int, month: int) -> None:
         """
@@ -39,12 +86,34 @@ class LiturgyAPIClient:
             year:
             month:
         """
-        logger.info('Fetching data for month {year}-{month}'.format(year=year, month=month))
-        response = requests.get(self.API_URL_MONTH.format(year=year, month=month), timeout=300)
-        response.raise_for_status()
-        data = response.json()
-        for day in data:
-            self.update_database(day)
+        self.update_database_bulk(self.get_month_data(year=year, month=month))
+
+    def fetch_months(
+        self,
+        months: Iterable[Tuple[int, int]],
+        on_month_done: Optional[Callable[[int, int], None]] = None,
+    ) -> None:
+        """
+        Fetch data for provided (year, month) pairs.
+        Months are downloaded concurrently, the database is updated from the calling thread in the given order.
+
+        Args:
+            months:
+            on_month_done: called with year and month once the month is saved
+        """
+        months = list(months)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            months_data = executor.map(lambda year_month: self.get_month_data(*year_month), months)
+            for (year, month), month_data in zip(months, months_data, strict=True):
+                self.update_database_bulk(month_data)
+                if on_month_done is not None:
+                    on_month_done(year, month)
+
+    def fetch_year(self, year: int) -> None:
+        """
+        Fetch data for all months of provided year.
+        """
+        self.fetch_months((year, month) for month in range(1, 13))
 
     def update_database(self, data: Dict) -> None:
         """
@@ -103,6 +172,77 @@ class LiturgyAPIClient:
             liturgical_calendar_event.celebrations.add(celebration)
         logger.info("Day {day} and it's celebrations were successfully added to database".format(day=date))
 
+    def update_database_bulk(self, days: Iterable[Dict]) -> None:
+        """
+        Update database with data for many days at once, e.g. a whole month.
+        Each day has the same structure as in `update_database`. Existing rows are resolved with a few IN queries
+        and all tables are written with bulk upserts inside one transaction, so model signals are not sent.
+        `calendar_updated` is sent instead.
+        """
+        seasons: Dict[date, str] = {}
+        celebration_slugs_by_date: Dict[date, List[str]] = {}
+        celebrations_by_slug: Dict[str, Tuple[str, List[str]]] = {}
+        for data in days:
+            day = date.fromisoformat(data['date'])
+            seasons[day] = data.get('season')
+            celebration_slugs_by_date[day] = []
+            for celebration in data.get('celebrations', []):
+                slug = slugify(celebration['title'])
+                celebrations_by_slug[slug] = (celebration['title'], self.infer_types(celebration['title']))
+                celebration_slugs_by_date[day].append(slug)
+        if not seasons:
+            return
+        type_names = {name for _, types in celebrations_by_slug.values() for name in types}
+
+        with transaction.atomic():
+            LiturgicalCalendarEvent.objects.bulk_create(
+                [LiturgicalCalendarEvent(date=day, season=season) for day, season in seasons.items()],
+                update_conflicts=True,
+                unique_fields=['date'],
+                update_fields=['season'],
+            )
+            CelebrationType.objects.bulk_create(
+                [CelebrationType(name=name) for name in type_names],
+                ignore_conflicts=True,
+            )
+            Celebration.objects.bulk_create(
+                [Celebration(slug=slug, name=title) for slug, (title, _) in celebrations_by_slug.items()],
+                update_conflicts=True,
+                unique_fields=['slug'],
+                update_fields=['name'],
+            )
+
+            event_ids = dict(LiturgicalCalendarEvent.objects.filter(date__in=seasons).values_list('date', 'id'))
+            type_ids = dict(CelebrationType.objects.filter(name__in=type_names).values_list('name', 'id'))
+            celebration_ids = dict(Celebration.objects.filter(slug__in=celebrations_by_slug).values_list('slug', 'id'))
+
+            # Types are replaced, like `celebration.types.set()` does
+            celebration_types = Celebration.types.through
+            celebration_types.objects.filter(celebration_id__in=celebration_ids.values()).delete()
+            celebration_types.objects.bulk_create([
+                celebration_types(celebration_id=celebration_ids[slug], celebrationtype_id=type_ids[name])
+                for slug, (_, types) in celebrations_by_slug.items()
+                for name in dict.fromkeys(types)
+            ])
+
+            # Celebrations are added to the day, like `event.celebrations.add()` does
+            event_celebrations = LiturgicalCalendarEvent.celebrations.through
+            event_celebrations.objects.bulk_create(
+                [
+                    event_celebrations(liturgicalcalendarevent_id=event_ids[day], celebration_id=celebration_ids[slug])
+                    for day, slugs in celebration_slugs_by_date.items()
+                    for slug in slugs
+                ],
+                ignore_conflicts=True,
+            )
+
+            transaction.on_commit(lambda: calendar_updated.send(
+                sender=self.__class__,
+                dates=list(seasons),
+                celebrations=list(celebration_ids.values()),
+            ))
+        logger.info('{count} days and their celebrations were successfully saved'.format(count=len(seasons)))
+
     def infer_types(self, title: str) -> List[str]:
         """Infer celebration types from title."""
         title = title.lower()
@@ -0,0 +1,87 @@
+import logging
+from datetime import date, timedelta
+from typing import Optional
+
+from django.db.models import Q
+from django.utils import timezone
+
+from celebrations.models import PreloadJob
+from celebrations.utils.liturgy_api_client import LiturgyAPIClient
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# A running job is reclaimed when its worker hasn't reported progress for this long,
+# longer than a month download with all its retries takes
+JOB_LEASE = timedelta(minutes=15)
+
+
+def month_key(year: int, month: int) -> str:
+    return f'{year}-{month:02d}'
+
+
+def enqueue_preload_job(year: int, month: Optional[int] = None, day: Optional[int] = None) -> PreloadJob:
+    """
+    Create a pending job, it is picked up by the `run_preload_worker` command.
+    """
+    job = PreloadJob(year=year, month=month, day=day)
+    job.progress = {month_key(*year_month): PreloadJob.PENDING for year_month in job.months}
+    job.save()
+    return job
+
+
+def claim_next_job() -> Optional[PreloadJob]:
+    """
+    Claim the oldest pending job, or a running job whose worker stopped sending heartbeats.
+    The status update is conditional, so a job is claimed by one worker only even if more workers run at once.
+    """
+    now = timezone.now()
+    claimable = Q(status=PreloadJob.PENDING) | Q(status=PreloadJob.RUNNING, heartbeat_at__lt=now - JOB_LEASE)
+    for job in PreloadJob.objects.filter(claimable)[:10]:
+        claimed = PreloadJob.objects.filter(pk=job.pk, status=job.status, heartbeat_at=job.heartbeat_at).update(
+            status=PreloadJob.RUNNING,
+            started_at=now,
+            heartbeat_at=now,
+        )
+        if claimed:
+            if job.status == PreloadJob.RUNNING:
+                logger.warning('Reclaimed preload job {job_id} of a stopped worker.'.format(job_id=job.pk))
+            job.refresh_from_db()
+            return job
+    return None
+
+
+def run_job(job: PreloadJob, client: Optional[LiturgyAPIClient] = None) -> None:
+    """
+    Fetch calendar data requested by the job and record progress of each month.
+    Months already done by a previous run of a reclaimed job are skipped.
+    """
+    client = client or LiturgyAPIClient()
+
+    def set_month_status(year: int, month: int, status: str) -> None:
+        job.progress[month_key(year, month)] = status
+        PreloadJob.objects.filter(pk=job.pk).update(progress=job.progress, heartbeat_at=timezone.now())
+
+    try:
+        if job.day is not None:
+            client.fetch_day(day=date(job.year, job.month, job.day))
+            set_month_status(job.year, job.month, PreloadJob.DONE)
+        else:
+            client.fetch_months(
+                [
+                    (year, month) for year, month in job.months
+                    if job.progress.get(month_key(year, month)) != PreloadJob.DONE
+                ],
+                on_month_done=lambda year, month: set_month_status(year, month, PreloadJob.DONE),
+            )
+    except Exception as e:
+        logger.exception('Preload job {job_id} failed.'.format(job_id=job.pk))
+        job.status = PreloadJob.FAILED
+        job.error = repr(e)
+        for key, status in job.progress.items():
+            if status != PreloadJob.DONE:
+                job.progress[key] = PreloadJob.FAILED
+    else:
+        job.status = PreloadJob.DONE
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'error', 'progress', 'finished_at'])
@@ -3,69 +3,103 @@ from datetime import date
 from urllib.request import Request
 
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.core.cache import cache
+from django.core.exceptions import ValidationError
 from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
 from django.views import View
 from rest_framework.generics import ListAPIView
 
-from .models import Celebration
+from cantica.api import IdCursorPagination, NDJSONStreamMixin
+from cantica.cache import bump_content_version
+
+from .models import Celebration, PreloadJob
 from .serializers import CelebrationSerializer
-from .utils.liturgy_api_client import LiturgyAPIClient
+from .utils.preload_jobs import enqueue_preload_job
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
-class CelebrationListView(ListAPIView):
-    queryset = Celebration.objects.all()
+class CelebrationListView(NDJSONStreamMixin, ListAPIView):
+    """
+    Under ASGI only the NDJSON stream is async. DRF views are sync, so the paginated JSON pages
+    run in Django's thread for sync code and are served one at a time per worker.
+    """
+    queryset = Celebration.objects.prefetch_related('types')
     serializer_class = CelebrationSerializer
+    pagination_class = IdCursorPagination
 
 
 class ClearCacheView(LoginRequiredMixin, View):
     def get(self, *args, **kwargs) -> JsonResponse:
-        cache.clear()
+        bump_content_version()
         return JsonResponse(
             {'status': 'Cache cleared successfully!'},
             status=200,
         )
 
 
+def preload_job_response(request: Request, job: PreloadJob, message: str) -> JsonResponse:
+    return JsonResponse(
+        {
+            'message': message,
+            'job_id': job.pk,
+            'status_url': request.build_absolute_uri(reverse('preload_job_status', args=[job.pk])),
+        },
+        status=202,
+    )
+
+
+def validate_date(year: int, month: int = 1, day: int = 1) -> None:
+    try:
+        date(year, month, day)
+    except ValueError as e:
+        raise ValidationError({'date': f'Invalid date: {e}.'}) from e
+
+
 class PreloadDataView(LoginRequiredMixin, View):
     def get(self, request: Request, year: int, *args, **kwargs) -> JsonResponse:
-        client = LiturgyAPIClient()
-        for month in range(1, 13):
-            try:
-                client.fetch_month(year=year, month=month)
-            except Exception:
-                raise
-        return JsonResponse(
-            {'message': f'Data for {year} successfully preloaded.'},
-            status=200,
-        )
+        try:
+            validate_date(year)
+        except ValidationError as e:
+            return JsonResponse(e.message_dict, status=400)
+        job = enqueue_preload_job(year=year)
+        return preload_job_response(request, job, f'Preloading data for {year} was scheduled.')
 
 
 class PreloadMonthDataView(LoginRequiredMixin, View):
     def get(self, request: Request, year: int, month: int, *args, **kwargs) -> JsonResponse:
-        client = LiturgyAPIClient()
         try:
-            client.fetch_month(year=year, month=month)
-        except Exception:
-            raise
-        return JsonResponse(
-            {'message': f'Data for {year}-{month} successfully preloaded.'},
-            status=200,
-        )
+            validate_date(year, month)
+        except ValidationError as e:
+            return JsonResponse(e.message_dict, status=400)
+        job = enqueue_preload_job(year=year, month=month)
+        return preload_job_response(request, job, f'Preloading data for {year}-{month} was scheduled.')
 
 
 class PreloadDayDataView(LoginRequiredMixin, View):
     def get(self, request: Request, year: int, month: int, day: int, *args, **kwargs) -> JsonResponse:
-        client = LiturgyAPIClient()
-        requested_day = date(year, month, day)
         try:
-            client.fetch_day(day=requested_day)
-        except Exception:
-            raise
+            validate_date(year, month, day)
+        except ValidationError as e:
+            return JsonResponse(e.message_dict, status=400)
+        job = enqueue_preload_job(year=year, month=month, day=day)
+        return preload_job_response(request, job, f'Preloading data for {year}-{month}-{day} was scheduled.')
+
+
+class PreloadJobStatusView(LoginRequiredMixin, View):
+    def get(self, request: Request, job_id: int, *args, **kwargs) -> JsonResponse:
+        job = get_object_or_404(PreloadJob, pk=job_id)
         return JsonResponse(
-            {'message': f'Data for {year}-{month}-{day} successfully preloaded.'},
+            {
+                'job_id': job.pk,
+                'status': job.status,
+                'progress': job.progress,
+                'error': job.error,
+                'created_at': job.created_at,
+                'started_at': job.started_at,
+                'finished_at': job.finished_at,
+            },
             status=200,
         )
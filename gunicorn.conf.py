@@ -0,0 +1,65 @@
+"""
+Gunicorn configuration, read from the working directory when gunicorn starts.
+
+The application is loaded and warmed up once in the master process (`preload_app`),
+forked workers share the loaded modules and primed caches, so cold starts of a stopped machine
+don't pay for imports and an empty rule index in every worker.
+"""
+import multiprocessing
+import os
+
+from gunicorn.arbiter import Arbiter
+from gunicorn.workers.base import Worker
+
+bind = '0.0.0.0:{port}'.format(port=os.getenv('PORT', '8000'))
+
+# SERVER_MODE=asgi runs the ASGI application in uvicorn workers, see cantica/asgi.py
+if os.getenv('SERVER_MODE') == 'asgi':
+    wsgi_app = 'cantica.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+else:
+    wsgi_app = 'cantica.wsgi:application'
+    worker_class = 'gthread'
+    threads = int(os.getenv('GUNICORN_THREADS', '4'))
+
+# Gunicorn's recommended (2 x CPUs) + 1, i.e. 3 workers on a 1-CPU machine
+workers = int(os.getenv('WEB_CONCURRENCY', multiprocessing.cpu_count() * 2 + 1))
+preload_app = True
+timeout = 60
+graceful_timeout = 30
+keepalive = 5
+accesslog = '-'
+
+
+def when_ready(server: Arbiter) -> None:
+    """
+    Warm up the preloaded application in the master process before the workers are forked.
+    """
+    from django.core.cache import caches
+    from django.core.management import call_command
+    from django.db import connections
+
+    from cantica.database import close_connection_pools
+    from cantica.warmup import warm_up
+
+    # Refuse to start without a cache shared with the preload worker, see celebrations/checks.py
+    call_command('check', tags=['caches'])
+    duration = warm_up()
+    if duration is not None:
+        server.log.info('Warmed up in {duration:.0f} ms'.format(duration=duration * 1000))
+    # Workers must not share the master's database connections, connection pools and cache connections
+    connections.close_all()
+    close_connection_pools()
+    caches.close_all()
+
+
+def post_worker_init(worker: Worker) -> None:
+    """
+    Open the worker's database connection pool, so its first request doesn't wait for a new connection,
+    and log the worker's time to its first request.
+    """
+    from cantica.database import open_connection_pools
+    from cantica.warmup import time_first_request
+
+    time_first_request()
+    open_connection_pools()
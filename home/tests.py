@@ -0,0 +1,124 @@
+from datetime import date, datetime, timedelta
+from unittest import mock
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+
+from cantica.cache import CONTENT_VERSION_KEY
+from celebrations.models import Celebration, CelebrationType, LiturgicalCalendarEvent
+from songs.models import ConditionType, LiturgicalSeason, LiturgicalSubSeason, MassPart, Song, SongRule
+from songs.utils.rule_index import get_rule_index, invalidate_rule_index
+
+HOMEPAGE_QUERIES = 5
+
+
+class HomePageQueryCountTests(TestCase):
+    day = date(2025, 7, 15)  # ordinary time, no subseason
+
+    def setUp(self) -> None:
+        invalidate_rule_index()
+        self.season = LiturgicalSeason.objects.create(name='ordinary', description='ordinary time')
+        LiturgicalSubSeason.objects.create(name='late_lent', description='late lent')
+        self.mass_parts = [
+            MassPart.objects.create(name=name)
+            for name in ['main', 'entrance', 'psalm', 'offertory', 'communion', 'recessional']
+        ]
+        self.celebration_type = CelebrationType.objects.create(name='martyr')
+        self.celebration = Celebration.objects.create(name='Sv. Vavřince, jáhna a mučedníka')
+        self.celebration.types.set([self.celebration_type])
+        event = LiturgicalCalendarEvent.objects.create(date=self.day, season='ordinary')
+        event.celebrations.set([self.celebration])
+        self.condition_types = {
+            model: ConditionType.objects.create(
+                name=model.__name__,
+                content_type=ContentType.objects.get_for_model(model),
+            )
+            for model in [LiturgicalSeason, Celebration, CelebrationType]
+        }
+
+    def create_rules(self, count: int) -> None:
+        rules = []
+        for i in range(count):
+            song = Song.objects.create(
+                title=f'Song {i}',
+                number=i + 1,
+                has_communion_verse=False,
+                has_recessional_verse=False,
+            )
+            for condition_value in [self.season, self.celebration, self.celebration_type]:
+                rules.append(SongRule(
+                    song=song,
+                    condition_type=self.condition_types[type(condition_value)],
+                    content_type=self.condition_types[type(condition_value)].content_type,
+                    object_id=condition_value.pk,
+                    mass_part=self.mass_parts[i % len(self.mass_parts)],
+                    priority=i % 4,
+                    can_be_main=i % 3 == 0,
+                ))
+        SongRule.objects.bulk_create(rules)
+        invalidate_rule_index()
+        get_rule_index()
+
+    def assert_homepage_queries(self) -> None:
+        with self.assertNumQueries(HOMEPAGE_QUERIES):
+            response = self.client.get(reverse('home'), {'date': self.day.isoformat()})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, self.celebration.name)
+
+    def test_few_rules(self) -> None:
+        self.create_rules(count=2)
+        self.assert_homepage_queries()
+
+    def test_many_rules(self) -> None:
+        self.create_rules(count=60)
+        self.assert_homepage_queries()
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class HomePageConditionalRequestTests(TestCase):
+    def setUp(self) -> None:
+        self.content_modified = timezone.now() - timedelta(days=2)
+        cache.set(CONTENT_VERSION_KEY, self.content_modified.timestamp(), timeout=None)
+
+    def tearDown(self) -> None:
+        cache.clear()
+
+    def test_page_of_today_is_modified_since_yesterday(self) -> None:
+        start_of_today = timezone.make_aware(datetime.combine(date.today(), datetime.min.time()))
+
+        response = self.client.get(reverse('home'), headers={
+            'if-modified-since': http_date(self.content_modified.timestamp()),
+        })
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Last-Modified'], http_date(start_of_today.timestamp()))
+
+    def test_page_of_selected_date_is_not_modified(self) -> None:
+        response = self.client.get(reverse('home'), {'date': '2025-07-15'}, headers={
+            'if-modified-since': http_date(self.content_modified.timestamp()),
+        })
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_content_version_is_read_once(self) -> None:
+        with mock.patch.object(cache, 'get', wraps=cache.get) as cache_get:
+            response = self.client.get(reverse('home'), {'date': '2025-07-15'})
+
+        self.assertEqual(response.status_code, 200)
+        reads = [call for call in cache_get.call_args_list if call.args[0] == CONTENT_VERSION_KEY]
+        self.assertEqual(len(reads), 1)
+
+    async def test_page_with_same_etag_is_not_modified(self) -> None:
+        response = await self.async_client.get(reverse('home'), {'date': '2025-07-15'})
+
+        not_modified = await self.async_client.get(reverse('home'), {'date': '2025-07-15'}, headers={
+            'if-none-match': response['ETag'],
+        })
+
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified['ETag'], response['ETag'])
+        self.assertEqual(not_modified['Last-Modified'], http_date(self.content_modified.timestamp()))
@@ -1,31 +1,122 @@
-from datetime import datetime, timedelta
-from typing import Any, Dict
+import hashlib
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List
 
+from django.http import HttpRequest, HttpResponse
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from django.utils.safestring import mark_safe
+from django.views.decorators.cache import cache_control
 from django.views.generic import TemplateView
 
-from celebrations.models import Celebration, LiturgicalCalendarEvent
+from cantica.cache import acompute_once, aget_content_version, get_content_last_modified
+from cantica.instrumentation import span
+from celebrations.models import LiturgicalCalendarEvent
 from songs.models import LiturgicalSeason, LiturgicalSubSeason
+from songs.utils.daily_recommendations import aget_recommendations
 from songs.utils.helpers import is_may
 from songs.utils.liturgical_season import LiturgicalSeasonEnum
 from songs.utils.song_recommender import SongRecommender
 
+CELEBRATIONS_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+
+def get_selected_date(request: HttpRequest) -> date:
+    date_str = request.GET.get('date') or datetime.now().strftime('%Y-%m-%d')
+    return datetime.strptime(date_str, '%Y-%m-%d').date()
+
+
+def get_homepage_etag(selected_date: date, content_version: float) -> str:
+    """
+    The page depends only on the selected date, today's date (the "today" link) and the content version.
+    """
+    key = f'{selected_date}:{date.today()}:{content_version}'
+    return quote_etag(hashlib.md5(key.encode(), usedforsecurity=False).hexdigest())
+
+
+def get_homepage_last_modified(request: HttpRequest, content_version: float) -> datetime:
+    """
+    The page without a selected date shows today, so it changes at midnight even if the content doesn't.
+    """
+    last_modified = get_content_last_modified(content_version)
+    if not request.GET.get('date'):
+        start_of_today = timezone.make_aware(datetime.combine(date.today(), datetime.min.time()))
+        last_modified = max(last_modified, start_of_today)
+    return last_modified
+
 
 class HomePageView(TemplateView):
+    """
+    Async view, the database is queried with the async ORM and waiting for it doesn't block an ASGI worker.
+    Conditional requests are answered in the view, the content version is read once with the async cache API.
+    """
     template_name = 'home/homepage.html'
 
-    def get_context_data(self, **kwargs) -> Dict[str, Any]:
-        context = super().get_context_data(**kwargs)
-        today = datetime.now()
-        date_str = self.request.GET.get('date', datetime.now().strftime('%Y-%m-%d'))
-        if not date_str:
-            date_str = datetime.now().strftime('%Y-%m-%d')
-        selected_date = datetime.strptime(date_str, '%Y-%m-%d').date()
-
-        liturgical_day = LiturgicalCalendarEvent.objects.filter(date=date_str)
-        celebration_slugs = liturgical_day.values_list('celebrations__slug', flat=True)
-        liturgical_season = liturgical_day.values_list('season', flat=True).first()
+    @classmethod
+    def as_view(cls, **initkwargs) -> Callable:
+        # method_decorator keeps async methods async only since Django 5.2, so the view function is decorated
+        view = super().as_view(**initkwargs)
+        return cache_control(public=True, no_cache=True)(view)
+
+    async def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        selected_date = get_selected_date(request)
+        content_version = await aget_content_version()
+        etag = get_homepage_etag(selected_date=selected_date, content_version=content_version)
+        last_modified = get_homepage_last_modified(request, content_version=content_version)
+        response = get_conditional_response(request, etag=etag, last_modified=int(last_modified.timestamp()))
+        if response is None:
+            celebrations_html = await self.get_celebrations_html(
+                selected_date=selected_date,
+                content_version=content_version,
+            )
+            response = self.render_to_response(self.get_context_data(
+                selected_date=selected_date,
+                celebrations_html=celebrations_html,
+            ))
+        response.headers.setdefault('Last-Modified', http_date(last_modified.timestamp()))
+        response.headers.setdefault('ETag', etag)
+        return response
+
+    def get_context_data(self, selected_date: date, celebrations_html: str, **kwargs) -> Dict[str, Any]:
+        return {
+            'celebrations_html': celebrations_html,
+            'today': datetime.now(),
+            'selected_date': selected_date,
+            'previous_date': selected_date - timedelta(days=1),
+            'next_date': selected_date + timedelta(days=1),
+        }
+
+    async def get_celebrations_html(self, selected_date: date, content_version: float) -> str:
+        """
+        Render celebrations of the day with their recommended songs.
+        The result is cached per date and content version, so any rule or calendar change invalidates it.
+        """
+        celebrations_html = await acompute_once(
+            key=f'homepage:celebrations:{selected_date}:{content_version}',
+            compute=lambda: self.render_celebrations(selected_date=selected_date),
+            timeout=CELEBRATIONS_CACHE_TIMEOUT,
+        )
+        return mark_safe(celebrations_html)  # noqa: S308
+
+    async def render_celebrations(self, selected_date: date) -> str:
+        with span('recommendations'):
+            celebrations_with_songs = await self.get_celebrations_with_songs(selected_date=selected_date)
+        with span('render'):
+            return render_to_string(
+                'home/celebrations.html',
+                {'celebrations_with_songs': celebrations_with_songs},
+                request=self.request,
+            )
+
+    async def get_celebrations_with_songs(self, selected_date: date) -> List[Dict[str, Any]]:
+        liturgical_day = await LiturgicalCalendarEvent.objects.filter(
+            date=selected_date,
+        ).prefetch_related('celebrations__types').afirst()
+        liturgical_season = liturgical_day.season if liturgical_day else None
         season = LiturgicalSeasonEnum.from_string(liturgical_season)
-        ls = LiturgicalSeason.objects.filter(name=liturgical_season).first()
+        ls = await LiturgicalSeason.objects.filter(name=liturgical_season).afirst()
         custom_description = ''
         if is_may(selected_date):
             custom_description = 'Měsíc květen je v lidové zbožnosti věnován úctě Panny Marie. Vyjma mší o Panně' \
@@ -34,20 +125,23 @@ class HomePageView(TemplateView):
         recommender = SongRecommender()
 
         subseasons = list(recommender.get_current_subseasons(current_date=selected_date))
-        liturgical_subseasons = LiturgicalSubSeason.objects.filter(name__in=subseasons)
+        liturgical_subseasons = [
+            subseason async for subseason in LiturgicalSubSeason.objects.filter(name__in=subseasons)
+        ]
         subseasons_descriptions = ''
         for subseason in liturgical_subseasons:
             subseasons_descriptions += subseason.description
 
-        celebrations = Celebration.objects.filter(slug__in=celebration_slugs)
+        celebrations = list(liturgical_day.celebrations.all()) if liturgical_day else []
+        recommendations = await aget_recommendations(
+            day=selected_date,
+            celebrations=celebrations,
+            liturgical_season=season,
+            liturgical_subseasons=liturgical_subseasons,
+        )
         celebrations_with_songs = []
         for celebration in celebrations:
-            recommended_songs = recommender.recommend_songs(
-                day=selected_date,
-                celebration=celebration,
-                liturgical_season=season,
-                liturgical_subseasons=liturgical_subseasons,
-            )
+            recommended_songs = recommendations[celebration.pk]
             description = '\n'.join(filter(None, [
                 celebration.description,
                 ls.description,
@@ -60,16 +154,7 @@ class HomePageView(TemplateView):
                 'recommended_songs': recommended_songs,
                 'description': description,
             })
-
-        # Add to context
-        context = {
-            'celebrations_with_songs': celebrations_with_songs,
-            'today': today,
-            'selected_date': selected_date,
-            'previous_date': selected_date - timedelta(days=1),
-            'next_date': selected_date + timedelta(days=1),
-        }
-        return context
+        return celebrations_with_songs
 
 
 class AboutView(TemplateView):
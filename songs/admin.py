@@ -1,4 +1,4 @@
-from typing import ClassVar, List
+from typing import ClassVar, List, Tuple
 
 from django.contrib import admin, messages
 from django.contrib.admin.widgets import FilteredSelectMultiple
@@ -10,8 +10,18 @@ from django.urls import reverse
 from django.utils.html import format_html
 
 from songs.forms import SongRuleForm
+from songs.utils.search_index import get_search_index
 
-from .models import ConditionType, Keyword, LiturgicalSeason, LiturgicalSubSeason, MassPart, Song, SongRule
+from .models import (
+    ConditionType,
+    DailyRecommendation,
+    Keyword,
+    LiturgicalSeason,
+    LiturgicalSubSeason,
+    MassPart,
+    Song,
+    SongRule,
+)
 
 
 class SongRuleInline(admin.TabularInline):
@@ -46,6 +56,19 @@ class SongAdmin(admin.ModelAdmin):
         },
     }
 
+    def get_search_results(
+        self,
+        request: HttpRequest,
+        queryset: QuerySet[Song],
+        search_term: str,
+    ) -> Tuple[QuerySet[Song], bool]:
+        """
+        Search through the search index, so diacritics don't matter and the table is not scanned.
+        """
+        if not search_term.strip():
+            return queryset, False
+        return queryset.filter(pk__in=get_search_index().search(Song, search_term)), False
+
 
 @admin.register(LiturgicalSeason)
 class LiturgicalSeasonAdmin(admin.ModelAdmin):
@@ -67,6 +90,11 @@ class KeywordAdmin(admin.ModelAdmin):
     list_display = ('word',)
 
 
+@admin.register(DailyRecommendation)
+class DailyRecommendationAdmin(admin.ModelAdmin):
+    list_display = ('date', 'updated_at')
+
+
 @admin.register(ConditionType)
 class ConditionTypeAdmin(admin.ModelAdmin):
     list_display = ('name',)
@@ -0,0 +1,113 @@
+import json
+import platform
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict
+
+import django
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection, transaction
+from django.test.utils import override_settings
+
+from cantica.benchmark import SCALES, generate_data, run_benchmarks
+
+BENCHMARK_SETTINGS = {
+    'ALLOWED_HOSTS': ['testserver'],
+    'CACHES': {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'benchmark',
+        },
+    },
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark song recommendations, homepage rendering and calendar updates on synthetic data. '
+        'The data is generated in a test database with an in-memory cache, so no real data is touched. '
+        'Query counts, wall time and peak memory are reported as JSON.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--scales',
+            nargs='+',
+            choices=list(SCALES),
+            default=['small', 'medium'],
+            help='Sizes of the synthetic data.',
+        )
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs of each benchmark.')
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the synthetic data.')
+        parser.add_argument('--label', default='', help='Label stored with the results, e.g. a commit hash.')
+        parser.add_argument('--output', metavar='FILE', help='Write the results to a JSON file instead of stdout.')
+        parser.add_argument(
+            '--compare',
+            metavar='FILE',
+            help='JSON results of an earlier run, changes of query counts and median times are printed.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        baseline = self.load_results(Path(options['compare'])) if options['compare'] else None
+        results = {
+            'label': options['label'],
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'seed': options['seed'],
+            'repeat': options['repeat'],
+            'scales': {},
+        }
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with override_settings(**BENCHMARK_SETTINGS):
+                for scale_name in options['scales']:
+                    self.stderr.write(f'Running the {scale_name} benchmark...')
+                    results['scales'][scale_name] = self.run_scale(
+                        scale_name,
+                        seed=options['seed'],
+                        repeat=options['repeat'],
+                    )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        output = json.dumps(results, indent=2)
+        if options['output']:
+            Path(options['output']).write_text(output + '\n', encoding='utf-8')
+            self.stderr.write(f'Results written to {options["output"]}.')
+        else:
+            self.stdout.write(output)
+        if baseline is not None:
+            self.compare(results, baseline)
+
+    def run_scale(self, scale_name: str, seed: int, repeat: int) -> Dict[str, Any]:
+        """Generate the data of the scale and benchmark it, the data is rolled back afterwards."""
+        with transaction.atomic():
+            generate_data(SCALES[scale_name], seed=seed)
+            benchmarks = run_benchmarks(repeat=repeat)
+            transaction.set_rollback(True)
+        return {'size': SCALES[scale_name]._asdict(), 'benchmarks': benchmarks}
+
+    def load_results(self, path: Path) -> Dict[str, Any]:
+        try:
+            return json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Cannot read benchmark results from {path}: {e}') from e
+
+    def compare(self, results: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+        """Print how query counts and median times changed against the baseline results."""
+        self.stderr.write(f'Compared with {baseline.get("label") or baseline.get("created_at")}:')
+        for scale_name, scale in results['scales'].items():
+            baseline_benchmarks = baseline.get('scales', {}).get(scale_name, {}).get('benchmarks', {})
+            for name, benchmark in scale['benchmarks'].items():
+                previous = baseline_benchmarks.get(name)
+                if previous is None:
+                    continue
+                median = benchmark['wall_ms']['median']
+                previous_median = previous['wall_ms']['median']
+                change = (median / previous_median - 1) * 100 if previous_median else 0
+                self.stderr.write(
+                    f'  {scale_name} {name}: {previous_median:.1f} -> {median:.1f} ms ({change:+.0f} %), '
+                    f'{previous["queries"]} -> {benchmark["queries"]} queries',
+                )
@@ -0,0 +1,101 @@
+import random
+import time
+from typing import Callable, Dict, List
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from songs.models import Song
+from songs.utils.rule_index import RULE_CATEGORIES, RuleRecord
+from songs.utils.song_recommender import SongRecommender
+
+MASS_PARTS = ('entrance', 'psalm', 'aleluia', 'gospel', 'offertory', 'communion', 'recessional')
+CATEGORIES = tuple(category for category in RULE_CATEGORIES.values() if category != 'subseasonal_rules')
+
+
+def make_rules(count: int, seed: int = 0) -> Dict[str, List[RuleRecord]]:
+    """
+    Build a synthetic catalogue of rules split by category. No rule is exclusive,
+    so apply_rule_priority keeps all of them, which is the worst case for classification.
+    """
+    rng = random.Random(seed)  # noqa: S311
+    songs = [Song(id=pk, title=f'Song {pk}', number=pk) for pk in range(1, count // 10 + 2)]
+    rules: Dict[str, List[RuleRecord]] = {category: [] for category in CATEGORIES}
+    for pk in range(1, count + 1):
+        category = rng.choice(CATEGORIES)
+        rules[category].append(RuleRecord(
+            id=pk,
+            song=rng.choice(songs),
+            mass_part_name=rng.choice(MASS_PARTS),
+            priority=rng.randrange(10),
+            exclusive=False,
+            can_be_main=False,
+            category=category,
+        ))
+    return rules
+
+
+def classify_by_membership(recommender: SongRecommender, rules: Dict[str, List[RuleRecord]]) -> Dict[str, List]:
+    """Classification as it was done before rules were tagged, scanning the category lists."""
+    filtered_rules = recommender.apply_rule_priority([rule for category in CATEGORIES for rule in rules[category]])
+    return {
+        category: [rule for rule in filtered_rules if rule in rules[category]]
+        for category in CATEGORIES
+    }
+
+
+def classify_by_category(recommender: SongRecommender, rules: Dict[str, List[RuleRecord]]) -> Dict[str, List]:
+    """Classification by the category the rules were tagged with, as done in get_song_rules."""
+    classified: Dict[str, List] = {category: [] for category in CATEGORIES}
+    for rule in recommender.apply_rule_priority([rule for category in CATEGORIES for rule in rules[category]]):
+        classified[rule.category].append(rule)
+    return classified
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare classification of song rules into categories by list membership and by category tags '
+        'on synthetic catalogues of rules. No database access is needed.'
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--sizes',
+            type=int,
+            nargs='+',
+            default=[1000, 2500, 5000, 10000],
+            help='Numbers of rules of the synthetic catalogues.',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='Runs of the tagged classification per size, the best one is reported.',
+        )
+        parser.add_argument(
+            '--skip-membership',
+            action='store_true',
+            help='Only time the tagged classification, membership scans take long for large catalogues.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        recommender = SongRecommender()
+        self.stdout.write(f'{"rules":>8} {"membership [ms]":>16} {"tagged [ms]":>12}')
+        for size in options['sizes']:
+            rules = make_rules(size)
+            tagged = self.measure(classify_by_category, recommender, rules, repeat=options['repeat'])
+            if options['skip_membership']:
+                membership = '-'
+            else:
+                if classify_by_membership(recommender, rules) != classify_by_category(recommender, rules):
+                    self.stderr.write(f'Classifications of {size} rules differ.')
+                membership = f'{self.measure(classify_by_membership, recommender, rules, repeat=1):.1f}'
+            self.stdout.write(f'{size:>8} {membership:>16} {tagged:>12.2f}')
+
+    def measure(self, function: Callable[..., object], *args: object, repeat: int) -> float:
+        """Best time of the given number of runs in milliseconds."""
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            function(*args)
+            timings.append((time.perf_counter() - started) * 1000)
+        return min(timings)
@@ -0,0 +1,29 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from songs.utils.daily_recommendations import materialize_recommendations
+
+
+class Command(BaseCommand):
+    help = 'Precompute song recommendations for a range of days. Meant to be run nightly.'
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            '--start',
+            type=date.fromisoformat,
+            default=None,
+            help='First day to materialize (YYYY-MM-DD), defaults to today.',
+        )
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=400,
+            help='Number of days to materialize.',
+        )
+
+    def handle(self, *args, **options) -> None:
+        start = options['start'] or date.today()
+        end = start + timedelta(days=options['days'] - 1)
+        count = materialize_recommendations(start=start, end=end)
+        self.stdout.write(self.style.SUCCESS(f'Materialized recommendations for {count} days ({start} - {end}).'))
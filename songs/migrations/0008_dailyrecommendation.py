@@ -0,0 +1,22 @@
+# Generated by Django 5.1.3 on 2026-10-18 12:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('songs', '0007_song_has_communion_verse_song_has_recessional_verse'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField(unique=True)),
+                ('recommendations', models.JSONField(default=list)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
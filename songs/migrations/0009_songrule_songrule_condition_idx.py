@@ -0,0 +1,18 @@
+# Generated by Django 5.1.3 on 2026-10-18 13:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+        ('songs', '0008_dailyrecommendation'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='songrule',
+            index=models.Index(fields=['content_type', 'object_id', 'mass_part', 'priority'], name='songrule_condition_idx'),
+        ),
+    ]
@@ -1,3 +1,5 @@
+from typing import ClassVar
+
 from django.contrib.contenttypes.fields import GenericForeignKey
 from django.contrib.contenttypes.models import ContentType
 from django.db import models
@@ -89,5 +91,22 @@ class SongRule(models.Model):
     )
     can_be_main = models.BooleanField(default=True)
 
+    class Meta:
+        # Rules are looked up by their condition value, optionally narrowed to a mass part and priority
+        indexes: ClassVar = [
+            models.Index(fields=['content_type', 'object_id', 'mass_part', 'priority'], name='songrule_condition_idx'),
+        ]
+
     def __str__(self) -> str:
         return f'{self.song} - {self.condition_type} - {self.condition_value}'
+
+
+class DailyRecommendation(models.Model):
+    date = models.DateField(unique=True)
+    # One item per celebration of the day, songs are stored as lists of ids:
+    # {'celebration': id, 'specific': [...], 'typical': [...], 'seasonal': str, 'detailed': [[part, [...]], ...]}
+    recommendations = models.JSONField(default=list)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f'{self.date} ({len(self.recommendations)} celebrations)'
@@ -6,6 +6,8 @@ from .models import Song
 
 
 class SongSerializer(serializers.ModelSerializer):
+    keywords = serializers.SlugRelatedField(many=True, read_only=True, slug_field='word')
+
     class Meta:
         model = Song
-        fields: ClassVar = ['id', 'title', 'number', 'section', 'celebration_types']
+        fields: ClassVar = ['id', 'title', 'number', 'has_communion_verse', 'has_recessional_verse', 'keywords']
@@ -0,0 +1,182 @@
+from django.db.models import QuerySet
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from cantica.cache import bump_content_version
+from celebrations.models import Celebration, CelebrationType, LiturgicalCalendarEvent
+from celebrations.signals import calendar_updated
+from songs.models import Keyword, LiturgicalSeason, LiturgicalSubSeason, MassPart, Song, SongRule
+from songs.utils.daily_recommendations import invalidate_conditions, invalidate_dates
+from songs.utils.rule_index import invalidate_rule_index
+from songs.utils.search_index import SEARCH_MODELS, invalidate_search_index
+
+RULE_INDEX_MODELS = (SongRule, Song, MassPart, LiturgicalSeason, LiturgicalSubSeason)
+CONTENT_MODELS = (*RULE_INDEX_MODELS, Keyword, Celebration, CelebrationType, LiturgicalCalendarEvent)
+CONTENT_M2M_MODELS = (Song.keywords.through, Celebration.types.through, LiturgicalCalendarEvent.celebrations.through)
+M2M_CHANGE_ACTIONS = {'post_add', 'post_remove', 'pre_clear'}
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_rule_index_on_change(sender: type, **kwargs) -> None:
+    """
+    Any change of a rule or of the rows joined into the rule index makes the index outdated.
+    """
+    if sender in RULE_INDEX_MODELS:
+        invalidate_rule_index()
+
+
+@receiver(post_save)
+@receiver(post_delete)
+@receiver(m2m_changed)
+def invalidate_search_index_on_change(sender: type, **kwargs) -> None:
+    if sender in SEARCH_MODELS or sender is Song.keywords.through:
+        invalidate_search_index()
+
+
+@receiver(post_save)
+@receiver(post_delete)
+@receiver(m2m_changed)
+def bump_content_version_on_change(sender: type, **kwargs) -> None:
+    """
+    Rules and calendar data are what the rendered recommendations depend on.
+    """
+    if sender in CONTENT_MODELS or sender in CONTENT_M2M_MODELS:
+        bump_content_version()
+
+
+@receiver(pre_save, sender=SongRule)
+def remember_previous_condition(sender: type, instance: SongRule, **kwargs) -> None:
+    instance._previous_condition = None
+    if instance.pk is not None:
+        instance._previous_condition = SongRule.objects.filter(
+            pk=instance.pk,
+        ).values_list('content_type_id', 'object_id').first()
+
+
+@receiver(post_save, sender=SongRule)
+@receiver(post_delete, sender=SongRule)
+def invalidate_recommendations_on_rule_change(sender: type, instance: SongRule, **kwargs) -> None:
+    conditions = [(instance.content_type_id, instance.object_id)]
+    previous_condition = getattr(instance, '_previous_condition', None)
+    if previous_condition is not None:
+        conditions.append(previous_condition)
+    invalidate_conditions(conditions)
+
+
+@receiver(post_save, sender=Song)
+def invalidate_recommendations_on_song_change(sender: type, instance: Song, created: bool, **kwargs) -> None:
+    if created:
+        return
+    invalidate_conditions(SongRule.objects.filter(song=instance).values_list('content_type_id', 'object_id'))
+
+
+@receiver(post_save, sender=Keyword)
+@receiver(post_delete, sender=Keyword)
+@receiver(post_save, sender=MassPart)
+@receiver(post_delete, sender=MassPart)
+@receiver(post_save, sender=LiturgicalSeason)
+@receiver(post_delete, sender=LiturgicalSeason)
+@receiver(post_save, sender=LiturgicalSubSeason)
+@receiver(post_delete, sender=LiturgicalSubSeason)
+def invalidate_all_recommendations(sender: type, **kwargs) -> None:
+    invalidate_dates(None)
+
+
+@receiver(m2m_changed, sender=Song.keywords.through)
+def invalidate_recommendations_on_song_keywords_change(sender: type, action: str, **kwargs) -> None:
+    """
+    Keywords can change the main song of any date whose rules don't pick one.
+    """
+    if action in M2M_CHANGE_ACTIONS:
+        invalidate_dates(None)
+
+
+@receiver(post_save, sender=LiturgicalCalendarEvent)
+@receiver(post_delete, sender=LiturgicalCalendarEvent)
+def invalidate_recommendations_on_calendar_change(sender: type, instance: LiturgicalCalendarEvent, **kwargs) -> None:
+    invalidate_dates([instance.date])
+
+
+@receiver(m2m_changed, sender=LiturgicalCalendarEvent.celebrations.through)
+def invalidate_recommendations_on_calendar_celebrations_change(
+    sender: type,
+    instance: object,
+    action: str,
+    reverse: bool,
+    pk_set: set,
+    **kwargs,
+) -> None:
+    if action not in M2M_CHANGE_ACTIONS:
+        return
+    if not reverse:
+        invalidate_dates([instance.date])
+        return
+    events = LiturgicalCalendarEvent.objects.filter(celebrations=instance)
+    if pk_set:
+        events = events | LiturgicalCalendarEvent.objects.filter(pk__in=pk_set)
+    invalidate_dates(events.values_list('date', flat=True))
+
+
+@receiver(post_save, sender=Celebration)
+def invalidate_recommendations_on_celebration_change(sender: type, instance: Celebration, **kwargs) -> None:
+    invalidate_dates(instance.liturgical_calendar_events.values_list('date', flat=True))
+
+
+def get_celebration_type_dates(celebration_type: CelebrationType) -> QuerySet:
+    return LiturgicalCalendarEvent.objects.filter(celebrations__types=celebration_type).values_list('date', flat=True)
+
+
+@receiver(pre_delete, sender=CelebrationType)
+def remember_celebration_type_dates(sender: type, instance: CelebrationType, **kwargs) -> None:
+    # The links to celebrations are gone by post_delete, so the dates are collected beforehand
+    instance._dates = list(get_celebration_type_dates(instance))
+
+
+@receiver(post_save, sender=CelebrationType)
+@receiver(post_delete, sender=CelebrationType)
+def invalidate_recommendations_on_celebration_type_change(
+    sender: type,
+    instance: CelebrationType,
+    created: bool = False,
+    **kwargs,
+) -> None:
+    """
+    Type names are matched against song keywords, so they can change the main song of the type's dates.
+    """
+    if created:
+        return
+    dates = getattr(instance, '_dates', None)
+    invalidate_dates(get_celebration_type_dates(instance) if dates is None else dates)
+
+
+@receiver(m2m_changed, sender=Celebration.types.through)
+def invalidate_recommendations_on_celebration_types_change(
+    sender: type,
+    instance: object,
+    action: str,
+    reverse: bool,
+    pk_set: set,
+    **kwargs,
+) -> None:
+    if action not in M2M_CHANGE_ACTIONS:
+        return
+    if not reverse:
+        celebrations = [instance.pk]
+    elif action == 'pre_clear':
+        celebrations = instance.celebrations.values_list('pk', flat=True)
+    else:
+        celebrations = pk_set or []
+    invalidate_dates(
+        LiturgicalCalendarEvent.objects.filter(celebrations__in=celebrations).values_list('date', flat=True),
+    )
+
+
+@receiver(calendar_updated)
+def invalidate_recommendations_on_calendar_update(sender: type, dates: list, celebrations: list, **kwargs) -> None:
+    bump_content_version()
+    invalidate_dates(
+        set(dates) | set(
+            LiturgicalCalendarEvent.objects.filter(celebrations__in=celebrations).values_list('date', flat=True),
+        ),
+    )
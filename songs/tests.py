@@ -0,0 +1,367 @@
+import json
+from datetime import date, timedelta
+from typing import List, Optional, Tuple, Type
+
+import numpy as np
+from django.contrib.contenttypes.models import ContentType
+from django.db import connection
+from django.db.models import Model
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from cantica.benchmark import Scale, generate_data
+from cantica.date_classification import classify_dates
+from celebrations.models import Celebration, CelebrationType, LiturgicalCalendarEvent
+from celebrations.utils.calendar_generator import LiturgicalCalendarGenerator
+from songs.models import (
+    ConditionType,
+    DailyRecommendation,
+    Keyword,
+    LiturgicalSeason,
+    MassPart,
+    Song,
+    SongRule,
+)
+from songs.utils.helpers import SUBSEASON_FLAGS, DateFlags, get_date_flags, get_song_section_for_liturgical_season
+from songs.utils.liturgical_season import LiturgicalSeasonEnum
+from songs.utils.rule_index import get_rule_index, invalidate_rule_index
+from songs.utils.search_index import ModelSearchIndex, get_search_index
+from songs.utils.song_recommender import MassPartSelector, RecommendedSongs, SongRecommender
+
+# Tens of thousands of rules and ten years of calendar, so the planner has a reason to prefer an index
+INDEX_SCALE = Scale(songs=1000, rules=20000, celebrations=400, days=3650)
+
+
+def get_index_name(model: Type[Model], columns: List[str]) -> str:
+    with connection.cursor() as cursor:
+        constraints = connection.introspection.get_constraints(cursor, model._meta.db_table)
+    return next(
+        name for name, constraint in constraints.items()
+        if constraint['index'] and constraint['columns'] == columns
+    )
+
+
+class QueryIndexTests(TestCase):
+    """
+    The query plans of the condition lookups of rules and of the season lookups of calendar events use indexes.
+    """
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        generate_data(INDEX_SCALE)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        cls.rule = SongRule.objects.order_by('id').first()
+
+    def test_rules_by_condition_use_index(self) -> None:
+        rules = SongRule.objects.filter(content_type=self.rule.content_type_id, object_id=self.rule.object_id)
+        self.assertIn('songrule_condition_idx', rules.explain())
+
+    def test_rules_by_condition_and_mass_part_use_index(self) -> None:
+        rules = SongRule.objects.filter(
+            content_type=self.rule.content_type_id,
+            object_id=self.rule.object_id,
+            mass_part=self.rule.mass_part_id,
+            priority=self.rule.priority,
+        )
+        self.assertIn('songrule_condition_idx', rules.explain())
+
+    def test_calendar_events_by_season_use_index(self) -> None:
+        dates = LiturgicalCalendarEvent.objects.filter(season='advent').values_list('date', flat=True)
+        self.assertIn(get_index_name(LiturgicalCalendarEvent, ['season']), dates.explain())
+
+
+class RecommendedSongsSerializationTests(SimpleTestCase):
+    def setUp(self) -> None:
+        self.songs = {pk: Song(pk=pk, title=f'Song {pk}', number=pk) for pk in range(1, 4)}
+
+    def test_round_trip_keeps_mass_part_order(self) -> None:
+        recommended_songs = RecommendedSongs(
+            specific=[self.songs[1]],
+            typical=[],
+            seasonal='',
+            detailed={
+                part: MassPartSelector(part, [self.songs[pk]])
+                for part, pk in [('main', 1), ('psalm', 2), ('communion', 3)]
+            },
+        )
+        data = json.loads(json.dumps(recommended_songs.to_dict()))
+
+        loaded = RecommendedSongs.from_dict(data, songs=self.songs)
+
+        self.assertEqual(list(loaded.detailed), ['main', 'psalm', 'communion'])
+        self.assertEqual(
+            [selector.songs for selector in loaded.detailed.values()],
+            [[self.songs[1]], [self.songs[2]], [self.songs[3]]],
+        )
+
+    def test_stored_mapping_is_ordered_by_mass_part(self) -> None:
+        # Stored as a mapping by earlier versions, jsonb returns the keys in its own order
+        data = {
+            'specific': [],
+            'typical': [],
+            'seasonal': '',
+            'detailed': {'psalm': [2], 'communion': [3], 'main': [1]},
+        }
+
+        loaded = RecommendedSongs.from_dict(data, songs=self.songs)
+
+        self.assertEqual(list(loaded.detailed), ['main', 'psalm', 'communion'])
+
+
+class RecommendationRangeViewTests(TestCase):
+    day = date(2025, 7, 15)
+
+    def setUp(self) -> None:
+        invalidate_rule_index()
+        season = LiturgicalSeason.objects.create(name='ordinary', description='ordinary time')
+        condition_type = ConditionType.objects.create(
+            name='LiturgicalSeason',
+            content_type=ContentType.objects.get_for_model(LiturgicalSeason),
+        )
+        self.songs = []
+        for i, part in enumerate(['main', 'psalm', 'communion']):
+            song = Song.objects.create(title=f'Song {i}', number=i + 1)
+            SongRule.objects.create(
+                song=song,
+                condition_type=condition_type,
+                content_type=condition_type.content_type,
+                object_id=season.pk,
+                mass_part=MassPart.objects.create(name=part),
+            )
+            self.songs.append(song)
+        self.celebration = Celebration.objects.create(name='Celebration')
+        event = LiturgicalCalendarEvent.objects.create(date=self.day, season='ordinary')
+        event.celebrations.set([self.celebration])
+
+    def test_stored_mass_parts_are_streamed_in_order(self) -> None:
+        main, psalm, communion = (song.pk for song in self.songs)
+        DailyRecommendation.objects.create(date=self.day, recommendations=[{
+            'celebration': self.celebration.pk,
+            'specific': [],
+            'typical': [],
+            'seasonal': '',
+            'detailed': {'psalm': [psalm], 'communion': [communion], 'main': [main]},
+        }])
+
+        response = self.client.get(reverse('recommendation-range'), {'from': self.day.isoformat()})
+
+        days = json.loads(b''.join(response.streaming_content))
+        detailed = days[0]['celebrations'][0]['recommendations']['detailed']
+        self.assertEqual(list(detailed), ['main', 'psalm', 'communion'])
+        self.assertEqual([songs[0]['id'] for songs in detailed.values()], [main, psalm, communion])
+
+
+class CelebrationTypeInvalidationTests(TestCase):
+    day = date(2025, 6, 24)
+    other_day = date(2025, 6, 25)
+
+    def setUp(self) -> None:
+        self.celebration_type = CelebrationType.objects.create(name='Slavnost')
+        celebration = Celebration.objects.create(name='Narození sv. Jana Křtitele')
+        celebration.types.set([self.celebration_type])
+        LiturgicalCalendarEvent.objects.create(date=self.day, season='ordinary').celebrations.set([celebration])
+        LiturgicalCalendarEvent.objects.create(date=self.other_day, season='ordinary')
+        for day in (self.day, self.other_day):
+            DailyRecommendation.objects.create(date=day, recommendations=[])
+
+    def get_stored_dates(self) -> List[date]:
+        return list(DailyRecommendation.objects.order_by('date').values_list('date', flat=True))
+
+    def test_renaming_type_invalidates_its_dates(self) -> None:
+        self.celebration_type.name = 'Svátek'
+        self.celebration_type.save()
+
+        self.assertEqual(self.get_stored_dates(), [self.other_day])
+
+    def test_deleting_type_invalidates_its_dates(self) -> None:
+        self.celebration_type.delete()
+
+        self.assertEqual(self.get_stored_dates(), [self.other_day])
+
+
+class DateClassificationTests(SimpleTestCase):
+    # Three Advents and two Easters
+    start = date(2024, 11, 1)
+    end = date(2026, 12, 31)
+
+    def test_columns_match_scalar_classification(self) -> None:
+        columns = classify_dates(self.start, self.end)
+
+        days = [self.start + timedelta(days=offset) for offset in range((self.end - self.start).days + 1)]
+        seasons = [LiturgicalCalendarGenerator().get_season(day)[0] for day in days]
+        flags = [get_date_flags(day) for day in days]
+        self.assertEqual(columns['date'].tolist(), days)
+        self.assertEqual(columns['season'].tolist(), seasons)
+        self.assertEqual(
+            columns['song_section'].tolist(),
+            [get_song_section_for_liturgical_season(LiturgicalSeasonEnum.from_string(season)) for season in seasons],
+        )
+        self.assertEqual(columns['flags'].tolist(), flags)
+        for flag in (*SUBSEASON_FLAGS, DateFlags.GOOD_FRIDAY, DateFlags.EASTER_TRIDUUM):
+            self.assertEqual(columns[flag.name.lower()].tolist(), [bool(day_flags & flag.value) for day_flags in flags])
+
+    def test_empty_dates(self) -> None:
+        columns = classify_dates(np.array([], dtype='datetime64[D]'))
+
+        self.assertTrue(all(column.size == 0 for column in columns.values()))
+
+
+class KeywordSongTests(TestCase):
+    day = date(2025, 6, 24)
+
+    def setUp(self) -> None:
+        invalidate_rule_index()
+        self.ordinary = LiturgicalSeason.objects.create(name='ordinary', description='ordinary time')
+        self.advent = LiturgicalSeason.objects.create(name='advent', description='advent')
+        self.main = MassPart.objects.create(name='main')
+        self.celebration = Celebration.objects.create(name='Narození sv. Jana Křtitele')
+        # Keyword songs are allowed as the main song by a rule of another celebration
+        self.rule_celebration = Celebration.objects.create(name='Sv. Anny')
+        self.other_celebration = Celebration.objects.create(name='Sv. Václava')
+        self.seasonal_song = self.create_song('Seasonal', condition_value=self.ordinary)
+
+    def create_song(
+        self,
+        title: str,
+        condition_value: Model,
+        keywords: Tuple[str, ...] = (),
+        can_be_main: bool = True,
+    ) -> Song:
+        song = Song.objects.create(title=title, number=Song.objects.count() + 1)
+        condition_type, _ = ConditionType.objects.get_or_create(
+            name=type(condition_value).__name__,
+            content_type=ContentType.objects.get_for_model(condition_value),
+        )
+        SongRule.objects.create(
+            song=song,
+            condition_type=condition_type,
+            content_type=condition_type.content_type,
+            object_id=condition_value.pk,
+            mass_part=self.main,
+            can_be_main=can_be_main,
+        )
+        song.keywords.set([Keyword.objects.get_or_create(word=word)[0] for word in keywords])
+        return song
+
+    def get_keyword_song(self, celebration: Celebration) -> Optional[Song]:
+        invalidate_rule_index()
+        return SongRecommender().get_keyword_song(
+            celebration=celebration,
+            liturgical_season=LiturgicalSeasonEnum.ORDINARY,
+            day=self.day,
+        )
+
+    def get_main_song(self, celebration: Celebration) -> Song:
+        invalidate_rule_index()
+        recommended_songs = SongRecommender().recommend_songs(
+            day=self.day,
+            celebration=celebration,
+            liturgical_season=LiturgicalSeasonEnum.ORDINARY,
+            liturgical_subseasons=[],
+        )
+        return recommended_songs.detailed['main'].songs[0]
+
+    def test_keyword_song_is_main_song(self) -> None:
+        song = self.create_song('Keyword', condition_value=self.rule_celebration, keywords=('Křtitel', 'Křtitele'))
+
+        self.assertEqual(self.get_main_song(self.celebration), song)
+
+    def test_celebration_without_keyword_gets_seasonal_song(self) -> None:
+        self.create_song('Keyword', condition_value=self.rule_celebration, keywords=('Křtitele',))
+
+        self.assertEqual(self.get_main_song(self.other_celebration), self.seasonal_song)
+
+    def test_keyword_matches_whole_words(self) -> None:
+        self.create_song('Prefix', condition_value=self.rule_celebration, keywords=('Jan', 'Narozenin'))
+
+        self.assertIsNone(self.get_keyword_song(self.celebration))
+
+    def test_keyword_of_more_words_matches_words_in_row(self) -> None:
+        song = self.create_song('Phrase', condition_value=self.rule_celebration, keywords=('Jana Křtitele',))
+
+        self.assertEqual(self.get_keyword_song(self.celebration), song)
+
+    def test_song_that_cannot_be_main_is_not_picked(self) -> None:
+        self.create_song('Not main', condition_value=self.rule_celebration, keywords=('Křtitele',), can_be_main=False)
+
+        self.assertIsNone(self.get_keyword_song(self.celebration))
+
+    def test_only_songs_of_rules_and_keywords_are_loaded(self) -> None:
+        keyword_song = Song.objects.create(title='Keyword only', number=10)
+        keyword_song.keywords.add(Keyword.objects.create(word='Křtitele'))
+        Song.objects.create(title='Unused', number=11)
+        invalidate_rule_index()
+
+        songs = get_rule_index().songs
+
+        self.assertEqual(set(songs), {self.seasonal_song.pk, keyword_song.pk})
+
+    def test_song_of_other_season_is_not_picked(self) -> None:
+        self.create_song('Advent', condition_value=self.advent, keywords=('Křtitele',))
+
+        self.assertIsNone(self.get_keyword_song(self.celebration))
+
+
+class ModelSearchIndexTests(SimpleTestCase):
+    def setUp(self) -> None:
+        self.index = ModelSearchIndex()
+        self.index.add(1, name='Zdrávas Maria, milosti plná')
+        self.index.add(2, name='Maria', keys=['12'])
+        self.index.add(3, name='Maria, matko')
+        self.index.add(4, name='Ave', extra=['Maria'])
+        self.index.add(5, name='Píseň ke Křtu Páně', keys=['7'])
+
+    def test_search_is_case_and_diacritics_insensitive(self) -> None:
+        self.assertEqual(self.index.search('PISEN'), [5])
+        self.assertEqual(self.index.search('křtu'), [5])
+
+    def test_all_words_must_match(self) -> None:
+        self.assertEqual(self.index.search('pane pisen'), [5])
+        self.assertEqual(self.index.search('pane maria'), [])
+
+    def test_short_and_long_words(self) -> None:
+        self.assertEqual(self.index.search('ke'), [5])
+        self.assertEqual(self.index.search('milosti'), [1])
+        # All trigrams of the word occur in the text, but not in a row
+        self.assertEqual(self.index.search('marimat'), [])
+
+    def test_ranking(self) -> None:
+        # Exact name, name prefix, name containing the query, then other texts
+        self.assertEqual(self.index.search('maria'), [2, 3, 1, 4])
+        self.assertEqual(self.index.search('maria', limit=2), [2, 3])
+
+    def test_key_matches_exactly(self) -> None:
+        self.assertEqual(self.index.search('12'), [2])
+        self.assertEqual(self.index.search('7'), [5])
+
+
+class SearchTests(TestCase):
+    def setUp(self) -> None:
+        self.songs = [
+            Song.objects.create(title=title, number=number)
+            for number, title in enumerate(['Zdrávas Maria', 'Maria, matko', 'Maria'], start=1)
+        ]
+
+    def test_view_keeps_ranked_order(self) -> None:
+        response = self.client.get(reverse('search'), {'q': 'maria'})
+
+        self.assertEqual(
+            [song['id'] for song in response.json()['songs']],
+            [self.songs[2].pk, self.songs[1].pk, self.songs[0].pk],
+        )
+
+    def test_index_is_rebuilt_after_changes(self) -> None:
+        self.assertEqual(get_search_index().search(Song, 'advent'), [])
+
+        song = Song.objects.create(title='Ejhle, Hospodin přijde', number=4)
+        song.keywords.add(Keyword.objects.create(word='Advent'))
+        self.assertEqual(get_search_index().search(Song, 'advent'), [song.pk])
+        self.assertEqual(get_search_index().search(Keyword, 'advent'), [song.keywords.get().pk])
+
+        song.title = 'Ejhle, Hospodin'
+        song.save()
+        self.assertEqual(get_search_index().search(Song, 'prijde'), [])
+
+        song.delete()
+        self.assertEqual(get_search_index().search(Song, 'advent'), [])
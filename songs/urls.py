@@ -1,8 +1,10 @@
 from django.urls import path
 
-from .views import ConditionValueAutocomplete, SongListView
+from .views import ConditionValueAutocomplete, RecommendationRangeView, SearchView, SongListView
 
 urlpatterns = [
     path('', SongListView.as_view(), name='song-list'),
+    path('search/', SearchView.as_view(), name='search'),
+    path('recommendations/', RecommendationRangeView.as_view(), name='recommendation-range'),
     path('condition-value-autocomplete/', ConditionValueAutocomplete.as_view(), name='condition-value-autocomplete'),
 ]
@@ -0,0 +1,321 @@
+import logging
+from datetime import date
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.contrib.contenttypes.models import ContentType
+from django.db.models import QuerySet
+
+from celebrations.models import Celebration, CelebrationType, LiturgicalCalendarEvent
+from songs.models import DailyRecommendation, LiturgicalSeason, LiturgicalSubSeason
+from songs.utils.helpers import classify_date_range, get_subseason_names
+from songs.utils.liturgical_season import LiturgicalSeasonEnum
+from songs.utils.song_recommender import RecommendedSongs, SongRecommender
+
+logger = logging.getLogger(__name__)
+
+EVENTS_CHUNK_SIZE = 100
+
+# Seasonal rules of these seasons are used by `fill_in_changeables` on every date.
+SEASONS_AFFECTING_ALL_DATES = {LiturgicalSeasonEnum.JESUS_CHRIST.value, LiturgicalSeasonEnum.VIRGIN_MARY.value}
+
+
+def compute_recommendations(
+    day: date,
+    celebrations: Iterable[Celebration],
+    liturgical_season: Optional[LiturgicalSeasonEnum],
+    liturgical_subseasons: List[LiturgicalSubSeason],
+    recommender: Optional[SongRecommender] = None,
+) -> Dict[int, RecommendedSongs]:
+    """
+    Compute recommendations for all celebrations of the day, keyed by celebration id.
+    """
+    recommender = recommender or SongRecommender()
+    return recommender.recommend_songs_for_day(
+        day=day,
+        celebrations=celebrations,
+        liturgical_season=liturgical_season,
+        liturgical_subseasons=liturgical_subseasons,
+    )
+
+
+def load_recommendations(day: date, celebrations: Iterable[Celebration]) -> Optional[Dict[int, RecommendedSongs]]:
+    """
+    Load materialized recommendations for the day.
+    Returns None if there are none or if they don't match the given celebrations.
+    """
+    stored = DailyRecommendation.objects.filter(date=day).values_list('recommendations', flat=True).first()
+    return parse_recommendations(day=day, stored=stored, celebrations=celebrations)
+
+
+def parse_recommendations(
+    day: date,
+    stored: Optional[List[Dict]],
+    celebrations: Iterable[Celebration],
+    recommender: Optional[SongRecommender] = None,
+) -> Optional[Dict[int, RecommendedSongs]]:
+    """
+    Parse the `recommendations` of a DailyRecommendation, songs are taken from the recommender's rule index.
+    Returns None if there are none or if they don't match the given celebrations.
+    """
+    if stored is None:
+        return None
+    if {item['celebration'] for item in stored} != {celebration.pk for celebration in celebrations}:
+        return None
+    songs = (recommender or SongRecommender()).rule_index.songs
+    try:
+        return {item['celebration']: RecommendedSongs.from_dict(item, songs=songs) for item in stored}
+    except KeyError:
+        logger.warning('Materialized recommendations for {day} refer to unknown songs.'.format(day=day))
+        return None
+
+
+def get_recommendations(
+    day: date,
+    celebrations: Iterable[Celebration],
+    liturgical_season: Optional[LiturgicalSeasonEnum],
+    liturgical_subseasons: List[LiturgicalSubSeason],
+) -> Dict[int, RecommendedSongs]:
+    """
+    Get recommendations for all celebrations of the day.
+    Materialized recommendations are used if available, otherwise they are computed.
+    """
+    celebrations = list(celebrations)
+    recommendations = load_recommendations(day=day, celebrations=celebrations)
+    if recommendations is None:
+        recommendations = compute_recommendations(
+            day=day,
+            celebrations=celebrations,
+            liturgical_season=liturgical_season,
+            liturgical_subseasons=liturgical_subseasons,
+        )
+    return recommendations
+
+
+async def aget_recommendations(
+    day: date,
+    celebrations: Iterable[Celebration],
+    liturgical_season: Optional[LiturgicalSeasonEnum],
+    liturgical_subseasons: List[LiturgicalSubSeason],
+) -> Dict[int, RecommendedSongs]:
+    """
+    Async variant of get_recommendations. Materialized recommendations are loaded with the async ORM,
+    they are parsed or computed in a worker thread, as the rule index they use may have to be rebuilt.
+    """
+    celebrations = list(celebrations)
+    stored = await DailyRecommendation.objects.filter(date=day).values_list('recommendations', flat=True).afirst()
+    return await sync_to_async(get_day_recommendations)(
+        day=day,
+        celebrations=celebrations,
+        liturgical_season=liturgical_season,
+        liturgical_subseasons=liturgical_subseasons,
+        stored=stored,
+    )
+
+
+def get_day_recommendations(
+    day: date,
+    celebrations: List[Celebration],
+    liturgical_season: Optional[LiturgicalSeasonEnum],
+    liturgical_subseasons: List[LiturgicalSubSeason],
+    stored: Optional[List[Dict]],
+    recommender: Optional[SongRecommender] = None,
+) -> Dict[int, RecommendedSongs]:
+    """
+    Parse the stored recommendations of the day, or compute them if they are missing or outdated.
+    """
+    recommender = recommender or SongRecommender()
+    recommendations = parse_recommendations(day=day, stored=stored, celebrations=celebrations, recommender=recommender)
+    if recommendations is None:
+        recommendations = compute_recommendations(
+            day=day,
+            celebrations=celebrations,
+            liturgical_season=liturgical_season,
+            liturgical_subseasons=liturgical_subseasons,
+            recommender=recommender,
+        )
+    return recommendations
+
+
+def get_calendar_events_queryset(start: date, end: date) -> QuerySet[LiturgicalCalendarEvent]:
+    """
+    Calendar days between start and end (inclusive) with their celebrations and types prefetched.
+    """
+    return LiturgicalCalendarEvent.objects.filter(
+        date__range=(start, end),
+    ).prefetch_related('celebrations__types').order_by('date')
+
+
+def get_calendar_events(start: date, end: date) -> Iterator[LiturgicalCalendarEvent]:
+    """
+    Iterate over calendar days between start and end (inclusive) with their celebrations and types prefetched.
+    """
+    return get_calendar_events_queryset(start=start, end=end).iterator(chunk_size=EVENTS_CHUNK_SIZE)
+
+
+def get_subseasons(flags: int, subseasons_by_name: Dict[str, LiturgicalSubSeason]) -> List[LiturgicalSubSeason]:
+    return [subseasons_by_name[name] for name in get_subseason_names(flags) if name in subseasons_by_name]
+
+
+def iter_range_recommendations(
+    start: date,
+    end: date,
+) -> Iterator[Tuple[LiturgicalCalendarEvent, List[LiturgicalSubSeason], Dict[int, RecommendedSongs]]]:
+    """
+    Yield each calendar day between start and end (inclusive) with its subseasons and recommendations.
+    Calendar days, subseasons and materialized recommendations are loaded once for the whole range
+    and missing recommendations are computed from the rule index.
+    """
+    recommender = SongRecommender()
+    subseasons_by_name = {subseason.name: subseason for subseason in LiturgicalSubSeason.objects.all()}
+    flags_by_date = classify_date_range(start, end)
+    stored_by_date = dict(
+        DailyRecommendation.objects.filter(date__range=(start, end)).values_list('date', 'recommendations'),
+    )
+
+    for event in get_calendar_events(start=start, end=end):
+        subseasons = get_subseasons(flags=flags_by_date[event.date], subseasons_by_name=subseasons_by_name)
+        recommendations = get_day_recommendations(
+            day=event.date,
+            celebrations=list(event.celebrations.all()),
+            liturgical_season=LiturgicalSeasonEnum.from_string(event.season),
+            liturgical_subseasons=subseasons,
+            stored=stored_by_date.get(event.date),
+            recommender=recommender,
+        )
+        yield event, subseasons, recommendations
+
+
+async def aiter_range_recommendations(
+    start: date,
+    end: date,
+) -> AsyncIterator[Tuple[LiturgicalCalendarEvent, List[LiturgicalSubSeason], Dict[int, RecommendedSongs]]]:
+    """
+    Async variant of iter_range_recommendations. Data is loaded with the async ORM,
+    recommendations are parsed or computed in a worker thread, as the rule index may have to be rebuilt.
+    """
+    recommender = SongRecommender()
+    subseasons_by_name = {subseason.name: subseason async for subseason in LiturgicalSubSeason.objects.all()}
+    flags_by_date = classify_date_range(start, end)
+    stored_by_date = {
+        day: stored
+        async for day, stored in DailyRecommendation.objects.filter(
+            date__range=(start, end),
+        ).values_list('date', 'recommendations')
+    }
+    get_recommendations_async = sync_to_async(get_day_recommendations)
+
+    events = get_calendar_events_queryset(start=start, end=end)
+    async for event in events.aiterator(chunk_size=EVENTS_CHUNK_SIZE):
+        subseasons = get_subseasons(flags=flags_by_date[event.date], subseasons_by_name=subseasons_by_name)
+        recommendations = await get_recommendations_async(
+            day=event.date,
+            celebrations=list(event.celebrations.all()),
+            liturgical_season=LiturgicalSeasonEnum.from_string(event.season),
+            liturgical_subseasons=subseasons,
+            stored=stored_by_date.get(event.date),
+            recommender=recommender,
+        )
+        yield event, subseasons, recommendations
+
+
+def materialize_recommendations(start: date, end: date) -> int:
+    """
+    Compute and store recommendations for every calendar day between start and end (inclusive).
+    Returns the number of stored days.
+    """
+    recommender = SongRecommender()
+    subseasons_by_name = {subseason.name: subseason for subseason in LiturgicalSubSeason.objects.all()}
+    flags_by_date = classify_date_range(start, end)
+
+    rows = []
+    for event in get_calendar_events(start=start, end=end):
+        subseasons = get_subseasons(flags=flags_by_date[event.date], subseasons_by_name=subseasons_by_name)
+        recommendations = compute_recommendations(
+            day=event.date,
+            celebrations=event.celebrations.all(),
+            liturgical_season=LiturgicalSeasonEnum.from_string(event.season),
+            liturgical_subseasons=subseasons,
+            recommender=recommender,
+        )
+        rows.append(DailyRecommendation(
+            date=event.date,
+            recommendations=[
+                {'celebration': celebration_id, **recommended_songs.to_dict()}
+                for celebration_id, recommended_songs in recommendations.items()
+            ],
+        ))
+
+    DailyRecommendation.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['date'],
+        update_fields=['recommendations', 'updated_at'],
+        batch_size=500,
+    )
+    return len(rows)
+
+
+def materialize_missing_day(day: date) -> bool:
+    """
+    Compute and store recommendations for the day unless they are stored already, e.g. after an invalidation.
+    Returns whether they were stored.
+    """
+    if DailyRecommendation.objects.filter(date=day).exists():
+        return False
+    return materialize_recommendations(start=day, end=day) > 0
+
+
+def get_dates_affected_by_condition(content_type_id: int, object_id: int) -> Optional[List[date]]:
+    """
+    Get dates whose recommendations depend on rules with the given condition value.
+    Returns None if all dates may be affected.
+    """
+    model = ContentType.objects.get_for_id(content_type_id).model_class()
+    events = LiturgicalCalendarEvent.objects.all()
+
+    if model is Celebration:
+        return list(events.filter(celebrations=object_id).values_list('date', flat=True))
+    if model is CelebrationType:
+        return list(events.filter(celebrations__types=object_id).values_list('date', flat=True).distinct())
+    if model is LiturgicalSeason:
+        name = LiturgicalSeason.objects.filter(pk=object_id).values_list('name', flat=True).first()
+        if name is None or name.lower() in SEASONS_AFFECTING_ALL_DATES:
+            return None
+        # Seasons of the calendar are stored lower-case, an exact match can use the index on season
+        return list(events.filter(season=name.lower()).values_list('date', flat=True))
+    if model is LiturgicalSubSeason:
+        name = LiturgicalSubSeason.objects.filter(pk=object_id).values_list('name', flat=True).first()
+        if name is None:
+            return None
+        dates = list(DailyRecommendation.objects.values_list('date', flat=True))
+        if not dates:
+            return []
+        flags_by_date = classify_date_range(min(dates), max(dates))
+        return [day for day in dates if name in get_subseason_names(flags_by_date[day])]
+    return None
+
+
+def invalidate_dates(dates: Optional[Iterable[date]]) -> None:
+    """
+    Drop materialized recommendations for the given dates, or for all dates if None is given.
+    """
+    recommendations = DailyRecommendation.objects.all()
+    if dates is not None:
+        recommendations = recommendations.filter(date__in=list(dates))
+    recommendations.delete()
+
+
+def invalidate_conditions(conditions: Iterable[Tuple[int, int]]) -> None:
+    """
+    Drop materialized recommendations affected by rules with the given (content_type_id, object_id) conditions.
+    """
+    dates = set()
+    for content_type_id, object_id in set(conditions):
+        affected_dates = get_dates_affected_by_condition(content_type_id=content_type_id, object_id=object_id)
+        if affected_dates is None:
+            invalidate_dates(None)
+            return
+        dates.update(affected_dates)
+    if dates:
+        invalidate_dates(dates)
@@ -1,23 +1,162 @@
+import unicodedata
+from array import array
 from datetime import date, timedelta
-from enum import Enum
+from enum import Enum, IntFlag, auto
+from functools import lru_cache
+from typing import Dict, FrozenSet, NamedTuple
 
 from dateutil import easter
 
 from songs.utils.liturgical_season import LiturgicalSeasonEnum
 
 
+class DateFlags(IntFlag):
+    """Subseasons and other periods of the liturgical year a date can fall into."""
+    LATE_ADVENT = auto()
+    CHRISTMAS_OCTAVE = auto()
+    WEEK_OF_PRAYER_FOR_CHRISTIAN_UNITY = auto()
+    LATE_LENT = auto()
+    EASTER_TRIDUUM = auto()
+    GOOD_FRIDAY = auto()
+    EASTER_OCTAVE = auto()
+    PENTECOST_NOVENA = auto()
+    MAY = auto()
+
+
+# Flags that correspond to LiturgicalSubSeason names
+SUBSEASON_FLAGS = (
+    DateFlags.LATE_ADVENT,
+    DateFlags.CHRISTMAS_OCTAVE,
+    DateFlags.WEEK_OF_PRAYER_FOR_CHRISTIAN_UNITY,
+    DateFlags.LATE_LENT,
+    DateFlags.EASTER_OCTAVE,
+    DateFlags.PENTECOST_NOVENA,
+)
+
+
+class YearAnchors(NamedTuple):
+    """Movable dates that determine the seasons of one civil year."""
+    baptism: date
+    ash_wednesday: date
+    easter: date
+    ascension: date
+    pentecost: date
+    first_advent_sunday: date
+    holy_family: date
+
+
+def sunday_on_or_before(day: date) -> date:
+    return day - timedelta(days=(day.weekday() + 1) % 7)
+
+
+def sunday_after(day: date) -> date:
+    return day + timedelta(days=7 - (day.weekday() + 1) % 7)
+
+
+@lru_cache(maxsize=256)
+def get_year_anchors(year: int) -> YearAnchors:
+    easter_date = easter.easter(year)
+    holy_family = sunday_after(date(year, 12, 25))
+    if holy_family.year != year:
+        # Christmas on a Sunday, there is no Sunday within the octave
+        holy_family = date(year, 12, 30)
+    return YearAnchors(
+        baptism=sunday_after(date(year, 1, 6)),
+        ash_wednesday=easter_date - timedelta(days=46),
+        easter=easter_date,
+        ascension=easter_date + timedelta(days=39),
+        pentecost=easter_date + timedelta(days=49),
+        first_advent_sunday=sunday_after(date(year, 11, 26)),
+        holy_family=holy_family,
+    )
+
+
+class LiturgicalYear:
+    """
+    Flags of every day of one civil year, computed once from its anchors, so classifying a date is a single lookup.
+    """
+
+    def __init__(self, year: int) -> None:
+        self.year = year
+        self.first_day = date(year, 1, 1)
+        self.flags = array('H', [0]) * ((date(year, 12, 31) - self.first_day).days + 1)
+        anchors = get_year_anchors(year)
+        easter_day, pentecost = anchors.easter, anchors.pentecost
+
+        self.mark(DateFlags.WEEK_OF_PRAYER_FOR_CHRISTIAN_UNITY, date(year, 1, 18), date(year, 1, 25))
+        self.mark(DateFlags.LATE_LENT, easter_day - timedelta(days=14), easter_day - timedelta(days=1))
+        self.mark(DateFlags.EASTER_TRIDUUM, easter_day - timedelta(days=3), easter_day - timedelta(days=1))
+        self.mark(DateFlags.GOOD_FRIDAY, easter_day - timedelta(days=2), easter_day - timedelta(days=2))
+        self.mark(DateFlags.EASTER_OCTAVE, easter_day, easter_day + timedelta(days=7))
+        self.mark(DateFlags.PENTECOST_NOVENA, pentecost - timedelta(days=9), pentecost - timedelta(days=1))
+        self.mark(DateFlags.MAY, date(year, 5, 1), date(year, 5, 31))
+        self.mark(DateFlags.LATE_ADVENT, date(year, 12, 17), date(year, 12, 24))
+        self.mark(DateFlags.CHRISTMAS_OCTAVE, date(year, 12, 25), date(year, 12, 31))
+
+    def mark(self, flag: DateFlags, start: date, end: date) -> None:
+        """Set the flag on all days between start and end (inclusive)."""
+        for offset in range((start - self.first_day).days, (end - self.first_day).days + 1):
+            self.flags[offset] |= flag.value
+
+    def get_flags(self, day: date) -> int:
+        """Get flags of the day as a plain int, which is much cheaper to test than a DateFlags instance."""
+        return self.flags[(day - self.first_day).days]
+
+
+@lru_cache(maxsize=64)
+def get_liturgical_year(year: int) -> LiturgicalYear:
+    return LiturgicalYear(year)
+
+
+def get_date_flags(day: date) -> int:
+    return get_liturgical_year(day.year).get_flags(day)
+
+
+def has_flag(day: date, flag: DateFlags) -> bool:
+    return bool(get_date_flags(day) & flag.value)
+
+
+def classify_date_range(start: date, end: date) -> Dict[date, int]:
+    """
+    Get flags of every day between start and end (inclusive), with each year's table looked up only once.
+    """
+    flags = {}
+    for year in range(start.year, end.year + 1):
+        liturgical_year = get_liturgical_year(year)
+        first = max(start, liturgical_year.first_day)
+        last = min(end, date(year, 12, 31))
+        offset = (first - liturgical_year.first_day).days
+        for index, value in enumerate(liturgical_year.flags[offset:offset + (last - first).days + 1]):
+            flags[first + timedelta(days=index)] = value
+    return flags
+
+
+@lru_cache(maxsize=None)
+def get_subseason_names(flags: int) -> FrozenSet[str]:
+    """
+    Get names of LiturgicalSubSeasons matching the given flags.
+    """
+    return frozenset(flag.name.lower() for flag in SUBSEASON_FLAGS if flags & flag.value)
+
+
 def get_easter_date(year: int) -> date:
-    return easter.easter(year)
+    return get_year_anchors(year).easter
 
 
 def get_pentecost_date(year: int) -> date:
-    easter_date = get_easter_date(year)
-    return easter_date + timedelta(days=49)
+    return get_year_anchors(year).pentecost
 
 
 def get_ascension_date(year: int) -> date:
-    easter_date = get_easter_date(year)
-    return easter_date + timedelta(days=39)
+    return get_year_anchors(year).ascension
+
+
+def fold(text: str) -> str:
+    """
+    Normalize text for searching: lowercase, without diacritics and with single spaces, "Píseň" -> "pisen".
+    """
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ' '.join(''.join(char for char in decomposed if not unicodedata.combining(char)).split())
 
 
 def season_match(season_to_check: str, current_season: str) -> bool:
@@ -26,67 +165,35 @@ def season_match(season_to_check: str, current_season: str) -> bool:
 
 
 def is_late_advent(date_to_check: date) -> bool:
-    late_advent_start = (12, 17)
-    late_advent_end = (12, 24)
-    date_to_check_yearless = (date_to_check.month, date_to_check.day)
-    if late_advent_start <= date_to_check_yearless <= late_advent_end:
-        return True
-    return False
+    return has_flag(date_to_check, DateFlags.LATE_ADVENT)
 
 
 def is_christmas_octave(date_to_check: date) -> bool:
-    christmas_octave_start = (12, 25)
-    christmas_octave_end = (12, 31)
-    date_to_check_yearless = (date_to_check.month, date_to_check.day)
-    if christmas_octave_start <= date_to_check_yearless <= christmas_octave_end:
-        return True
-    return False
+    return has_flag(date_to_check, DateFlags.CHRISTMAS_OCTAVE)
 
 
 def is_week_of_prayer_for_christian_unity(date_to_check: date) -> bool:
-    week_start = (1, 18)
-    week_end = (1, 25)
-    date_to_check_yearless = (date_to_check.month, date_to_check.day)
-    if week_start <= date_to_check_yearless <= week_end:
-        return True
-    return False
+    return has_flag(date_to_check, DateFlags.WEEK_OF_PRAYER_FOR_CHRISTIAN_UNITY)
 
 
 def is_late_lent(date_to_check: date) -> bool:
-    easter_date = get_easter_date(date_to_check.year)
-    days_before_easter = (easter_date - date_to_check).days
-    if 0 < days_before_easter <= 14:
-        return True
-    return False
+    return has_flag(date_to_check, DateFlags.LATE_LENT)
 
 
 def is_good_friday(date_to_check: date) -> bool:
-    easter_date = get_easter_date(date_to_check.year)
-    return date_to_check == (easter_date - timedelta(days=2))
+    return has_flag(date_to_check, DateFlags.GOOD_FRIDAY)
 
 
 def is_easter_triduum(date_to_check: date) -> bool:
-    easter_date = get_easter_date(date_to_check.year)
-    days_before_easter = (easter_date - date_to_check).days
-    if 1 <= days_before_easter <= 3:
-        return True
-    return False
+    return has_flag(date_to_check, DateFlags.EASTER_TRIDUUM)
 
 
 def is_easter_octave(date_to_check: date) -> bool:
-    easter_date = get_easter_date(date_to_check.year)
-    days_after_easter = (date_to_check - easter_date).days
-    if 0 <= days_after_easter <= 7:
-        return True
-    return False
+    return has_flag(date_to_check, DateFlags.EASTER_OCTAVE)
 
 
 def is_pentecost_novena(date_to_check: date) -> bool:
-    pentecost_date = get_pentecost_date(date_to_check.year)
-    days_until_pentecost = (pentecost_date - date_to_check).days
-    if 0 < days_until_pentecost <= 9:
-        return True
-    return False
+    return has_flag(date_to_check, DateFlags.PENTECOST_NOVENA)
 
 
 def is_may(date_to_check: date) -> bool:
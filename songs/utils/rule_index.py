@@ -0,0 +1,211 @@
+import re
+import threading
+from array import array
+from collections import defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple, Type
+
+from django.contrib.contenttypes.models import ContentType
+from django.db import models
+from django.db.models import Q
+
+from cantica.cache import get_content_version
+from celebrations.models import Celebration, CelebrationType
+from songs.models import LiturgicalSeason, LiturgicalSubSeason, Song, SongRule
+from songs.utils.helpers import fold
+
+_version = 0
+_version_lock = threading.Lock()
+_build_lock = threading.Lock()
+_index: Optional['SongRuleIndex'] = None
+
+CONDITION_MODELS = (LiturgicalSeason, LiturgicalSubSeason, Celebration, CelebrationType)
+
+# Rule category (as used by SongRecommender.get_song_rules) given by the model of the rule's condition value
+RULE_CATEGORIES = {
+    Celebration: 'specific_rules',
+    CelebrationType: 'typical_rules',
+    LiturgicalSubSeason: 'subseasonal_rules',
+    LiturgicalSeason: 'seasonal_rules',
+}
+
+
+def tokenize(text: str) -> Tuple[str, ...]:
+    """
+    Folded words of the text without punctuation, "Sv. Vavřince, jáhna" -> ("sv", "vavrince", "jahna").
+    """
+    return tuple(re.findall(r'\w+', fold(text)))
+
+
+class RuleRecord(NamedTuple):
+    """
+    Read-only copy of a SongRule with the fields the recommender needs,
+    tagged with its category when the index is built.
+    """
+    id: int
+    song: Song
+    mass_part_name: str
+    priority: int
+    exclusive: bool
+    can_be_main: bool
+    category: Optional[str]
+
+
+class SongRuleIndex:
+    """
+    Read-only, in-memory index of all song rules.
+
+    Rules are loaded once as lightweight records sharing one Song instance per song
+    and are keyed by (content_type_id, object_id) of their condition value.
+    Songs with keywords are indexed by the words of their folded keywords as compact arrays of song ids.
+    """
+
+    def __init__(self, version: Tuple[int, float]) -> None:
+        self.version = version
+        self.rules_by_target: Dict[Tuple[int, int], List[RuleRecord]] = defaultdict(list)
+        self.content_type_ids: Dict[Type[models.Model], int] = {}
+        self.season_ids: Dict[str, int] = {}
+        self.subseason_ids: Dict[str, int] = {}
+        self.songs: Dict[int, Song] = {}
+        self.song_ids_by_keyword: Dict[Tuple[str, ...], array] = {}
+        self.keywords_by_first_word: Dict[str, List[Tuple[str, ...]]] = defaultdict(list)
+        self.main_song_ids: Set[int] = set()
+        self.season_ids_by_song: Dict[int, Set[int]] = defaultdict(set)
+        self._mass_part_rules: Dict[Tuple[Type[models.Model], Tuple[int, ...], str], List[RuleRecord]] = {}
+
+    @classmethod
+    def build(cls, version: Tuple[int, float]) -> 'SongRuleIndex':
+        index = cls(version=version)
+        index.content_type_ids = {
+            model: content_type.id
+            for model, content_type in ContentType.objects.get_for_models(*CONDITION_MODELS).items()
+        }
+        categories = {index.content_type_ids[model]: category for model, category in RULE_CATEGORIES.items()}
+        season_content_type_id = index.content_type_ids[LiturgicalSeason]
+        rules = list(SongRule.objects.order_by('id').values_list(
+            'id', 'song_id', 'content_type_id', 'object_id', 'mass_part__name', 'priority', 'exclusive', 'can_be_main',
+        ))
+        song_keywords = list(Song.keywords.through.objects.values_list('keyword__word', 'song_id'))
+        # Only songs that can be recommended are loaded: songs of rules and songs with keywords
+        index.songs = {
+            song.pk: song
+            for song in Song.objects.filter(
+                Q(pk__in=SongRule.objects.values('song_id'))
+                | Q(pk__in=Song.keywords.through.objects.values('song_id')),
+            )
+        }
+        for pk, song_id, content_type_id, object_id, mass_part_name, priority, exclusive, can_be_main in rules:
+            song = index.songs.get(song_id)
+            if song is None:
+                # Deleted since the rules were loaded
+                continue
+            index.rules_by_target[(content_type_id, object_id)].append(RuleRecord(
+                id=pk,
+                song=song,
+                mass_part_name=mass_part_name,
+                priority=priority,
+                exclusive=exclusive,
+                can_be_main=can_be_main,
+                category=categories.get(content_type_id),
+            ))
+            if can_be_main:
+                index.main_song_ids.add(song_id)
+            if content_type_id == season_content_type_id:
+                index.season_ids_by_song[song_id].add(object_id)
+        index.season_ids = {name.lower(): pk for pk, name in LiturgicalSeason.objects.values_list('id', 'name')}
+        index.subseason_ids = dict(LiturgicalSubSeason.objects.values_list('name', 'id'))
+
+        song_ids_by_keyword = defaultdict(set)
+        for word, song_id in song_keywords:
+            keyword = tokenize(word)
+            if keyword and song_id in index.songs:
+                song_ids_by_keyword[keyword].add(song_id)
+        for keyword, song_ids in song_ids_by_keyword.items():
+            index.song_ids_by_keyword[keyword] = array('I', sorted(song_ids))
+            index.keywords_by_first_word[keyword[0]].append(keyword)
+        return index
+
+    def get_rules(self, model: Type[models.Model], object_ids: Iterable[int]) -> List[RuleRecord]:
+        """
+        Get rules whose condition value is an instance of the given model with one of the given ids.
+        """
+        content_type_id = self.content_type_ids[model]
+        rules = []
+        for object_id in dict.fromkeys(object_ids):
+            rules.extend(self.rules_by_target.get((content_type_id, object_id), []))
+        return rules
+
+    def get_mass_part_rules(
+        self,
+        model: Type[models.Model],
+        object_ids: Iterable[int],
+        mass_part: str,
+    ) -> List[RuleRecord]:
+        """
+        Get rules for the given mass part ordered by id. The result is memoized for the lifetime of the index.
+        """
+        key = (model, tuple(object_ids), mass_part)
+        rules = self._mass_part_rules.get(key)
+        if rules is None:
+            rules = sorted(
+                (rule for rule in self.get_rules(model=model, object_ids=key[1]) if rule.mass_part_name == mass_part),
+                key=lambda rule: rule.id,
+            )
+            self._mass_part_rules[key] = rules
+        return rules
+
+    def get_keyword_scores(self, text: str) -> Dict[int, int]:
+        """
+        Score songs by the number of their keywords found in the text. Keywords match whole words,
+        a keyword of more words matches the same words in a row. Only songs of the matched keywords are visited.
+        """
+        words = tokenize(text)
+        matched = set()
+        for position, word in enumerate(words):
+            for keyword in self.keywords_by_first_word.get(word, ()):
+                if words[position:position + len(keyword)] == keyword:
+                    matched.add(keyword)
+        scores: Dict[int, int] = defaultdict(int)
+        for keyword in matched:
+            for song_id in self.song_ids_by_keyword[keyword]:
+                scores[song_id] += 1
+        return scores
+
+    def can_be_main_in_season(self, song_id: int, season_id: Optional[int]) -> bool:
+        """
+        Whether the song may be the main song in the season: one of its rules allows it as the main song,
+        and if it has seasonal rules, one of them is for the season.
+        """
+        season_ids = self.season_ids_by_song.get(song_id)
+        return song_id in self.main_song_ids and (not season_ids or season_id in season_ids)
+
+    def get_season_id(self, name: Optional[str]) -> Optional[int]:
+        if name is None:
+            return None
+        return self.season_ids.get(name.lower())
+
+
+def invalidate_rule_index(*args, **kwargs) -> None:
+    """
+    Bump the index version, the index is rebuilt on the next access.
+    Accepts any arguments so it can be used directly as a signal receiver.
+    """
+    global _version
+    with _version_lock:
+        _version += 1
+
+
+def get_rule_index() -> SongRuleIndex:
+    """
+    Get the process-wide rule index, rebuilding it if it is outdated.
+    The index is outdated if it was invalidated in this process or if the shared content version
+    changed, which covers changes made through other workers.
+    """
+    global _index
+    version = (_version, get_content_version())
+    index = _index
+    if index is None or index.version != version:
+        with _build_lock:
+            if _index is None or _index.version != version:
+                _index = SongRuleIndex.build(version=version)
+            index = _index
+    return index
@@ -0,0 +1,162 @@
+import threading
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Type
+
+from django.db import models
+
+from cantica.cache import get_content_version
+from celebrations.models import Celebration, CelebrationType
+from songs.models import Keyword, LiturgicalSeason, LiturgicalSubSeason, Song
+from songs.utils.helpers import fold
+
+_version = 0
+_version_lock = threading.Lock()
+_build_lock = threading.Lock()
+_index: Optional['SearchIndex'] = None
+
+# Substrings up to this length are indexed, longer query tokens are looked up by their trigrams
+GRAM_SIZE = 3
+
+SEARCH_MODELS = (Song, Keyword, Celebration, CelebrationType, LiturgicalSeason, LiturgicalSubSeason)
+
+
+def get_grams(text: str) -> Set[str]:
+    """
+    Get all substrings of the text up to GRAM_SIZE characters long.
+    """
+    return {
+        text[start:start + size]
+        for size in range(1, GRAM_SIZE + 1)
+        for start in range(len(text) - size + 1)
+    }
+
+
+class ModelSearchIndex:
+    """
+    N-gram index of folded texts of one model's rows.
+    """
+
+    def __init__(self) -> None:
+        self.names: Dict[int, str] = {}
+        self.texts: Dict[int, str] = {}
+        self.keys: Dict[int, Set[str]] = {}
+        self.postings: Dict[str, Set[int]] = defaultdict(set)
+
+    def add(self, pk: int, name: str, keys: Iterable[str] = (), extra: Iterable[str] = ()) -> None:
+        """
+        Index the row by its name. Keys (e.g. a song number) rank as high as the name when matched exactly,
+        extra texts (e.g. keywords) are searched but don't affect ranking.
+        """
+        self.names[pk] = fold(name)
+        self.keys[pk] = {fold(key) for key in keys}
+        self.texts[pk] = ' '.join([self.names[pk], *self.keys[pk], *(fold(text) for text in extra)])
+        for gram in get_grams(self.texts[pk]):
+            self.postings[gram].add(pk)
+
+    def get_candidates(self, token: str) -> Set[int]:
+        if len(token) <= GRAM_SIZE:
+            return self.postings.get(token, set())
+        grams = sorted(
+            (token[start:start + GRAM_SIZE] for start in range(len(token) - GRAM_SIZE + 1)),
+            key=lambda gram: len(self.postings.get(gram, ())),
+        )
+        candidates = set(self.postings.get(grams[0], ()))
+        for gram in grams[1:]:
+            if not candidates:
+                break
+            candidates &= self.postings.get(gram, set())
+        return candidates
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[int]:
+        """
+        Get ids of rows containing all words of the query, best matches first:
+        exact name, then name prefix, then name containing the query, then other matches.
+        """
+        query = fold(query)
+        tokens = query.split()
+        if not tokens:
+            return []
+        candidates = None
+        for token in sorted(tokens, key=len, reverse=True):
+            token_candidates = self.get_candidates(token)
+            candidates = token_candidates if candidates is None else candidates & token_candidates
+            if not candidates:
+                return []
+        matches = [pk for pk in candidates if all(token in self.texts[pk] for token in tokens)]
+        matches.sort(key=lambda pk: (self.get_rank(pk, query), self.names[pk], pk))
+        return matches[:limit]
+
+    def get_rank(self, pk: int, query: str) -> int:
+        name = self.names[pk]
+        if name == query or query in self.keys[pk]:
+            return 0
+        if name.startswith(query):
+            return 1
+        if query in name:
+            return 2
+        return 3
+
+
+class SearchIndex:
+    """
+    Read-only, in-memory search index of songs, keywords, celebrations and condition values.
+
+    Texts are folded, so searching is case and diacritics insensitive, and indexed by n-grams,
+    so a search touches only rows sharing the rarest n-gram of each word instead of the whole table.
+    """
+
+    def __init__(self, version: Tuple[int, float]) -> None:
+        self.version = version
+        self.models: Dict[Type[models.Model], ModelSearchIndex] = {model: ModelSearchIndex() for model in SEARCH_MODELS}
+
+    @classmethod
+    def build(cls, version: Tuple[int, float]) -> 'SearchIndex':
+        index = cls(version=version)
+        for song in Song.objects.prefetch_related('keywords'):
+            index.models[Song].add(
+                song.pk,
+                name=song.title,
+                keys=[str(song.number)],
+                extra=[keyword.word for keyword in song.keywords.all()],
+            )
+        for pk, word in Keyword.objects.values_list('id', 'word'):
+            index.models[Keyword].add(pk, name=word)
+        for model in (Celebration, CelebrationType, LiturgicalSeason, LiturgicalSubSeason):
+            for pk, name in model.objects.values_list('id', 'name'):
+                index.models[model].add(pk, name=name)
+        return index
+
+    def search(self, model: Type[models.Model], query: str, limit: Optional[int] = None) -> Optional[List[int]]:
+        """
+        Get ids of the model's rows matching the query, best matches first.
+        Returns None for models that are not indexed.
+        """
+        model_index = self.models.get(model)
+        if model_index is None:
+            return None
+        return model_index.search(query, limit=limit)
+
+
+def invalidate_search_index(*args, **kwargs) -> None:
+    """
+    Bump the index version, the index is rebuilt on the next access.
+    Accepts any arguments so it can be used directly as a signal receiver.
+    """
+    global _version
+    with _version_lock:
+        _version += 1
+
+
+def get_search_index() -> SearchIndex:
+    """
+    Get the process-wide search index, rebuilding it if it is outdated.
+    """
+    global _index
+    version = (_version, get_content_version())
+    index = _index
+    if index is None or index.version != version:
+        with _build_lock:
+            if _index is None or _index.version != version:
+                _index = SearchIndex.build(version=version)
+            index = _index
+    return index
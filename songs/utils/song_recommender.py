@@ -1,25 +1,40 @@
 import random
 from collections import defaultdict
 from datetime import date
-from typing import Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional
 
-from django.contrib.contenttypes.models import ContentType
-from django.db.models import Q, QuerySet
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
 
+from cantica.instrumentation import span
 from celebrations.models import Celebration, CelebrationType
-from songs.models import LiturgicalSeason, LiturgicalSubSeason, Song, SongRule
+from songs.models import LiturgicalSeason, LiturgicalSubSeason, Song
 from songs.utils.helpers import (
+    get_date_flags,
     get_song_section_for_liturgical_season,
-    is_christmas_octave,
-    is_easter_octave,
+    get_subseason_names,
     is_easter_triduum,
     is_good_friday,
-    is_late_advent,
-    is_late_lent,
-    is_pentecost_novena,
-    is_week_of_prayer_for_christian_unity,
 )
 from songs.utils.liturgical_season import LiturgicalSeasonEnum
+from songs.utils.rule_index import RuleRecord, SongRuleIndex, get_rule_index
+
+# Main song comes first, followed by the mass parts in the order of the mass
+MASS_PART_ORDER = [
+    'main',
+    'entrance',
+    'asperges',
+    'ordinarium',
+    'psalm',
+    'sequence',
+    'aleluia',
+    'gospel',
+    'imposition of ashes',
+    'offertory',
+    'communion',
+    'recessional',
+]
+MASS_PART_POSITIONS = {part: position for position, part in enumerate(MASS_PART_ORDER)}
 
 
 class MassPartSelector():
@@ -55,73 +70,117 @@ class RecommendedSongs():
         specific: QuerySet[Song, Song],
         typical: QuerySet[Song, Song],
         seasonal: str,
-        detailed: Dict[str, List[SongRule]],
+        detailed: Dict[str, MassPartSelector],
     ) -> None:
         self.specific = specific
         self.typical = typical
         self.seasonal = seasonal
         self.detailed = detailed
 
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serialize recommendations into a compact JSON-compatible structure of song ids.
+        """
+        return {
+            'specific': [song.pk for song in self.specific],
+            'typical': [song.pk for song in self.typical],
+            'seasonal': self.seasonal,
+            # Pairs keep the mass part order, JSON objects stored as jsonb don't
+            'detailed': [[part, [song.pk for song in selector.songs]] for part, selector in self.detailed.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], songs: Dict[int, Song]) -> 'RecommendedSongs':
+        """
+        Build recommendations from the output of `to_dict`.
+        Raises KeyError if some of the songs are missing in the provided mapping.
+        """
+        detailed = data['detailed']
+        if isinstance(detailed, dict):
+            # Stored before mass parts were kept as pairs, the order of the mapping is not reliable
+            detailed = sorted(detailed.items(), key=lambda item: MASS_PART_POSITIONS.get(item[0], len(MASS_PART_ORDER)))
+        return cls(
+            specific=[songs[pk] for pk in data['specific']],
+            typical=[songs[pk] for pk in data['typical']],
+            seasonal=data['seasonal'],
+            detailed={
+                part: MassPartSelector(name=part, songs=[songs[pk] for pk in song_ids])
+                for part, song_ids in detailed
+            },
+        )
+
 
 class SongRecommender:
     def __init__(self) -> None:
         self.today = date.today()
 
+    @cached_property
+    def rule_index(self) -> SongRuleIndex:
+        """
+        The rule index is taken once, so the recommender works on one snapshot of the rules
+        and its helpers don't check the shared content version again.
+        """
+        return get_rule_index()
+
+    def get_shared_rules(
+        self,
+        season: Optional[LiturgicalSeasonEnum],
+        subseasons: List[LiturgicalSubSeason],
+    ) -> Dict[str, List[RuleRecord]]:
+        """
+        Retrieve seasonal and subseasonal rules, which are the same for all celebrations of a day.
+        """
+        rule_index = self.rule_index
+        current_season_id = rule_index.get_season_id(season.value if season else None)
+        return {
+            'subseasonal_rules': rule_index.get_rules(
+                model=LiturgicalSubSeason,
+                object_ids=[subseason.pk for subseason in subseasons],
+            ),
+            'seasonal_rules': rule_index.get_rules(
+                model=LiturgicalSeason,
+                object_ids=[current_season_id] if current_season_id is not None else [],
+            ),
+        }
+
     def get_song_rules(
         self,
         day: date,
         celebration: Optional[Celebration],
         season: Optional[LiturgicalSeasonEnum],
         subseasons: List[LiturgicalSubSeason],
-    ) -> Dict[str, List[SongRule]]:
+        shared_rules: Optional[Dict[str, List[RuleRecord]]] = None,
+    ) -> Dict[str, List[RuleRecord]]:
         """
         Retrieve song rules based on season, subseason, and celebration.
+        Rules are served from the in-memory rule index, so no database queries are made
+        as long as the celebration types are prefetched.
+        Seasonal and subseasonal rules from `get_shared_rules` can be passed to reuse them across celebrations.
         """
-        try:
-            current_season = LiturgicalSeason.objects.get(name__iexact=season.value)
-        except LiturgicalSeason.DoesNotExist:
-            current_season = None
-
-        subseasonal_rules = SongRule.objects.none()
-        subseasons_names = {subseason.name for subseason in subseasons}
-        if subseasons_names:
-            subseason_content_type = ContentType.objects.get_for_model(LiturgicalSubSeason)
-            subseasonal_rules = SongRule.objects.filter(
-                content_type=subseason_content_type,
-                object_id__in=LiturgicalSubSeason.objects.filter(
-                    name__in=subseasons_names,
-                ).values_list('id', flat=True),
-            )
-
-        season_content_type = ContentType.objects.get_for_model(LiturgicalSeason)
-        seasonal_rules = SongRule.objects.filter(
-            content_type=season_content_type, object_id=current_season.id,
+        rule_index = self.rule_index
+        if shared_rules is None:
+            shared_rules = self.get_shared_rules(season=season, subseasons=subseasons)
+        subseasonal_rules = shared_rules['subseasonal_rules']
+        seasonal_rules = shared_rules['seasonal_rules']
+
+        typical_rules = rule_index.get_rules(
+            model=CelebrationType,
+            object_ids=[celebration_type.pk for celebration_type in celebration.types.all()],
         )
 
-        celebration_type_ct = ContentType.objects.get_for_model(CelebrationType)
-        typical_rules = SongRule.objects.filter(
-            content_type=celebration_type_ct,
-            object_id__in=celebration.types.values_list('id', flat=True),
-        ).distinct()
-
-        celebration_ct = ContentType.objects.get_for_model(Celebration)
-        specific_rules = SongRule.objects.filter(
-            content_type=celebration_ct,
-            object_id=celebration.id,
+        specific_rules = rule_index.get_rules(
+            model=Celebration,
+            object_ids=[celebration.pk],
         )
-        all_rules = list(specific_rules) + list(typical_rules) + list(seasonal_rules)
-        filtered_rules = self.apply_rule_priority(all_rules)
-
-        specific_filtered = [r for r in filtered_rules if r in specific_rules]
-        typical_filtered = [r for r in filtered_rules if r in typical_rules]
-        seasonal_filtered = [r for r in filtered_rules if r in seasonal_rules]
-
-        return {
-            'specific_rules': specific_filtered,
-            'typical_rules': typical_filtered,
+        rules = {
+            'specific_rules': [],
+            'typical_rules': [],
             'subseasonal_rules': subseasonal_rules,
-            'seasonal_rules': seasonal_filtered,
+            'seasonal_rules': [],
         }
+        for rule in self.apply_rule_priority([*specific_rules, *typical_rules, *seasonal_rules]):
+            rules[rule.category].append(rule)
+        return rules
 
     def recommend_songs(
         self,
@@ -133,48 +192,80 @@ class SongRecommender:
         """
         Recommend songs based on liturgical criteria.
         """
-        if is_good_friday(day):
-            return RecommendedSongs(
-                specific=[],
-                typical=[],
-                seasonal='',
-                detailed={},
-            )
-
-        rules = self.get_song_rules(
+        return self.recommend_songs_for_day(
             day=day,
-            celebration=celebration,
-            season=liturgical_season,
-            subseasons=liturgical_subseasons,
-        )
+            celebrations=[celebration],
+            liturgical_season=liturgical_season,
+            liturgical_subseasons=liturgical_subseasons,
+        )[celebration.pk]
+
+    def recommend_songs_for_day(
+        self,
+        day: date,
+        celebrations: Iterable[Celebration],
+        liturgical_season: LiturgicalSeasonEnum,
+        liturgical_subseasons: List[LiturgicalSubSeason],
+    ) -> Dict[int, RecommendedSongs]:
+        """
+        Recommend songs for all celebrations of the day, keyed by celebration id.
+        Seasonal and subseasonal rules and the seasonal section are looked up once for the whole day.
+        """
+        celebrations = list(celebrations)
+        if is_good_friday(day):
+            return {
+                celebration.pk: RecommendedSongs(
+                    specific=[],
+                    typical=[],
+                    seasonal='',
+                    detailed={},
+                )
+                for celebration in celebrations
+            }
+
+        with span('shared_rules'):
+            shared_rules = self.get_shared_rules(season=liturgical_season, subseasons=liturgical_subseasons)
         section = get_song_section_for_liturgical_season(liturgical_season)
         if is_easter_triduum(day):
             seasonal_songs = ''
         else:
             seasonal_songs = 'písně z oddílu {section}'.format(section=section)
-        detailed_recommendation = self.get_detailed_recommendation(
-            rules=rules,
-            day=day,
-            liturgical_season=liturgical_season,
-        )
 
-        return RecommendedSongs(
-            specific=[rule.song for rule in rules['specific_rules']],
-            typical=[rule.song for rule in rules['typical_rules']],
-            seasonal=seasonal_songs,
-            detailed=detailed_recommendation,
-        )
+        recommendations = {}
+        for celebration in celebrations:
+            with span('song_rules'):
+                rules = self.get_song_rules(
+                    day=day,
+                    celebration=celebration,
+                    season=liturgical_season,
+                    subseasons=liturgical_subseasons,
+                    shared_rules=shared_rules,
+                )
+            with span('detailed_recommendation'):
+                detailed_recommendation = self.get_detailed_recommendation(
+                    rules=rules,
+                    day=day,
+                    liturgical_season=liturgical_season,
+                    celebration=celebration,
+                )
+            recommendations[celebration.pk] = RecommendedSongs(
+                specific=[rule.song for rule in rules['specific_rules']],
+                typical=[rule.song for rule in rules['typical_rules']],
+                seasonal=seasonal_songs,
+                detailed=detailed_recommendation,
+            )
+        return recommendations
 
     def get_detailed_recommendation(
         self,
-        rules: Dict[str, List[SongRule]],
+        rules: Dict[str, List[RuleRecord]],
         day: date,
         liturgical_season: LiturgicalSeasonEnum,
+        celebration: Optional[Celebration] = None,
     ) -> Dict[str, MassPartSelector]:
         """
         Recommend song for each mass part.
         Priority of assignment:
-            specific, typical, seasonal
+            specific, typical, subseasonal, keyword match of the main song, seasonal
             mandatory -> default
         """
         detailed_song_recommendations = defaultdict(lambda: MassPartSelector(name='', songs=[]))
@@ -182,6 +273,15 @@ class SongRecommender:
         priorities = [3, 2, 1, 0]  # ['mandatory', 'strongly preferred', 'preferred', 'default']
 
         for rules_category in rules_categories:
+            if rules_category == 'seasonal_rules' and not detailed_song_recommendations.get('main'):
+                with span('keyword_song'):
+                    keyword_song = self.get_keyword_song(
+                        celebration=celebration,
+                        liturgical_season=liturgical_season,
+                        day=day,
+                    )
+                if keyword_song:
+                    detailed_song_recommendations['main'] = MassPartSelector('main', [keyword_song])
             for priority in priorities:
                 current_rules = self.get_rules_by_priority(rules_list=rules.get(rules_category, []), priority=priority)
                 seed = day.toordinal()
@@ -192,10 +292,12 @@ class SongRecommender:
                         recommendations=detailed_song_recommendations,
                     )
 
-        detailed_song_recommendations = self.fill_in_changeables(
-            recommendations=detailed_song_recommendations,
-            liturgical_season=liturgical_season,
-        )
+        with span('fill_in_changeables'):
+            detailed_song_recommendations = self.fill_in_changeables(
+                recommendations=detailed_song_recommendations,
+                liturgical_season=liturgical_season,
+                day=day,
+            )
 
         detailed_song_recommendations = self.get_ordered_recommendations(detailed_song_recommendations)
 
@@ -203,15 +305,16 @@ class SongRecommender:
 
     def get_rules_by_priority(
         self,
-        rules_list: List[SongRule],
+        rules_list: List[RuleRecord],
         priority: int,
-    ) -> List[SongRule]:
+    ) -> List[RuleRecord]:
         return [rule for rule in rules_list if rule.priority == priority]
 
     def fill_in_changeables(
         self,
         recommendations: Dict[str, MassPartSelector],
         liturgical_season: LiturgicalSeasonEnum,
+        day: date,
     ) -> Dict[str, MassPartSelector]:
         """
         Sometimes the main song doesn't have sufficient verses for these parts. Fill in appropriate songs.
@@ -233,14 +336,14 @@ class SongRecommender:
             return recommendations
         for part, (verse_attr, seasons) in changeable_mass_parts.items():
             if not getattr(main_song, verse_attr, False) and not recommendations[part].songs:
-                song = self.get_song_for_mass_part(mass_part=part, liturgical_seasons=seasons)
+                song = self.get_song_for_mass_part(mass_part=part, liturgical_seasons=seasons, day=day)
                 if song:
                     recommendations[part] = MassPartSelector(part, [song])
         return recommendations
 
     def assign_song(
         self,
-        song_rule: SongRule,
+        song_rule: RuleRecord,
         recommendations: Dict[str, MassPartSelector],
     ) -> Dict[str, MassPartSelector]:
         """
@@ -251,7 +354,7 @@ class SongRecommender:
                 recommendations.setdefault('main', MassPartSelector('main', [song_rule.song]))
             return recommendations
 
-        mass_part_name = song_rule.mass_part.name
+        mass_part_name = song_rule.mass_part_name
         if recommendations.get(mass_part_name) is not None:
             return recommendations
 
@@ -274,24 +377,9 @@ class SongRecommender:
         Orders the song recommendations based on a predefined order.
         Main song should come first, followed by the specific mass parts in a set order.
         """
-        mass_part_order = [
-            'main',
-            'entrance',
-            'asperges',
-            'ordinarium',
-            'psalm',
-            'sequence',
-            'aleluia',
-            'gospel',
-            'imposition of ashes',
-            'offertory',
-            'communion',
-            'recessional',
-        ]
-
         ordered_recommendations = {}
 
-        for part in mass_part_order:
+        for part in MASS_PART_ORDER:
             if part in detailed_song_recommendations:
                 ordered_recommendations[part] = detailed_song_recommendations[part]
 
@@ -301,44 +389,64 @@ class SongRecommender:
         self,
         mass_part: str,
         liturgical_seasons: List[LiturgicalSeasonEnum],
+        day: date,
     ) -> Optional[Song]:
-        season_content_type = ContentType.objects.get_for_model(LiturgicalSeason)
-
-        season_names = [season.value for season in liturgical_seasons]
-        seasons = LiturgicalSeason.objects.filter(name__in=season_names)
-
-        if not seasons.exists():
+        """
+        Pick a song from seasonal rules for the mass part.
+        The pick is stable for the given day, candidates are served from the rule index.
+        """
+        rule_index = self.rule_index
+        season_ids = [rule_index.get_season_id(season.value) for season in liturgical_seasons if season]
+        candidate_rules = rule_index.get_mass_part_rules(
+            model=LiturgicalSeason,
+            object_ids=[season_id for season_id in season_ids if season_id is not None],
+            mass_part=mass_part,
+        )
+        if not candidate_rules:
             return None
 
-        conditions = Q(content_type=season_content_type) & Q(mass_part__name=mass_part)
-        conditions &= Q(object_id__in=seasons.values_list('id', flat=True))
+        seed = day.toordinal()
+        selected_rule = candidate_rules[random.Random(seed).randrange(len(candidate_rules))]  # noqa: S311
+        return selected_rule.song
 
-        song_rule_qs = SongRule.objects.filter(conditions)
-
-        selected_rule = song_rule_qs.order_by('?').first()
-        return selected_rule.song if selected_rule else None
+    def get_keyword_song(
+        self,
+        celebration: Optional[Celebration],
+        liturgical_season: Optional[LiturgicalSeasonEnum],
+        day: date,
+    ) -> Optional[Song]:
+        """
+        Pick the song whose keywords best match the celebration name, its types and the season.
+        Only songs that can be the main song in the season are considered.
+        Ties are broken by a pick that is stable for the given day.
+        """
+        if celebration is None:
+            return None
+        rule_index = self.rule_index
+        season_id = rule_index.get_season_id(liturgical_season.value if liturgical_season else None)
+        scores = rule_index.get_keyword_scores(' '.join([
+            celebration.name,
+            *(celebration_type.name for celebration_type in celebration.types.all()),
+            liturgical_season.value if liturgical_season else '',
+        ]))
+        scores = {
+            song_id: score for song_id, score in scores.items()
+            if rule_index.can_be_main_in_season(song_id, season_id)
+        }
+        if not scores:
+            return None
+        best_score = max(scores.values())
+        candidates = sorted(song_id for song_id, score in scores.items() if score == best_score)
+        song_id = candidates[random.Random(day.toordinal()).randrange(len(candidates))]  # noqa: S311
+        return rule_index.songs[song_id]
 
     def get_current_subseasons(self, current_date: date) -> set:
         """
         Check if provided date falls into some subseason.
         """
-        subseason_checks = {
-            'late_advent': is_late_advent,
-            'christmas_octave': is_christmas_octave,
-            'week_of_prayer_for_christian_unity': is_week_of_prayer_for_christian_unity,
-            'late_lent': is_late_lent,
-            'easter_octave': is_easter_octave,
-            'pentecost_novena': is_pentecost_novena,
-        }
-
-        matching_subseasons = set()
-        for name, check in subseason_checks.items():
-            if check(date_to_check=current_date):
-                matching_subseasons.add(name)
-
-        return matching_subseasons
+        return set(get_subseason_names(get_date_flags(current_date)))
 
-    def apply_rule_priority(self, rules: List[SongRule]) -> List[SongRule]:
+    def apply_rule_priority(self, rules: List[RuleRecord]) -> List[RuleRecord]:
         """
         Group rules by mass part and apply priority:
         - If any rule for a mass part is exclusive, keep only the highest-priority exclusive rule(s).
@@ -347,7 +455,7 @@ class SongRecommender:
         rules_by_mass_part = defaultdict(list)
 
         for rule in rules:
-            rules_by_mass_part[rule.mass_part.name].append(rule)
+            rules_by_mass_part[rule.mass_part_name].append(rule)
 
         filtered_rules = []
 
@@ -1,19 +1,158 @@
-from typing import Optional
+import json
+from datetime import date, timedelta
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
 
 from dal import autocomplete
 from django.contrib.admin.views.decorators import staff_member_required
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.db.models import QuerySet
+from django.http import HttpRequest, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.utils.decorators import method_decorator
+from django.views import View
 from rest_framework.generics import ListAPIView
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
-from .models import ConditionType, LiturgicalSeason, Song
+from cantica.api import IdCursorPagination, NDJSONStreamMixin, is_asgi_request
+from celebrations.models import Celebration, LiturgicalCalendarEvent
+from celebrations.serializers import CelebrationSerializer
+
+from .models import ConditionType, LiturgicalSeason, LiturgicalSubSeason, Song
 from .serializers import SongSerializer
+from .utils.daily_recommendations import aiter_range_recommendations, iter_range_recommendations
+from .utils.search_index import get_search_index
+from .utils.song_recommender import RecommendedSongs
 
 
-class SongListView(ListAPIView):
-    queryset = Song.objects.all()
+class SongListView(NDJSONStreamMixin, ListAPIView):
+    queryset = Song.objects.prefetch_related('keywords')
     serializer_class = SongSerializer
+    pagination_class = IdCursorPagination
+
+
+class SearchView(APIView):
+    """
+    Search songs and celebrations, case and diacritics insensitive.
+    """
+    MAX_RESULTS = 20
+
+    def get(self, request: Request, *args, **kwargs) -> Response:
+        query = request.query_params.get('q', '')
+        index = get_search_index()
+        song_ids = index.search(Song, query, limit=self.MAX_RESULTS)
+        celebration_ids = index.search(Celebration, query, limit=self.MAX_RESULTS)
+        songs = Song.objects.prefetch_related('keywords').in_bulk(song_ids)
+        celebrations = Celebration.objects.prefetch_related('types').in_bulk(celebration_ids)
+        return Response({
+            'songs': SongSerializer([songs[pk] for pk in song_ids if pk in songs], many=True).data,
+            'celebrations': CelebrationSerializer(
+                [celebrations[pk] for pk in celebration_ids if pk in celebrations],
+                many=True,
+            ).data,
+        })
+
+
+class RecommendationRangeView(View):
+    """
+    Recommended songs for every calendar day between `from` and `to` (inclusive), streamed as a JSON array.
+    Async view, under ASGI the days are loaded with the async ORM while streaming.
+    """
+    MAX_DAYS = 366
+
+    async def get(self, request: HttpRequest, *args, **kwargs) -> HttpResponse:
+        try:
+            start, end = self.get_range(request)
+        except ValidationError as e:
+            return JsonResponse(e.message_dict, status=400)
+        stream = self.astream if is_asgi_request(request) else self.stream
+        return StreamingHttpResponse(stream(start=start, end=end), content_type='application/json')
+
+    def get_range(self, request: HttpRequest) -> Tuple[date, date]:
+        start = self.get_date_param(request, 'from', default=date.today())
+        end = self.get_date_param(request, 'to', default=start)
+        if end < start:
+            raise ValidationError({'to': 'Must not be before from.'})
+        if end - start >= timedelta(days=self.MAX_DAYS):
+            raise ValidationError({'to': f'At most {self.MAX_DAYS} days can be requested at once.'})
+        return start, end
+
+    def get_date_param(self, request: HttpRequest, name: str, default: date) -> date:
+        value = request.GET.get(name)
+        if not value:
+            return default
+        try:
+            return date.fromisoformat(value)
+        except ValueError as e:
+            raise ValidationError({name: 'Expected a date in YYYY-MM-DD format.'}) from e
+
+    def stream(self, start: date, end: date) -> Iterator[str]:
+        """
+        Yield the JSON array day by day, so the whole range is never held in memory.
+        """
+        songs: Dict[int, Dict[str, Any]] = {}
+        separator = '['
+        for event, subseasons, recommendations in iter_range_recommendations(start=start, end=end):
+            yield separator + self.serialize_day(event, subseasons, recommendations, songs)
+            separator = ',\n'
+        yield '[]' if separator == '[' else ']'
+
+    async def astream(self, start: date, end: date) -> AsyncIterator[str]:
+        songs: Dict[int, Dict[str, Any]] = {}
+        separator = '['
+        async for event, subseasons, recommendations in aiter_range_recommendations(start=start, end=end):
+            yield separator + self.serialize_day(event, subseasons, recommendations, songs)
+            separator = ',\n'
+        yield '[]' if separator == '[' else ']'
+
+    def serialize_day(
+        self,
+        event: LiturgicalCalendarEvent,
+        subseasons: List[LiturgicalSubSeason],
+        recommendations: Dict[int, RecommendedSongs],
+        songs: Dict[int, Dict[str, Any]],
+    ) -> str:
+        day = {
+            'date': event.date,
+            'season': event.season,
+            'subseasons': sorted(subseason.name for subseason in subseasons),
+            'celebrations': [
+                {
+                    'id': celebration.pk,
+                    'name': celebration.name,
+                    'recommendations': self.serialize_recommendations(recommendations[celebration.pk], songs),
+                }
+                for celebration in event.celebrations.all()
+            ],
+        }
+        return json.dumps(day, cls=DjangoJSONEncoder, ensure_ascii=False)
+
+    def serialize_recommendations(
+        self,
+        recommended_songs: RecommendedSongs,
+        songs: Dict[int, Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """
+        Songs are serialized once per response and reused across days.
+        """
+        def serialize_songs(song_list: list) -> list:
+            serialized = []
+            for song in song_list:
+                if song.pk not in songs:
+                    songs[song.pk] = {'id': song.pk, 'title': song.title, 'number': song.number}
+                serialized.append(songs[song.pk])
+            return serialized
+
+        return {
+            'specific': serialize_songs(recommended_songs.specific),
+            'typical': serialize_songs(recommended_songs.typical),
+            'seasonal': recommended_songs.seasonal,
+            'detailed': {
+                part: serialize_songs(selector.songs) for part, selector in recommended_songs.detailed.items()
+            },
+        }
 
 
 @method_decorator(staff_member_required, name='dispatch')
@@ -37,6 +176,9 @@ class ConditionValueAutocomplete(autocomplete.Select2QuerySetView):
 
         qs = model_class.objects.all()
         if self.q:
+            ids = get_search_index().search(model_class, self.q)
+            if ids is not None:
+                return qs.filter(pk__in=ids)
             # Assumes the target model has a 'name' field; adjust as needed.
             qs = qs.filter(name__icontains=self.q)
         return qs